@@ -0,0 +1,24 @@
+"""
+Benchmarks for django-admin-keyshortcuts.
+
+Each module can be run from the repository root, e.g.:
+
+    python -m benchmarks.registry
+
+Benchmarks of the JavaScript shortcuts are HTML pages in benchmarks/browser/
+meant to be opened in a browser, and Node scripts in benchmarks/js/ running on
+a DOM stand-in, e.g.:
+
+    node benchmarks/js/dispatch.mjs --output baseline.json
+    node benchmarks/js/dispatch.mjs --compare baseline.json
+"""
+
+import os
+
+import django
+
+
+def setup():
+    """Configure Django with the test project settings."""
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "tests.settings")
+    django.setup()
@@ -0,0 +1,234 @@
+// Benchmark of the hotkey dispatch path on the DOM stand-in in dom.mjs.
+//
+// Run from the repository root:
+//
+//     node benchmarks/js/dispatch.mjs [--sizes 10,100,1000,10000] [--time 500]
+//         [--output results.json] [--compare baseline.json] [--threshold 20]
+//
+// For each size, a change list page with that many rows and as many extra
+// bound elements is built and shortcuts_changelist.js is run on it. The
+// benchmark reports ops/sec for:
+//
+//   install     installing the hotkey of one element,
+//   uninstall   uninstalling the hotkey of one element,
+//   dispatch    a keydown firing a single-key hotkey,
+//   miss        a keydown not bound to any hotkey,
+//   sequence    the two keydowns of the "g i" sequence,
+//   navigation  a j or k keydown focusing the next or previous row.
+//
+// --output saves the results as a JSON baseline. --compare prints the change
+// from such a baseline and exits with status 1 if any result is more than
+// --threshold percent slower.
+
+import assert from 'node:assert/strict';
+import { execFileSync } from 'node:child_process';
+import { readFileSync, writeFileSync } from 'node:fs';
+import { parseArgs } from 'node:util';
+import { fileURLToPath } from 'node:url';
+import vm from 'node:vm';
+
+import { h, installDocument } from './dom.mjs';
+
+const staticRoot = new URL('../../src/django_admin_keyshortcuts/static/admin/js/', import.meta.url);
+const changelistScript = new vm.Script(
+    readFileSync(new URL('shortcuts_changelist.js', staticRoot), 'utf8'),
+    { filename: 'shortcuts_changelist.js' }
+);
+
+// hotkey.js only looks up document when (un)registering its listener, so a
+// document installed before each page is used from then on.
+installDocument();
+const { install, uninstall } = await import(new URL('vendor/hotkey/hotkey.js', staticRoot).href);
+
+const { values: options } = parseArgs({
+    options: {
+        sizes: { type: 'string', default: '10,100,1000,10000' },
+        time: { type: 'string', default: '500' },
+        output: { type: 'string' },
+        compare: { type: 'string' },
+        threshold: { type: 'string', default: '20' }
+    }
+});
+const sizes = options.sizes.split(',').map(Number);
+const minTime = Number(options.time);
+
+// Default hotkeys of the shortcuts by group and name, exported as JSON from
+// the SHORTCUTS table of registry.py so that the page is bound like a real
+// one. $PYTHON, python3 by default, must be able to import Django.
+function readDefaultHotkeys() {
+    const code = [
+        'import json',
+        'from django_admin_keyshortcuts.registry import SHORTCUTS',
+        'print(json.dumps({g: {n: h for n, (_, h) in s.items()} for g, s in SHORTCUTS.items()}))'
+    ].join('\n');
+    const output = execFileSync(process.env.PYTHON || 'python3', ['-c', code], {
+        env: { ...process.env, PYTHONPATH: fileURLToPath(new URL('../../src', import.meta.url)) },
+        encoding: 'utf8'
+    });
+    return JSON.parse(output);
+}
+
+const { global: globalHotkeys, changelist: changelistHotkeys } = readDefaultHotkeys();
+assert.ok(globalHotkeys && changelistHotkeys, 'Could not read the shortcuts of registry.py');
+const keys = 'abcdefghijklmnopqrstuvwxyz0123456789';
+
+// Mirror the markup of change_list_shortcuts.html and shortcuts.html. The
+// extra elements are bound to distinct sequences not conflicting with them.
+function buildPage(size) {
+    const document = installDocument();
+    const rows = [];
+    for (let i = 0; i < size; i++) {
+        rows.push(h(document, 'tr', {},
+            h(document, 'td', {}, h(document, 'input', { type: 'checkbox', class: 'action-select', name: '_selected_action', value: i })),
+            h(document, 'th', {}, h(document, 'a', { href: `${i}/change/` }, `Row ${i}`))
+        ));
+    }
+    const extra = [];
+    for (let i = 0; i < size; i++) {
+        const hotkey = `Alt+${keys[i % keys.length]} ${keys[Math.floor(i / keys.length) % keys.length]}${i}`;
+        extra.push(h(document, 'button', { 'data-hotkey': hotkey, hidden: true }));
+    }
+    document.body.append(
+        h(document, 'input', { type: 'search', id: 'searchbar', 'data-hotkey': changelistHotkeys.focus_search }),
+        h(document, 'select', { name: 'action' }),
+        h(document, 'table', { id: 'result_list' },
+            h(document, 'thead', {}, h(document, 'tr', {}, h(document, 'th', {}, h(document, 'input', { type: 'checkbox', id: 'action-toggle' })))),
+            h(document, 'tbody', {}, ...rows)
+        ),
+        h(document, 'button', { id: 'open-shortcuts', 'data-hotkey': globalHotkeys.show_dialog }),
+        h(document, 'a', { id: 'admin_index_link', href: '/admin/', 'data-hotkey': globalHotkeys.go_to_index, hidden: true }),
+        h(document, 'button', { id: 'keyshortcut-prev-btn', 'data-hotkey': changelistHotkeys.focus_prev_row, hidden: true }),
+        h(document, 'button', { id: 'keyshortcut-next-btn', 'data-hotkey': changelistHotkeys.focus_next_row, hidden: true }),
+        h(document, 'button', { id: 'keyshortcut-select-btn', 'data-hotkey': changelistHotkeys.toggle_row_selection, hidden: true }),
+        h(document, 'button', { id: 'keyshortcut-select-actions-btn', 'data-hotkey': changelistHotkeys.focus_actions_dropdown, hidden: true }),
+        h(document, 'button', { id: 'keyshortcut-extend-down-btn', 'data-hotkey': changelistHotkeys.extend_selection_down, hidden: true }),
+        h(document, 'button', { id: 'keyshortcut-extend-up-btn', 'data-hotkey': changelistHotkeys.extend_selection_up, hidden: true }),
+        h(document, 'button', { id: 'keyshortcut-select-all-btn', 'data-hotkey': changelistHotkeys.toggle_all_rows, hidden: true }),
+        h(document, 'button', { id: 'keyshortcut-invert-selection-btn', 'data-hotkey': changelistHotkeys.invert_selection, hidden: true }),
+        ...extra
+    );
+    changelistScript.runInThisContext();
+    return document;
+}
+
+function press(document, key, init = {}) {
+    const target = document.activeElement || document.body;
+    target.dispatchEvent(new KeyboardEvent('keydown', { key, bubbles: true, cancelable: true, ...init }));
+}
+
+// Run fn in growing batches until minTime has elapsed, return ops/sec.
+function measure(fn) {
+    let ops = 0;
+    let elapsed = 0;
+    let batch = 1;
+    while (elapsed < minTime) {
+        const start = performance.now();
+        for (let i = 0; i < batch; i++) {
+            fn();
+        }
+        elapsed += performance.now() - start;
+        ops += batch;
+        batch = Math.min(batch * 2, 4096);
+    }
+    return ops / (elapsed / 1000);
+}
+
+function benchmarkPage(size) {
+    const document = buildPage(size);
+    const elements = document.querySelectorAll('[data-hotkey]');
+
+    // Install and uninstall the whole page, like shortcuts.js does, and
+    // count one op per element.
+    let installMs = 0;
+    let uninstallMs = 0;
+    let cycles = 0;
+    while (installMs + uninstallMs < minTime * 2) {
+        let start = performance.now();
+        for (const element of elements) {
+            install(element);
+        }
+        installMs += performance.now() - start;
+        start = performance.now();
+        for (const element of elements) {
+            uninstall(element);
+        }
+        uninstallMs += performance.now() - start;
+        cycles += 1;
+    }
+    for (const element of elements) {
+        install(element);
+    }
+
+    let fired = 0;
+    document.getElementById('open-shortcuts').addEventListener('click', () => {
+        fired += 1;
+    });
+    let followed = 0;
+    document.getElementById('admin_index_link').addEventListener('click', event => {
+        event.preventDefault();
+        followed += 1;
+    });
+
+    const result = {
+        install: elements.length * cycles / (installMs / 1000),
+        uninstall: elements.length * cycles / (uninstallMs / 1000),
+        dispatch: measure(() => press(document, '?', { shiftKey: true })),
+        miss: measure(() => press(document, 'q')),
+        sequence: measure(() => {
+            press(document, 'g');
+            press(document, 'i');
+        }),
+        navigation: measure(() => {
+            press(document, 'j');
+            press(document, 'j');
+            press(document, 'k');
+        }) * 3
+    };
+
+    // Check the keydowns went down the paths they are meant to measure.
+    assert.ok(fired > 0, 'Shift+? did not fire');
+    assert.ok(followed > 0, 'g i did not fire');
+    assert.ok(document.activeElement.matches('#action-toggle, .action-select'), 'j/k did not focus a row');
+
+    for (const element of elements) {
+        uninstall(element);
+    }
+    return result;
+}
+
+function formatOps(ops) {
+    return ops >= 1e6 ? `${(ops / 1e6).toFixed(2)}M` : ops >= 1e3 ? `${(ops / 1e3).toFixed(1)}k` : ops.toFixed(0);
+}
+
+const baseline = options.compare ? JSON.parse(readFileSync(options.compare, 'utf8')).results : null;
+const threshold = Number(options.threshold) / 100;
+const results = {};
+const regressions = [];
+
+// Warm up the JIT, so that the first size is not measured cold.
+benchmarkPage(sizes[0]);
+
+console.log(`${'size'.padStart(6)} ${'benchmark'.padEnd(11)} ${'ops/sec'.padStart(9)}`);
+for (const size of sizes) {
+    results[size] = benchmarkPage(size);
+    for (const [name, ops] of Object.entries(results[size])) {
+        let line = `${String(size).padStart(6)} ${name.padEnd(11)} ${formatOps(ops).padStart(9)}`;
+        const previous = baseline && baseline[size] && baseline[size][name];
+        if (previous) {
+            const change = (ops - previous) / previous;
+            line += `  (${change >= 0 ? '+' : ''}${(change * 100).toFixed(1)}% vs baseline)`;
+            if (change < -threshold) {
+                regressions.push(`${name} with ${size} elements`);
+            }
+        }
+        console.log(line);
+    }
+}
+
+if (options.output) {
+    writeFileSync(options.output, `${JSON.stringify({ node: process.version, time: minTime, results }, null, 2)}\n`);
+}
+if (regressions.length) {
+    console.error(`Slower than the baseline by more than ${options.threshold}%: ${regressions.join(', ')}`);
+    process.exitCode = 1;
+}
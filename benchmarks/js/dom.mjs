@@ -0,0 +1,772 @@
+// Minimal DOM stand-in for the JavaScript benchmarks, so that they run in
+// Node without a browser or any npm dependency.
+//
+// It implements the parts of the DOM used by hotkey.js and the shortcut
+// scripts: a tree of elements with attributes and classes, compound
+// selectors (tag, #id, .class, [attr] and [attr=value], without
+// combinators), event dispatch with capture and bubbling, focus, checkbox
+// clicks and MutationObserver records. Layout and rendering are not
+// modelled, so results are only comparable between runs of the benchmarks.
+
+const ELEMENT_NODE = 1;
+const TEXT_NODE = 3;
+const DOCUMENT_NODE = 9;
+
+export class Event {
+    constructor(type, init = {}) {
+        this.type = type;
+        this.bubbles = Boolean(init.bubbles);
+        this.cancelable = Boolean(init.cancelable);
+        this.defaultPrevented = false;
+        this.target = null;
+        this.currentTarget = null;
+        this.propagationStopped = false;
+    }
+
+    preventDefault() {
+        if (this.cancelable) {
+            this.defaultPrevented = true;
+        }
+    }
+
+    stopPropagation() {
+        this.propagationStopped = true;
+    }
+}
+
+export class CustomEvent extends Event {
+    constructor(type, init = {}) {
+        super(type, init);
+        this.detail = init.detail === undefined ? null : init.detail;
+    }
+}
+
+export class KeyboardEvent extends Event {
+    constructor(type, init = {}) {
+        super(type, init);
+        this.key = init.key || '';
+        this.code = init.code || '';
+        this.ctrlKey = Boolean(init.ctrlKey);
+        this.altKey = Boolean(init.altKey);
+        this.metaKey = Boolean(init.metaKey);
+        this.shiftKey = Boolean(init.shiftKey);
+        this.repeat = Boolean(init.repeat);
+    }
+}
+
+export class MouseEvent extends Event {}
+
+export class EventTarget {
+    constructor() {
+        this.listeners = new Map();
+    }
+
+    addEventListener(type, callback, options) {
+        const capture = typeof options === 'boolean' ? options : Boolean(options && options.capture);
+        const once = Boolean(options && options.once);
+        let listeners = this.listeners.get(type);
+        if (!listeners) {
+            listeners = [];
+            this.listeners.set(type, listeners);
+        }
+        if (!listeners.some(listener => listener.callback === callback && listener.capture === capture)) {
+            listeners.push({callback, capture, once});
+        }
+    }
+
+    removeEventListener(type, callback, options) {
+        const capture = typeof options === 'boolean' ? options : Boolean(options && options.capture);
+        const listeners = this.listeners.get(type);
+        if (listeners) {
+            const index = listeners.findIndex(listener => listener.callback === callback && listener.capture === capture);
+            if (index !== -1) {
+                listeners.splice(index, 1);
+            }
+        }
+    }
+
+    invokeListeners(event, capture, atTarget) {
+        const listeners = this.listeners.get(event.type);
+        if (!listeners) {
+            return;
+        }
+        event.currentTarget = this;
+        for (const listener of listeners.slice()) {
+            if (!atTarget && listener.capture !== capture) {
+                continue;
+            }
+            if (listener.once) {
+                this.removeEventListener(event.type, listener.callback, listener.capture);
+            }
+            if (typeof listener.callback === 'function') {
+                listener.callback.call(this, event);
+            } else {
+                listener.callback.handleEvent(event);
+            }
+        }
+    }
+
+    // The event path is the target, its ancestors and, for connected nodes,
+    // the window.
+    getEventParent() {
+        return null;
+    }
+
+    dispatchEvent(event) {
+        event.target = this;
+        const path = [];
+        for (let node = this; node; node = node.getEventParent()) {
+            path.push(node);
+        }
+        for (let i = path.length - 1; i > 0 && !event.propagationStopped; i -= 1) {
+            path[i].invokeListeners(event, true, false);
+        }
+        if (!event.propagationStopped) {
+            this.invokeListeners(event, false, true);
+        }
+        if (event.bubbles) {
+            for (let i = 1; i < path.length && !event.propagationStopped; i += 1) {
+                path[i].invokeListeners(event, false, false);
+            }
+        }
+        event.currentTarget = null;
+        return !event.defaultPrevented;
+    }
+}
+
+export class Node extends EventTarget {
+    constructor(ownerDocument, nodeType) {
+        super();
+        this.ownerDocument = ownerDocument;
+        this.nodeType = nodeType;
+        this.parentNode = null;
+        this.childNodes = [];
+    }
+
+    getEventParent() {
+        if (this.parentNode) {
+            return this.parentNode;
+        }
+        return this.nodeType === DOCUMENT_NODE ? this.defaultView : null;
+    }
+
+    get isConnected() {
+        let node = this;
+        while (node.parentNode) {
+            node = node.parentNode;
+        }
+        return node.nodeType === DOCUMENT_NODE;
+    }
+
+    get firstChild() {
+        return this.childNodes[0] || null;
+    }
+
+    get children() {
+        return this.childNodes.filter(node => node.nodeType === ELEMENT_NODE);
+    }
+
+    get textContent() {
+        return this.childNodes.map(node => node.textContent).join('');
+    }
+
+    set textContent(text) {
+        this.replaceChildren(text);
+    }
+
+    toNode(node) {
+        return typeof node === 'string' ? this.ownerDocument.createTextNode(node) : node;
+    }
+
+    insertBefore(node, reference) {
+        node = this.toNode(node);
+        if (node.parentNode) {
+            node.parentNode.removeChild(node);
+        }
+        const index = reference ? this.childNodes.indexOf(reference) : this.childNodes.length;
+        this.childNodes.splice(index, 0, node);
+        node.parentNode = this;
+        queueMutation(this, {type: 'childList', target: this, addedNodes: [node], removedNodes: []});
+        return node;
+    }
+
+    appendChild(node) {
+        return this.insertBefore(node, null);
+    }
+
+    append(...nodes) {
+        for (const node of nodes) {
+            this.insertBefore(node, null);
+        }
+    }
+
+    prepend(...nodes) {
+        const reference = this.firstChild;
+        for (const node of nodes) {
+            this.insertBefore(node, reference);
+        }
+    }
+
+    removeChild(node) {
+        const index = this.childNodes.indexOf(node);
+        if (index === -1) {
+            throw new Error('The node is not a child of this node.');
+        }
+        this.childNodes.splice(index, 1);
+        node.parentNode = null;
+        queueMutation(this, {type: 'childList', target: this, addedNodes: [], removedNodes: [node]});
+        return node;
+    }
+
+    remove() {
+        if (this.parentNode) {
+            this.parentNode.removeChild(this);
+        }
+    }
+
+    replaceChildren(...nodes) {
+        for (const node of this.childNodes.slice()) {
+            this.removeChild(node);
+        }
+        this.append(...nodes);
+    }
+
+    contains(node) {
+        for (; node; node = node.parentNode) {
+            if (node === this) {
+                return true;
+            }
+        }
+        return false;
+    }
+
+    compareDocumentPosition(other) {
+        if (other === this) {
+            return 0;
+        }
+        const ancestors = node => {
+            const chain = [];
+            for (; node; node = node.parentNode) {
+                chain.unshift(node);
+            }
+            return chain;
+        };
+        const own = ancestors(this);
+        const others = ancestors(other);
+        if (own[0] !== others[0]) {
+            return Node.DOCUMENT_POSITION_DISCONNECTED;
+        }
+        let i = 0;
+        while (i < own.length && i < others.length && own[i] === others[i]) {
+            i += 1;
+        }
+        if (i === own.length) {
+            return Node.DOCUMENT_POSITION_CONTAINED_BY | Node.DOCUMENT_POSITION_FOLLOWING;
+        }
+        if (i === others.length) {
+            return Node.DOCUMENT_POSITION_CONTAINS | Node.DOCUMENT_POSITION_PRECEDING;
+        }
+        const siblings = own[i - 1].childNodes;
+        return siblings.indexOf(others[i]) > siblings.indexOf(own[i])
+            ? Node.DOCUMENT_POSITION_FOLLOWING
+            : Node.DOCUMENT_POSITION_PRECEDING;
+    }
+
+    *descendants() {
+        for (const child of this.childNodes) {
+            if (child.nodeType === ELEMENT_NODE) {
+                yield child;
+                yield* child.descendants();
+            }
+        }
+    }
+
+    querySelectorAll(selector) {
+        const selectors = parseSelector(selector);
+        const matches = [];
+        for (const element of this.descendants()) {
+            if (selectors.some(compound => matchesCompound(element, compound))) {
+                matches.push(element);
+            }
+        }
+        return matches;
+    }
+
+    querySelector(selector) {
+        const selectors = parseSelector(selector);
+        for (const element of this.descendants()) {
+            if (selectors.some(compound => matchesCompound(element, compound))) {
+                return element;
+            }
+        }
+        return null;
+    }
+}
+
+Object.assign(Node, {
+    ELEMENT_NODE,
+    TEXT_NODE,
+    DOCUMENT_NODE,
+    DOCUMENT_POSITION_DISCONNECTED: 1,
+    DOCUMENT_POSITION_PRECEDING: 2,
+    DOCUMENT_POSITION_FOLLOWING: 4,
+    DOCUMENT_POSITION_CONTAINS: 8,
+    DOCUMENT_POSITION_CONTAINED_BY: 16
+});
+
+export class Text extends Node {
+    constructor(ownerDocument, data) {
+        super(ownerDocument, TEXT_NODE);
+        this.data = data;
+    }
+
+    get textContent() {
+        return this.data;
+    }
+
+    set textContent(text) {
+        this.data = text;
+    }
+}
+
+class ClassList {
+    constructor(element) {
+        this.element = element;
+        this.classes = new Set();
+    }
+
+    add(...names) {
+        names.forEach(name => this.classes.add(name));
+    }
+
+    remove(...names) {
+        names.forEach(name => this.classes.delete(name));
+    }
+
+    contains(name) {
+        return this.classes.has(name);
+    }
+
+    toggle(name, force) {
+        const add = force === undefined ? !this.classes.has(name) : force;
+        if (add) {
+            this.classes.add(name);
+        } else {
+            this.classes.delete(name);
+        }
+        return add;
+    }
+
+    [Symbol.iterator]() {
+        return this.classes[Symbol.iterator]();
+    }
+}
+
+function toDatasetAttribute(property) {
+    return `data-${property.replace(/[A-Z]/g, char => `-${char.toLowerCase()}`)}`;
+}
+
+export class Element extends Node {
+    constructor(ownerDocument, tagName) {
+        super(ownerDocument, ELEMENT_NODE);
+        this.localName = tagName.toLowerCase();
+        this.tagName = tagName.toUpperCase();
+        this.attributes = new Map();
+        this.classList = new ClassList(this);
+        this.checked = false;
+        this.defaultChecked = false;
+        this.dataset = new Proxy({}, {
+            get: (target, property) => this.getAttribute(toDatasetAttribute(property)) ?? undefined,
+            set: (target, property, value) => {
+                this.setAttribute(toDatasetAttribute(property), value);
+                return true;
+            },
+            deleteProperty: (target, property) => {
+                this.removeAttribute(toDatasetAttribute(property));
+                return true;
+            }
+        });
+    }
+
+    get nodeName() {
+        return this.tagName;
+    }
+
+    getAttribute(name) {
+        if (name === 'class') {
+            return this.classList.classes.size ? Array.from(this.classList.classes).join(' ') : null;
+        }
+        return this.attributes.has(name) ? this.attributes.get(name) : null;
+    }
+
+    hasAttribute(name) {
+        return this.getAttribute(name) !== null;
+    }
+
+    setAttribute(name, value) {
+        const oldValue = this.getAttribute(name);
+        if (name === 'class') {
+            this.classList.classes = new Set(String(value).split(/\s+/).filter(Boolean));
+        } else {
+            this.attributes.set(name, String(value));
+        }
+        queueMutation(this, {type: 'attributes', target: this, attributeName: name, oldValue, addedNodes: [], removedNodes: []});
+    }
+
+    removeAttribute(name) {
+        if (!this.hasAttribute(name)) {
+            return;
+        }
+        const oldValue = this.getAttribute(name);
+        if (name === 'class') {
+            this.classList.classes.clear();
+        } else {
+            this.attributes.delete(name);
+        }
+        queueMutation(this, {type: 'attributes', target: this, attributeName: name, oldValue, addedNodes: [], removedNodes: []});
+    }
+
+    get id() {
+        return this.getAttribute('id') || '';
+    }
+
+    set id(value) {
+        this.setAttribute('id', value);
+    }
+
+    get className() {
+        return this.getAttribute('class') || '';
+    }
+
+    set className(value) {
+        this.setAttribute('class', value);
+    }
+
+    get type() {
+        return (this.getAttribute('type') || (this.localName === 'input' ? 'text' : '')).toLowerCase();
+    }
+
+    get name() {
+        return this.getAttribute('name') || '';
+    }
+
+    get hidden() {
+        return this.hasAttribute('hidden');
+    }
+
+    set hidden(value) {
+        if (value) {
+            this.setAttribute('hidden', '');
+        } else {
+            this.removeAttribute('hidden');
+        }
+    }
+
+    get href() {
+        return this.getAttribute('href') || '';
+    }
+
+    get previousElementSibling() {
+        const siblings = this.parentNode ? this.parentNode.children : [];
+        return siblings[siblings.indexOf(this) - 1] || null;
+    }
+
+    get nextElementSibling() {
+        const siblings = this.parentNode ? this.parentNode.children : [];
+        const index = siblings.indexOf(this);
+        return index === -1 ? null : siblings[index + 1] || null;
+    }
+
+    matches(selector) {
+        return parseSelector(selector).some(compound => matchesCompound(this, compound));
+    }
+
+    closest(selector) {
+        const selectors = parseSelector(selector);
+        for (let node = this; node && node.nodeType === ELEMENT_NODE; node = node.parentNode) {
+            if (selectors.some(compound => matchesCompound(node, compound))) {
+                return node;
+            }
+        }
+        return null;
+    }
+
+    focus() {
+        const document = this.ownerDocument;
+        if (document.activeElement === this) {
+            return;
+        }
+        const previous = document.activeElement;
+        document.activeElement = this;
+        if (previous && previous !== document.body) {
+            previous.dispatchEvent(new Event('focusout', {bubbles: true}));
+        }
+        this.dispatchEvent(new Event('focus'));
+        this.dispatchEvent(new Event('focusin', {bubbles: true}));
+    }
+
+    blur() {
+        const document = this.ownerDocument;
+        if (document.activeElement === this) {
+            document.activeElement = document.body;
+            this.dispatchEvent(new Event('focusout', {bubbles: true}));
+        }
+    }
+
+    // Checkboxes toggle before the click event is dispatched and are reset
+    // if it is cancelled, then fire input and change events.
+    click() {
+        const checkbox = this.localName === 'input' && (this.type === 'checkbox' || this.type === 'radio');
+        if (checkbox) {
+            this.checked = !this.checked;
+        }
+        const proceed = this.dispatchEvent(new MouseEvent('click', {bubbles: true, cancelable: true}));
+        if (checkbox) {
+            if (proceed) {
+                this.dispatchEvent(new Event('input', {bubbles: true}));
+                this.dispatchEvent(new Event('change', {bubbles: true}));
+            } else {
+                this.checked = !this.checked;
+            }
+        }
+    }
+
+    scrollIntoView() {}
+}
+
+export class HTMLElement extends Element {
+    get isContentEditable() {
+        return this.getAttribute('contenteditable') === 'true';
+    }
+}
+
+export class HTMLScriptElement extends HTMLElement {}
+
+// Selectors are parsed once and cached, as the shortcut scripts query the
+// same few selectors repeatedly.
+const selectorCache = new Map();
+const compoundPattern = /^([a-zA-Z][\w-]*|\*)?((?:#[\w-]+|\.[\w-]+|\[[\w-]+(?:=(?:"[^"]*"|'[^']*'|[\w-]+))?\])*)$/;
+const partPattern = /#([\w-]+)|\.([\w-]+)|\[([\w-]+)(?:=(?:"([^"]*)"|'([^']*)'|([\w-]+)))?\]/g;
+
+function parseSelector(selector) {
+    let selectors = selectorCache.get(selector);
+    if (selectors) {
+        return selectors;
+    }
+    selectors = selector.split(',').map(part => {
+        const text = part.trim();
+        const match = compoundPattern.exec(text);
+        if (!text || !match) {
+            throw new Error(`Unsupported selector in the DOM stand-in: ${selector}`);
+        }
+        const compound = {tag: match[1] && match[1] !== '*' ? match[1].toLowerCase() : null, id: null, classes: [], attributes: []};
+        for (const [, id, className, attribute, doubleQuoted, singleQuoted, bare] of match[2].matchAll(partPattern)) {
+            if (id) {
+                compound.id = id;
+            } else if (className) {
+                compound.classes.push(className);
+            } else {
+                const value = doubleQuoted ?? singleQuoted ?? bare ?? null;
+                compound.attributes.push([attribute, value]);
+            }
+        }
+        return compound;
+    });
+    selectorCache.set(selector, selectors);
+    return selectors;
+}
+
+function matchesCompound(element, compound) {
+    if (compound.tag && element.localName !== compound.tag) {
+        return false;
+    }
+    if (compound.id && element.getAttribute('id') !== compound.id) {
+        return false;
+    }
+    for (const className of compound.classes) {
+        if (!element.classList.contains(className)) {
+            return false;
+        }
+    }
+    for (const [name, value] of compound.attributes) {
+        const actual = element.getAttribute(name);
+        if (actual === null || (value !== null && actual !== value)) {
+            return false;
+        }
+    }
+    return true;
+}
+
+// MutationObserver records are delivered in a microtask, like in browsers.
+const observations = [];
+
+export class MutationObserver {
+    constructor(callback) {
+        this.callback = callback;
+        this.records = [];
+    }
+
+    observe(target, options = {}) {
+        observations.push({observer: this, target, options});
+    }
+
+    disconnect() {
+        for (let i = observations.length - 1; i >= 0; i -= 1) {
+            if (observations[i].observer === this) {
+                observations.splice(i, 1);
+            }
+        }
+        this.records = [];
+    }
+
+    takeRecords() {
+        const records = this.records;
+        this.records = [];
+        return records;
+    }
+}
+
+function observes(observation, record) {
+    const {target, options} = observation;
+    if (record.target !== target && !(options.subtree && target.contains(record.target))) {
+        return false;
+    }
+    if (record.type === 'childList') {
+        return Boolean(options.childList);
+    }
+    if (options.attributeFilter) {
+        return options.attributeFilter.includes(record.attributeName);
+    }
+    return Boolean(options.attributes);
+}
+
+function queueMutation(node, record) {
+    for (const observation of observations) {
+        if (!observes(observation, record)) {
+            continue;
+        }
+        const observer = observation.observer;
+        if (!observer.records.length) {
+            queueMicrotask(() => {
+                const records = observer.takeRecords();
+                if (records.length) {
+                    observer.callback(records, observer);
+                }
+            });
+        }
+        observer.records.push(record);
+    }
+}
+
+export class Document extends Node {
+    constructor() {
+        super(null, DOCUMENT_NODE);
+        this.ownerDocument = this;
+        this.readyState = 'complete';
+        this.documentElement = this.createElement('html');
+        this.head = this.createElement('head');
+        this.body = this.createElement('body');
+        this.documentElement.append(this.head, this.body);
+        this.appendChild(this.documentElement);
+        this.activeElement = this.body;
+        this.defaultView = null;
+    }
+
+    createElement(tagName) {
+        return tagName.toLowerCase() === 'script'
+            ? new HTMLScriptElement(this, tagName)
+            : new HTMLElement(this, tagName);
+    }
+
+    createTextNode(data) {
+        return new Text(this, String(data));
+    }
+
+    getElementById(id) {
+        for (const element of this.descendants()) {
+            if (element.getAttribute('id') === id) {
+                return element;
+            }
+        }
+        return null;
+    }
+}
+
+class Storage {
+    constructor() {
+        this.items = new Map();
+    }
+
+    getItem(key) {
+        return this.items.has(key) ? this.items.get(key) : null;
+    }
+
+    setItem(key, value) {
+        this.items.set(key, String(value));
+    }
+
+    removeItem(key) {
+        this.items.delete(key);
+    }
+
+    clear() {
+        this.items.clear();
+    }
+}
+
+/**
+ * Create an element with attributes and children, e.g.
+ * h('button', {id: 'next', 'data-hotkey': 'j'}).
+ */
+export function h(document, tagName, attributes = {}, ...children) {
+    const element = document.createElement(tagName);
+    for (const [name, value] of Object.entries(attributes)) {
+        if (value !== false && value !== null && value !== undefined) {
+            element.setAttribute(name, value === true ? '' : value);
+        }
+    }
+    element.append(...children);
+    return element;
+}
+
+/**
+ * Create a document and make it and the DOM classes the globals the
+ * scripts see, replacing the document of any previous call.
+ */
+export function installDocument({platform = 'Linux x86_64'} = {}) {
+    const document = new Document();
+    const window = new EventTarget();
+    document.defaultView = window;
+    Object.assign(window, {
+        document,
+        navigator: {platform, userAgent: 'DOM stand-in'},
+        localStorage: globalThis.localStorage instanceof Storage ? globalThis.localStorage : new Storage(),
+        setTimeout,
+        clearTimeout,
+        requestAnimationFrame: callback => setImmediate(() => callback(performance.now())),
+        cancelAnimationFrame: clearImmediate
+    });
+    const globals = {
+        window,
+        document,
+        Node,
+        Element,
+        HTMLElement,
+        HTMLScriptElement,
+        Text,
+        Event,
+        CustomEvent,
+        KeyboardEvent,
+        MouseEvent,
+        MutationObserver,
+        requestAnimationFrame: window.requestAnimationFrame,
+        cancelAnimationFrame: window.cancelAnimationFrame,
+        navigator: window.navigator,
+        localStorage: window.localStorage
+    };
+    for (const [name, value] of Object.entries(globals)) {
+        Object.defineProperty(globalThis, name, {value, configurable: true, writable: true});
+    }
+    observations.length = 0;
+    return document;
+}
@@ -0,0 +1,52 @@
+// Micro-benchmark of hotkey install/uninstall with 1k-10k bindings.
+//
+// Run from the repository root:
+//
+//     node benchmarks/js/hotkey_trie.mjs
+//
+// "distinct" binds every element to its own two-key sequence, "shared"
+// binds every element to the same hotkey, so they all share one leaf.
+
+// install() only needs document to (un)register its keydown listener.
+globalThis.document = {
+    addEventListener() {},
+    removeEventListener() {}
+};
+
+const { install, uninstall } = await import(
+    '../../src/django_admin_keyshortcuts/static/admin/js/vendor/hotkey/hotkey.js'
+);
+
+const keys = 'abcdefghijklmnopqrstuvwxyz0123456789';
+
+function makeElements(count, shared) {
+    const elements = [];
+    for (let i = 0; i < count; i++) {
+        const hotkey = shared ? 'Mod+s' : `${keys[i % keys.length]} ${keys[Math.floor(i / keys.length) % keys.length]}${i}`;
+        elements.push({
+            getAttribute(name) {
+                return name === 'data-hotkey' ? hotkey : null;
+            }
+        });
+    }
+    return elements;
+}
+
+function time(fn) {
+    const start = performance.now();
+    fn();
+    return performance.now() - start;
+}
+
+for (const shared of [false, true]) {
+    for (const count of [1000, 2000, 5000, 10000]) {
+        const elements = makeElements(count, shared);
+        const installMs = time(() => elements.forEach(el => install(el)));
+        const uninstallMs = time(() => elements.forEach(el => uninstall(el)));
+        console.log(
+            `${shared ? 'shared' : 'distinct'} ${String(count).padStart(5)} bindings: ` +
+            `install ${(installMs * 1000 / count).toFixed(2)} µs/op, ` +
+            `uninstall ${(uninstallMs * 1000 / count).toFixed(2)} µs/op`
+        );
+    }
+}
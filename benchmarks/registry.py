@@ -0,0 +1,51 @@
+"""
+Compare the per-request cost of rebuilding the shortcut table on every
+``{% get_shortcuts %}`` call against reading it from the registry.
+"""
+
+import argparse
+import timeit
+
+from benchmarks import setup
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--calls",
+        type=int,
+        default=5,
+        help="Number of get_shortcuts calls per rendered page.",
+    )
+    parser.add_argument(
+        "--requests",
+        type=int,
+        default=10000,
+        help="Number of simulated requests.",
+    )
+    options = parser.parse_args()
+
+    setup()
+    from django.utils import translation
+
+    from django_admin_keyshortcuts import registry
+
+    def rebuild():
+        for _ in range(options.calls):
+            registry.build_shortcuts()
+
+    def lookup():
+        for _ in range(options.calls):
+            registry.get_shortcuts()
+
+    with translation.override("en"):
+        for name, func in [("rebuild", rebuild), ("registry", lookup)]:
+            seconds = timeit.timeit(func, number=options.requests)
+            print(
+                f"{name:>10}: {seconds / options.requests * 1e6:8.2f} µs/request "
+                f"({options.calls} calls)"
+            )
+
+
+if __name__ == "__main__":
+    main()
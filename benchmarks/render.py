@@ -0,0 +1,128 @@
+"""
+Measure what django_admin_keyshortcuts adds to the admin render time.
+
+Each admin view is rendered with and without django_admin_keyshortcuts in
+INSTALLED_APPS. The report lists the median render time, the template tag
+call counts and the response size overhead per view. Run it with:
+
+    python runtests.py --benchmark
+"""
+
+import json
+import statistics
+import time
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.test import Client
+from django.test import override_settings
+from django.test.runner import DiscoverRunner
+from django.urls import reverse
+
+from django_admin_keyshortcuts.timing import collect_timings
+from tests.admin import LanguageAdmin
+from tests.models import Language
+from tests.models import Paper
+
+
+def get_views(language, paper):
+    return {
+        "index": reverse("test_admin_keyboard_shortcuts:index"),
+        "changelist": reverse(
+            "test_admin_keyboard_shortcuts:tests_language_changelist"
+        ),
+        "changeform": reverse(
+            "test_admin_keyboard_shortcuts:tests_paper_change", args=(paper.pk,)
+        ),
+        "delete_confirmation": reverse(
+            "test_admin_keyboard_shortcuts:tests_language_delete",
+            args=(language.pk,),
+        ),
+    }
+
+
+def count_tag_calls(client, url):
+    with collect_timings() as timings:
+        client.get(url)
+    return {name: count for name, (count, _) in timings.items()}
+
+
+def time_view(client, url, repeat):
+    client.get(url)  # Warm up template and registry caches.
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        response = client.get(url)
+        timings.append(time.perf_counter() - start)
+        assert response.status_code == 200, (url, response.status_code)
+    return statistics.median(timings) * 1000, len(response.content)
+
+
+def benchmark_views(rows, repeat):
+    user = User.objects.create_superuser(
+        username="super", password="secret", email="super@example.com"
+    )
+    Language.objects.bulk_create(
+        Language(iso=f"l{i}", name=f"Language {i}", english_name=f"Language {i}")
+        for i in range(rows)
+    )
+    views = get_views(Language.objects.first(), Paper.objects.create(title="p1"))
+    without_app = [
+        app for app in settings.INSTALLED_APPS if app != "django_admin_keyshortcuts"
+    ]
+    client = Client()
+    client.force_login(user)
+
+    results = {}
+    with mock.patch.object(LanguageAdmin, "list_per_page", rows):
+        for name, url in views.items():
+            with_ms, with_bytes = time_view(client, url, repeat)
+            calls = count_tag_calls(client, url)
+            with override_settings(INSTALLED_APPS=without_app):
+                without_ms, without_bytes = time_view(client, url, repeat)
+            results[name] = {
+                "time_ms": with_ms,
+                "baseline_time_ms": without_ms,
+                "overhead_ms": with_ms - without_ms,
+                "bytes": with_bytes,
+                "overhead_bytes": with_bytes - without_bytes,
+                "tag_calls": calls,
+            }
+    return results
+
+
+def print_report(results, baseline=None):
+    print(
+        f"{'view':<20} {'time ms':>9} {'overhead ms':>12} {'overhead B':>11} "
+        f"{'tag calls':>10}"
+    )
+    for name, result in results.items():
+        line = (
+            f"{name:<20} {result['time_ms']:>9.2f} {result['overhead_ms']:>12.2f} "
+            f"{result['overhead_bytes']:>11} {sum(result['tag_calls'].values()):>10}"
+        )
+        if baseline and name in baseline:
+            previous = baseline[name]["time_ms"]
+            line += f"  ({(result['time_ms'] - previous) / previous:+.1%} vs baseline)"
+        print(line)
+
+
+def run_benchmarks(rows=100, repeat=20, output=None, compare=None):
+    baseline = None
+    if compare:
+        with open(compare) as f:
+            baseline = json.load(f)["results"]
+
+    runner = DiscoverRunner(verbosity=0)
+    old_config = runner.setup_databases()
+    try:
+        with override_settings(ALLOWED_HOSTS=["testserver"]):
+            results = benchmark_views(rows, repeat)
+    finally:
+        runner.teardown_databases(old_config)
+
+    print_report(results, baseline)
+    if output:
+        with open(output, "w") as f:
+            json.dump({"rows": rows, "repeat": repeat, "results": results}, f, indent=2)
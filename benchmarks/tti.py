@@ -0,0 +1,89 @@
+"""
+Measure how long it takes for the keyboard shortcuts to become usable on an
+admin page, loading the individual script modules and loading the bundle
+(ADMIN_KEYSHORTCUTS_BUNDLE).
+
+The time is read from the "admin-keyshortcuts:ready" performance mark set by
+shortcuts.js once the hotkeys are installed. Requires selenium and a browser:
+
+    python -m benchmarks.tti --browser chrome --headless
+"""
+
+import argparse
+import statistics
+
+from benchmarks import setup
+
+
+def measure(selenium, url, repeat):
+    ready, interactive = [], []
+    for _ in range(repeat):
+        selenium.get(url)
+        timings = selenium.execute_script(
+            "const [ready] = performance.getEntriesByName("
+            "  'admin-keyshortcuts:ready');"
+            "const [navigation] = performance.getEntriesByType('navigation');"
+            "return [ready && ready.startTime, navigation.domInteractive];"
+        )
+        ready.append(timings[0])
+        interactive.append(timings[1])
+    return statistics.median(ready), statistics.median(interactive)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--browser", default="chrome")
+    parser.add_argument("--headless", action="store_true")
+    parser.add_argument("--repeat", type=int, default=10)
+    options = parser.parse_args()
+
+    setup()
+    from django.contrib.auth.models import User
+    from django.contrib.staticfiles.testing import StaticLiveServerTestCase
+    from django.test import override_settings
+    from django.test.runner import DiscoverRunner
+    from django.test.selenium import SeleniumTestCaseBase
+    from django.urls import reverse
+
+    class LiveServer(StaticLiveServerTestCase):
+        pass
+
+    runner = DiscoverRunner(verbosity=0)
+    old_config = runner.setup_databases()
+    LiveServer.setUpClass()
+    selenium_options = SeleniumTestCaseBase.import_options(options.browser)()
+    if options.headless:
+        selenium_options.add_argument(
+            "--headless=new" if options.browser == "chrome" else "-headless"
+        )
+    selenium = SeleniumTestCaseBase.import_webdriver(options.browser)(
+        options=selenium_options
+    )
+    try:
+        user = User.objects.create_superuser(
+            username="super", password="secret", email="super@example.com"
+        )
+        selenium.get(LiveServer.live_server_url + "/")
+        client_session = LiveServer.client_class()
+        client_session.force_login(user)
+        selenium.add_cookie(
+            {"name": "sessionid", "value": client_session.cookies["sessionid"].value}
+        )
+        url = LiveServer.live_server_url + reverse(
+            "test_admin_keyboard_shortcuts:tests_language_changelist"
+        )
+        for bundle in [False, True]:
+            with override_settings(ADMIN_KEYSHORTCUTS_BUNDLE=bundle):
+                ready, interactive = measure(selenium, url, options.repeat)
+            print(
+                f"{'bundle' if bundle else 'modules':>8}: shortcuts ready at "
+                f"{ready:.1f} ms (DOM interactive at {interactive:.1f} ms)"
+            )
+    finally:
+        selenium.quit()
+        LiveServer.tearDownClass()
+        runner.teardown_databases(old_config)
+
+
+if __name__ == "__main__":
+    main()
@@ -50,7 +50,16 @@ export default [
         }
     },
     {
-        files: ["src/django_admin_keyshortcuts/static/admin/js/vendor/hotkey/*.js", "src/django_admin_keyshortcuts/static/admin/js/shortcuts.js"],
+        files: ["benchmarks/**/*.mjs"],
+        languageOptions: {
+            globals: {
+                ...globals.browser,
+                ...globals.node
+            }
+        }
+    },
+    {
+        files: ["src/django_admin_keyshortcuts/static/admin/js/vendor/hotkey/*.js", "src/django_admin_keyshortcuts/static/admin/js/shortcuts.js", "src/django_admin_keyshortcuts/static/admin/js/shortcuts_changeform.js"],
         languageOptions: {
             sourceType: "module"
         }
@@ -58,6 +67,7 @@ export default [
     {
         ignores: [
             "**/*.min.js",
+            "src/django_admin_keyshortcuts/static/admin/js/shortcuts.bundle.js",
             "**/vendor/**/*.js",
             "django/contrib/gis/templates/**/*.js",
             "django/views/templates/*.js",
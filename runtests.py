@@ -49,6 +49,35 @@ def main():
         action="store_true",
         help="Take screenshots during selenium tests to capture the user interface.",
     )
+    parser.add_argument(
+        "--benchmark",
+        action="store_true",
+        help="Run the admin render benchmarks instead of the tests.",
+    )
+    parser.add_argument(
+        "--benchmark-rows",
+        type=int,
+        default=100,
+        metavar="N",
+        help="Number of rows on the benchmarked changelist.",
+    )
+    parser.add_argument(
+        "--benchmark-repeat",
+        type=int,
+        default=20,
+        metavar="N",
+        help="Number of renders timed per view.",
+    )
+    parser.add_argument(
+        "--benchmark-output",
+        metavar="FILE",
+        help="Save the benchmark results to a JSON file.",
+    )
+    parser.add_argument(
+        "--benchmark-compare",
+        metavar="FILE",
+        help="Compare the benchmark results to a JSON file from --benchmark-output.",
+    )
     options = parser.parse_args()
 
     if options.screenshots and not options.selenium:
@@ -60,6 +89,18 @@ def main():
 
     os.environ["DJANGO_SETTINGS_MODULE"] = "tests.settings"
     django.setup()
+
+    if options.benchmark:
+        from benchmarks.render import run_benchmarks
+
+        run_benchmarks(
+            rows=options.benchmark_rows,
+            repeat=options.benchmark_repeat,
+            output=options.benchmark_output,
+            compare=options.benchmark_compare,
+        )
+        sys.exit(0)
+
     test_runner = DiscoverRunner(verbosity=3)
     failures = test_runner.run_tests([])
     sys.exit(failures)
@@ -0,0 +1,100 @@
+// Build admin/js/shortcuts.bundle.js from the shortcut scripts.
+//
+// Run from the repository root after changing any of the bundled scripts:
+//
+//     npm run build
+//
+// The bundle concatenates the vendored hotkey module, shortcuts.js and the
+// changelist, change form and command palette scripts into a single module
+// without imports, so that admin pages load one file. The bundle has no
+// relative imports or source maps, so ManifestStaticFilesStorage can add a
+// content hash to its name without rewriting it.
+//
+// The bundle is not minified, no minifier is installed. strip() works line
+// by line: it trims indentation and drops blank lines and lines starting
+// with //. That only changes the program inside a template literal or a
+// backslash-continued string spanning lines, which checkTemplateLiterals()
+// rejects. Regular expression literals can't span lines, but the check
+// doesn't tokenize them either, see below.
+import { readFileSync, writeFileSync } from 'node:fs';
+
+const jsDir = 'src/django_admin_keyshortcuts/static/admin/js';
+
+function read(name) {
+    return readFileSync(`${jsDir}/${name}`, 'utf8');
+}
+
+function strip(source) {
+    return source
+        .split('\n')
+        .map(line => line.trim())
+        .filter(line => line !== '' && !line.startsWith('//'))
+        .join('\n');
+}
+
+// Stripping would change the content of a template literal or a string
+// continued with a backslash across lines. The check skips strings and
+// comments, but not regular expressions, so a regular expression with a
+// quote or backtick in a bundled script breaks it.
+function checkTemplateLiterals(name, source) {
+    let quote = null;
+    let line = 1;
+    for (let i = 0; i < source.length; i++) {
+        const char = source[i];
+        if (char === '\n') {
+            if (quote === '`') {
+                throw new Error(`Template literal spanning lines in ${name}:${line}`);
+            }
+            line += 1;
+        }
+        if (quote) {
+            if (char === '\\') {
+                if (source[i + 1] === '\n') {
+                    throw new Error(`String continued across lines in ${name}:${line}`);
+                }
+                i += 1;
+            } else if (char === quote) {
+                quote = null;
+            }
+        } else if (char === "'" || char === '"' || char === '`') {
+            quote = char;
+        } else if (source.startsWith('//', i)) {
+            const end = source.indexOf('\n', i);
+            i = end === -1 ? source.length : end - 1;
+        } else if (source.startsWith('/*', i)) {
+            const end = source.indexOf('*/', i);
+            if (end === -1) {
+                break;
+            }
+            line += source.slice(i, end).split('\n').length - 1;
+            i = end + 1;
+        }
+    }
+}
+
+const hotkey = read('vendor/hotkey/hotkey.js').replace(/^export \{[^}]*\};?$/m, '');
+const shortcuts = read('shortcuts.js').replace(/^import \{[^}]*\} from '[^']*';$/m, '');
+const changelist = read('shortcuts_changelist.js');
+const changeform = read('shortcuts_changeform.js').replace(/^import \{[^}]*\} from '[^']*';$/m, '');
+const palette = read('shortcuts_palette.js');
+const sources = [
+    ['hotkey.js', hotkey],
+    ['shortcuts.js', shortcuts],
+    ['shortcuts_changelist.js', changelist],
+    ['shortcuts_changeform.js', changeform],
+    ['shortcuts_palette.js', palette]
+];
+
+for (const [name, source] of [['hotkey.js', hotkey], ['shortcuts.js', shortcuts], ['shortcuts_changeform.js', changeform]]) {
+    if (/^\s*(import|export)\b/m.test(source)) {
+        throw new Error(`Unexpected import or export left in ${name}`);
+    }
+}
+for (const [name, source] of sources) {
+    checkTemplateLiterals(name, source);
+}
+
+writeFileSync(
+    `${jsDir}/shortcuts.bundle.js`,
+    strip(sources.map(([, source]) => source).join('\n')) + '\n'
+);
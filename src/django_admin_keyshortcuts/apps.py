@@ -0,0 +1,15 @@
+from django.apps import AppConfig
+from django.utils.translation import gettext_lazy as _
+
+
+class AdminKeyshortcutsConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "django_admin_keyshortcuts"
+    verbose_name = _("Admin keyboard shortcuts")
+
+    def ready(self):
+        from django_admin_keyshortcuts import bindings
+        from django_admin_keyshortcuts import checks  # noqa: F401
+
+        # Compile the ADMIN_KEYSHORTCUTS setting once, before any request.
+        bindings.compile_settings()
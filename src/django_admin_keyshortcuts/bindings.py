@@ -0,0 +1,292 @@
+"""
+Compilation of the shortcut bindings from the ADMIN_KEYSHORTCUTS setting.
+
+The setting overrides the default hotkey of shortcuts by group and name, or
+disables them with None::
+
+    ADMIN_KEYSHORTCUTS = {
+        "changeform": {"save": "Mod+Enter", "delete": None},
+    }
+
+The bindings are parsed, normalized and checked for conflicts once, when the
+app is ready. Problems are reported by the system checks. Per-user
+overrides from ShortcutPreference are applied over the setting and
+compiled once per distinct set of overrides.
+"""
+
+import json
+from functools import lru_cache
+from types import MappingProxyType
+
+from django.conf import settings
+from django.core import checks
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+SEQUENCE_DELIMITER = " "
+# Modifiers in the order they are written in normalized hotkeys. The hotkey
+# library orders them the same way once Mod is replaced by Control or Meta.
+MODIFIERS = ["Mod", "Control", "Alt", "Meta", "Shift"]
+# What Mod stands for on each platform, as in hotkey's localizeMod().
+PLATFORM_MODS = {"mac": "Meta", "other": "Control"}
+
+_compiled = None
+
+
+class InvalidHotkey(ValueError):
+    pass
+
+
+def split_alternatives(hotkey):
+    """
+    Split a hotkey string into its comma-separated alternatives, following
+    hotkey's expandHotkeyToEdges(): a comma right after a key separates
+    alternatives, otherwise it is the "," key.
+    """
+    alternatives = []
+    current = ""
+    comma_is_separator = False
+    for char in hotkey:
+        if comma_is_separator and char == ",":
+            alternatives.append(current)
+            current = ""
+            comma_is_separator = False
+            continue
+        comma_is_separator = char not in {SEQUENCE_DELIMITER, "+"}
+        current += char
+    alternatives.append(current)
+    return alternatives
+
+
+def normalize_combo(combo):
+    *modifiers, key = combo.split("+")
+    if not key:
+        raise InvalidHotkey(f"{combo!r} has no key.")
+    if key in MODIFIERS:
+        raise InvalidHotkey(f"{combo!r} has no key besides modifiers.")
+    for modifier in modifiers:
+        if modifier not in MODIFIERS:
+            raise InvalidHotkey(
+                f"{combo!r} has an unknown modifier {modifier!r}, "
+                f"expected one of {', '.join(MODIFIERS)}."
+            )
+    if len(set(modifiers)) != len(modifiers):
+        raise InvalidHotkey(f"{combo!r} repeats a modifier.")
+    return "+".join(
+        [modifier for modifier in MODIFIERS if modifier in modifiers] + [key]
+    )
+
+
+def normalize_hotkey(hotkey):
+    """
+    Return the hotkey string with the modifiers of every key combo in a
+    consistent order, e.g. "Shift+Mod+s" becomes "Mod+Shift+s".
+
+    Raise InvalidHotkey if the string can't be parsed.
+    """
+    if not isinstance(hotkey, str) or not hotkey.strip():
+        raise InvalidHotkey(f"{hotkey!r} is not a hotkey string.")
+    return ",".join(
+        SEQUENCE_DELIMITER.join(
+            normalize_combo(combo) for combo in alternative.split(SEQUENCE_DELIMITER)
+        )
+        for alternative in split_alternatives(hotkey.strip())
+    )
+
+
+def get_sequences(hotkey, platform):
+    """
+    Return the key sequences the hotkey is bound to on the platform, as
+    tuples of combos in the form the hotkey library matches them.
+    """
+    sequences = []
+    for alternative in split_alternatives(hotkey):
+        sequence = []
+        for combo in alternative.split(SEQUENCE_DELIMITER):
+            *modifiers, key = combo.replace("Mod", PLATFORM_MODS[platform]).split("+")
+            ordered = [m for m in MODIFIERS if m in modifiers]
+            sequence.append("+".join(ordered + [key]))
+        sequences.append(tuple(sequence))
+    return sequences
+
+
+def find_conflicts(bindings):
+    """
+    Yield pairs of shortcuts shown on the same admin view whose key
+    sequences are equal or one is a prefix of the other, so that one of
+    them can never fire.
+    """
+    seen = set()
+    pages = [
+        {**bindings["global"], **shortcuts}
+        for group, shortcuts in bindings.items()
+        if group != "global"
+    ]
+    for page in pages:
+        names = sorted(page)
+        for platform in PLATFORM_MODS:
+            sequences = {name: get_sequences(page[name][1], platform) for name in names}
+            for i, first in enumerate(names):
+                for second in names[i + 1 :]:
+                    pair = (page[first][0], page[second][0])
+                    if pair in seen:
+                        continue
+                    if any(
+                        a[: len(b)] == b[: len(a)]
+                        for a in sequences[first]
+                        for b in sequences[second]
+                    ):
+                        seen.add(pair)
+                        yield pair
+
+
+def compile_bindings(defaults, overrides):
+    """
+    Merge the overrides into the default bindings.
+
+    defaults maps groups to {name: (description, hotkey)}, overrides maps
+    groups to {name: hotkey or None}. Return the read-only table of
+    normalized hotkeys by group and name, and a list of system check errors.
+    Invalid overrides are reported and the default binding is kept.
+    """
+    errors = []
+    if not isinstance(overrides, dict):
+        errors.append(
+            checks.Error(
+                "The ADMIN_KEYSHORTCUTS setting must be a dictionary.",
+                id="admin_keyshortcuts.E001",
+            )
+        )
+        overrides = {}
+    bindings = {
+        group: {name: hotkey for name, (_, hotkey) in shortcuts.items()}
+        for group, shortcuts in defaults.items()
+    }
+    for group, shortcuts in overrides.items():
+        if group not in bindings or not isinstance(shortcuts, dict):
+            errors.append(
+                checks.Error(
+                    f"ADMIN_KEYSHORTCUTS has an unknown shortcut group {group!r}.",
+                    hint=f"Shortcut groups are: {', '.join(bindings)}.",
+                    id="admin_keyshortcuts.E002",
+                )
+            )
+            continue
+        for name, hotkey in shortcuts.items():
+            if name not in bindings[group]:
+                errors.append(
+                    checks.Error(
+                        f"ADMIN_KEYSHORTCUTS[{group!r}] has an unknown shortcut "
+                        f"{name!r}.",
+                        hint=f"Shortcuts are: {', '.join(bindings[group])}.",
+                        id="admin_keyshortcuts.E003",
+                    )
+                )
+                continue
+            if hotkey is None:
+                bindings[group][name] = None
+                continue
+            try:
+                bindings[group][name] = normalize_hotkey(hotkey)
+            except InvalidHotkey as e:
+                errors.append(
+                    checks.Error(
+                        f"ADMIN_KEYSHORTCUTS[{group!r}][{name!r}] is invalid: {e}",
+                        id="admin_keyshortcuts.E004",
+                    )
+                )
+    # Disabled shortcuts are left out of the table.
+    enabled = {
+        group: {
+            name: ((group, name), hotkey)
+            for name, hotkey in shortcuts.items()
+            if hotkey is not None
+        }
+        for group, shortcuts in bindings.items()
+    }
+    for first, second in find_conflicts(enabled):
+        errors.append(
+            checks.Error(
+                f"The {'.'.join(first)} and {'.'.join(second)} shortcuts conflict.",
+                hint="Shortcuts on the same page must not share a key sequence "
+                "or start with another shortcut's key sequence.",
+                id="admin_keyshortcuts.E005",
+            )
+        )
+    table = MappingProxyType(
+        {
+            group: MappingProxyType(
+                {name: hotkey for name, hotkey in shortcuts.items() if hotkey}
+            )
+            for group, shortcuts in bindings.items()
+        }
+    )
+    return table, errors
+
+
+def compile_settings():
+    """Compile the ADMIN_KEYSHORTCUTS setting into the bindings table."""
+    global _compiled
+    from django_admin_keyshortcuts.registry import SHORTCUTS
+
+    _compiled = compile_bindings(SHORTCUTS, getattr(settings, "ADMIN_KEYSHORTCUTS", {}))
+
+
+def merge_overrides(overrides, user_overrides):
+    """
+    Apply per-user overrides over the overrides of the setting. Groups of the
+    setting that aren't dicts are skipped, the system checks report them.
+    """
+    merged = {
+        group: dict(shortcuts)
+        for group, shortcuts in overrides.items()
+        if isinstance(shortcuts, dict)
+    }
+    for group, shortcuts in user_overrides.items():
+        merged.setdefault(group, {}).update(shortcuts)
+    return merged
+
+
+def compile_user_bindings(user_overrides):
+    """
+    Compile per-user overrides applied over the ADMIN_KEYSHORTCUTS setting.
+    Return the table and system check errors as compile_bindings() does.
+    """
+    from django_admin_keyshortcuts.registry import SHORTCUTS
+
+    overrides = getattr(settings, "ADMIN_KEYSHORTCUTS", {})
+    if not isinstance(overrides, dict):
+        overrides = {}
+    return compile_bindings(SHORTCUTS, merge_overrides(overrides, user_overrides))
+
+
+@lru_cache(maxsize=128)
+def _get_user_bindings(key):
+    return compile_user_bindings(json.loads(key))[0]
+
+
+def get_bindings(user_overrides=None):
+    """
+    Return the compiled table of hotkeys by group and shortcut name, with
+    the per-user overrides applied, if any.
+    """
+    if _compiled is None:
+        compile_settings()
+    if not user_overrides:
+        return _compiled[0]
+    return _get_user_bindings(json.dumps(user_overrides, sort_keys=True))
+
+
+def get_errors():
+    """Return the system check errors found compiling the bindings."""
+    if _compiled is None:
+        compile_settings()
+    return _compiled[1]
+
+
+@receiver(setting_changed)
+def reset_bindings(*, setting, **kwargs):
+    global _compiled
+    if setting == "ADMIN_KEYSHORTCUTS":
+        _compiled = None
+        _get_user_bindings.cache_clear()
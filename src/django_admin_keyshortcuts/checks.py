@@ -0,0 +1,27 @@
+from django.conf import settings
+from django.core.checks import Warning
+from django.core.checks import register
+
+from django_admin_keyshortcuts.bindings import get_errors
+from django_admin_keyshortcuts.conf import get_setting
+
+
+@register()
+def check_shortcut_bindings(app_configs, **kwargs):
+    """Report the problems found compiling the ADMIN_KEYSHORTCUTS setting."""
+    return list(get_errors())
+
+
+@register()
+def check_async_save_middleware(app_configs, **kwargs):
+    middleware = "django_admin_keyshortcuts.middleware.AsyncSaveMiddleware"
+    if get_setting("ASYNC_SAVE") and middleware not in settings.MIDDLEWARE:
+        return [
+            Warning(
+                "ADMIN_KEYSHORTCUTS_ASYNC_SAVE is enabled but AsyncSaveMiddleware "
+                "isn't in MIDDLEWARE.",
+                hint=f"Add {middleware!r} to MIDDLEWARE.",
+                id="admin_keyshortcuts.W001",
+            )
+        ]
+    return []
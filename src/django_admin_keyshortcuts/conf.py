@@ -0,0 +1,44 @@
+from django.conf import settings
+
+# Default values of the ADMIN_KEYSHORTCUTS_* settings.
+DEFAULTS = {
+    # How the help dialog is delivered: "inline" renders it into every admin
+    # page, "lazy" fetches it from the dialog view when it is first opened.
+    "DIALOG": "inline",
+    # Load the prebuilt admin/js/shortcuts.bundle.js instead of the
+    # individual script modules.
+    "BUNDLE": False,
+    # Alias of the cache storing rendered help dialogs and command palette
+    # indexes, None disables caching.
+    "CACHE": None,
+    # Render platform-independent key labels, localized by shortcuts.js.
+    "PLATFORM_NEUTRAL": False,
+    # Fraction of shortcut keypresses whose latency is measured and sent to
+    # the latency collector view, 0 disables the measurements.
+    "LATENCY_SAMPLE_RATE": 0,
+    # Alias of the cache storing the latency histograms.
+    "LATENCY_CACHE": "default",
+    # Add a command palette for going to the apps and models of the admin site.
+    "PALETTE": False,
+    # Save the change form in place with the save shortcuts. Requires
+    # AsyncSaveMiddleware.
+    "ASYNC_SAVE": False,
+    # Store the enabled state and hotkeys of the shortcuts per user, in the
+    # ShortcutPreference model, instead of in the browser.
+    "PREFERENCES": False,
+    # Register a service worker serving the shortcut static files and the
+    # lazily loaded help dialogs from the browser cache.
+    "SERVICE_WORKER": False,
+    # How the deleted objects are rendered on the delete confirmation page:
+    # "full" renders the whole tree, "lazy" renders the top level and fetches
+    # the related objects of an item when it is expanded.
+    "DELETED_OBJECTS": "full",
+    # Alias of the cache keeping the deleted objects trees of the "lazy" mode
+    # between expansions.
+    "DELETED_OBJECTS_CACHE": "default",
+}
+
+
+def get_setting(name):
+    """Return the value of the ADMIN_KEYSHORTCUTS_<name> setting."""
+    return getattr(settings, f"ADMIN_KEYSHORTCUTS_{name}", DEFAULTS[name])
@@ -0,0 +1,100 @@
+"""
+Collapsed rendering of the deleted objects tree of the delete confirmation
+page, for the "lazy" ADMIN_KEYSHORTCUTS_DELETED_OBJECTS mode.
+
+The tree is the nested list returned by ModelAdmin.get_deleted_objects(),
+where an item followed by a list has the objects of the list as related
+objects. Only one level is rendered at a time. Items with related objects
+are rendered as closed <details> elements, and their branch is fetched
+from the deleted_objects view when they are opened. A branch is addressed
+by the positions of its items from the top of the tree.
+
+The tree collected for the delete confirmation page is kept for a few
+minutes in the ADMIN_KEYSHORTCUTS_DELETED_OBJECTS_CACHE cache, so that
+expanding items doesn't collect the whole cascade again.
+"""
+
+import hashlib
+
+from django.core.cache import caches
+from django.utils.html import format_html
+from django.utils.html import format_html_join
+from django.utils.http import urlencode
+from django.utils.translation import ngettext
+
+from django_admin_keyshortcuts.conf import get_setting
+
+# Seconds a collected tree is kept.
+TREE_CACHE_TIMEOUT = 5 * 60
+
+
+def iter_items(tree):
+    """Yield the (item, related objects) pairs of a level of the tree."""
+    i = 0
+    while i < len(tree):
+        item = tree[i]
+        children = []
+        if i + 1 < len(tree) and isinstance(tree[i + 1], (list, tuple)):
+            children = tree[i + 1]
+            i += 1
+        i += 1
+        yield item, children
+
+
+def count_items(tree):
+    """Return the number of objects in the tree, at any depth."""
+    return sum(1 + count_items(children) for _, children in iter_items(tree))
+
+
+def get_branch(tree, path):
+    """
+    Return the related objects of the item at the path of positions, or None
+    if there is no such item or it has no related objects.
+    """
+    for position in path:
+        items = list(iter_items(tree))
+        if not 0 <= position < len(items):
+            return None
+        tree = items[position][1]
+    return tree or None
+
+
+def render_branch(tree, src, path=()):
+    """
+    Render the items of a level of the tree as <li> elements, with the
+    related objects of the items loaded from src when expanded.
+    """
+    rows = []
+    for position, (item, children) in enumerate(iter_items(tree)):
+        if not children:
+            rows.append(format_html("<li>{}</li>", item))
+            continue
+        count = count_items(children)
+        query = urlencode({"path": ".".join(map(str, [*path, position]))})
+        rows.append(
+            format_html(
+                '<li><details data-src="{}?{}"><summary>{} '
+                '<span class="deleted-objects-count">({})</span></summary>'
+                "</details></li>",
+                src,
+                query,
+                item,
+                ngettext("%(count)s related object", "%(count)s related objects", count)
+                % {"count": count},
+            )
+        )
+    return format_html_join("", "{}", ((row,) for row in rows))
+
+
+def get_tree_cache():
+    return caches[get_setting("DELETED_OBJECTS_CACHE")]
+
+
+def get_tree_cache_key(user, src):
+    """
+    Return the cache key of the tree of the user's delete confirmation page,
+    whose branches are loaded from src.
+    """
+    key = f"{user.pk}\0{src}".encode()
+    digest = hashlib.md5(key, usedforsecurity=False).hexdigest()
+    return f"admin_keyshortcuts.deleted_objects.{digest}"
@@ -0,0 +1,73 @@
+import hashlib
+import json
+from functools import lru_cache
+
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.template.loader import get_template
+from django.utils import translation
+
+from django_admin_keyshortcuts import __version__
+from django_admin_keyshortcuts import registry
+from django_admin_keyshortcuts.conf import get_setting
+
+# Help dialog templates per admin view type.
+DIALOG_TEMPLATES = {
+    "global": "admin/shortcuts.html",
+    "changelist": "admin/change_list_shortcuts.html",
+    "changeform": "admin/change_form_shortcuts.html",
+    "delete_confirmation": "admin/delete_confirmation_shortcuts.html",
+}
+
+
+def get_dialog_cache():
+    """
+    Return the cache for rendered help dialogs, or None if dialog caching is
+    disabled.
+    """
+    alias = get_setting("CACHE")
+    if alias is None:
+        return None
+    return caches[alias]
+
+
+@lru_cache
+def get_dialog_cache_version():
+    """
+    Return the version of the cached help dialogs.
+
+    It changes with the package version, the shortcut definitions and the
+    source of the (possibly overridden) dialog templates, so stale dialogs
+    are never served after any of them change.
+    """
+    with translation.override(None):
+        shortcuts = json.dumps(registry.build_shortcuts(), default=dict)
+    sources = [get_template(name).template.source for name in DIALOG_TEMPLATES.values()]
+    key = "\0".join([__version__, shortcuts, *sources])
+    return hashlib.md5(key.encode(), usedforsecurity=False).hexdigest()
+
+
+def get_dialog_cache_key(
+    view_type, language, platform, bindings_key="", template_names=()
+):
+    """
+    Return the cache key of a rendered help dialog. template_names are the
+    names of the templates the dialog is rendered in, so that pages with
+    per-app or per-model template overrides have their own dialog.
+    """
+    key = f"admin_keyshortcuts.dialog.{view_type}.{language}.{platform}"
+    if bindings_key:
+        key = f"{key}.{bindings_key}"
+    if template_names:
+        templates = "\0".join(template_names).encode()
+        key = f"{key}.{hashlib.md5(templates, usedforsecurity=False).hexdigest()}"
+    return key
+
+
+@receiver(setting_changed)
+def reset_dialog_cache_version(*, setting, **kwargs):
+    if setting in {"INSTALLED_APPS", "TEMPLATES"} or setting.startswith(
+        "ADMIN_KEYSHORTCUTS"
+    ):
+        get_dialog_cache_version.cache_clear()
@@ -0,0 +1,76 @@
+from django import forms
+from django.utils.translation import gettext_lazy as _
+
+from django_admin_keyshortcuts.bindings import InvalidHotkey
+from django_admin_keyshortcuts.bindings import compile_user_bindings
+from django_admin_keyshortcuts.bindings import get_bindings
+from django_admin_keyshortcuts.bindings import normalize_hotkey
+from django_admin_keyshortcuts.conf import get_setting
+from django_admin_keyshortcuts.registry import FEATURE_SHORTCUTS
+from django_admin_keyshortcuts.registry import SHORTCUTS
+
+# Titles of the shortcut groups, as in the help dialog.
+GROUP_TITLES = {
+    "global": _("Global"),
+    "changelist": _("Change List"),
+    "changeform": _("Change Form"),
+    "delete_confirmation": _("Delete Confirmation"),
+}
+
+
+class ShortcutPreferencesForm(forms.Form):
+    """
+    Edit the enabled state and the hotkeys of a user's shortcuts. A blank
+    hotkey keeps the site's binding.
+    """
+
+    enabled = forms.BooleanField(label=_("Use keyboard shortcuts"), required=False)
+
+    def __init__(self, *args, preferences, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.initial.setdefault("enabled", preferences["enabled"])
+        site_bindings = get_bindings()
+        self.shortcut_fields = {}
+        for group, shortcuts in SHORTCUTS.items():
+            user_bindings = preferences["bindings"].get(group, {})
+            for name, (description, _hotkey) in shortcuts.items():
+                setting = FEATURE_SHORTCUTS.get((group, name))
+                if setting and not get_setting(setting):
+                    continue
+                field_name = f"{group}.{name}"
+                self.fields[field_name] = forms.CharField(
+                    label=description,
+                    required=False,
+                    help_text=site_bindings[group].get(name, ""),
+                )
+                self.initial.setdefault(field_name, user_bindings.get(name) or "")
+                self.shortcut_fields[field_name] = (group, name)
+
+    def get_groups(self):
+        """Yield the title and bound fields of each shortcut group."""
+        for group, title in GROUP_TITLES.items():
+            yield (
+                title,
+                [
+                    self[field_name]
+                    for field_name, (field_group, _name) in self.shortcut_fields.items()
+                    if field_group == group
+                ],
+            )
+
+    def clean(self):
+        cleaned_data = super().clean()
+        bindings = {}
+        for field_name, (group, name) in self.shortcut_fields.items():
+            hotkey = cleaned_data.get(field_name)
+            if not hotkey:
+                continue
+            try:
+                bindings.setdefault(group, {})[name] = normalize_hotkey(hotkey)
+            except InvalidHotkey as e:
+                self.add_error(field_name, str(e))
+        for error in compile_user_bindings(bindings)[1]:
+            if error.id == "admin_keyshortcuts.E005":
+                self.add_error(None, error.msg)
+        cleaned_data["bindings"] = bindings
+        return cleaned_data
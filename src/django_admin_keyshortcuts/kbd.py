@@ -0,0 +1,109 @@
+import re
+from functools import lru_cache
+
+from django.utils.html import format_html
+from django.utils.html import format_html_join
+
+from django_admin_keyshortcuts.conf import get_setting
+
+MAC = "mac"
+OTHER = "other"
+# Platform-independent markup, relabeled by shortcuts.js in the browser.
+NEUTRAL = "neutral"
+
+# Sec-CH-UA-Platform client hint values of Apple platforms.
+APPLE_PLATFORM_HINTS = {"iOS", "macOS"}
+APPLE_USER_AGENT_RE = re.compile(r"Mac|iPod|iPhone|iPad")
+
+# Labels for modifier keys per client platform.
+MODIFIER_KEY_LABELS = {
+    MAC: {"Alt": "⌥", "Mod": "⌘", "Ctrl": "^", "Control": "^", "Meta": "⌘"},
+    OTHER: {
+        "Alt": "Alt",
+        "Mod": "Ctrl",
+        "Ctrl": "Ctrl",
+        "Control": "Ctrl",
+        "Meta": "Meta",
+    },
+}
+# Neutral markup has the labels of other platforms until shortcuts.js
+# relabels it on Apple platforms.
+MODIFIER_KEY_LABELS[NEUTRAL] = MODIFIER_KEY_LABELS[OTHER]
+
+
+def render_key(key, modifier_labels):
+    return format_html("<kbd>{}</kbd>", modifier_labels.get(key, key))
+
+
+def render_neutral_key(key, modifier_labels):
+    """
+    Render the key with the default label, keeping the key name of modifiers
+    in a data-key attribute for shortcuts.js to relabel.
+    """
+    if key in modifier_labels:
+        return format_html('<kbd data-key="{}">{}</kbd>', key, modifier_labels[key])
+    return format_html("<kbd>{}</kbd>", key)
+
+
+def render_combo(combo, modifier_labels, key_renderer=render_key):
+    """Split combo string by "+", map modifier labels and wrap each key in <kbd>."""
+    keys = combo.split("+")
+    return format_html_join(
+        "+", "{}", [(key_renderer(key, modifier_labels),) for key in keys]
+    )
+
+
+@lru_cache(maxsize=256)
+def format_kbd(keyshortcut, platform):
+    """
+    Render a keyshortcut string as HTML kbd elements for the given platform.
+
+    The output only depends on the arguments, so it is cached. Use
+    format_kbd.cache_info() to inspect the cache hits and misses.
+    """
+    modifier_labels = MODIFIER_KEY_LABELS[platform]
+    key_renderer = render_neutral_key if platform == NEUTRAL else render_key
+    # Split the shortcut sequence by " ", then render each shortcut combo
+    return format_html_join(
+        " ",
+        "{}",
+        [
+            (render_combo(combo, modifier_labels, key_renderer),)
+            for combo in keyshortcut.split()
+        ],
+    )
+
+
+def detect_platform(request):
+    """
+    Detect the client platform from the Sec-CH-UA-Platform client hint,
+    searching the User-Agent header only when the hint is missing.
+    """
+    hint = request.headers.get("Sec-CH-UA-Platform")
+    if hint:
+        is_apple = hint.strip('"') in APPLE_PLATFORM_HINTS
+    else:
+        user_agent = request.headers.get("User-Agent", "")
+        is_apple = APPLE_USER_AGENT_RE.search(user_agent) is not None
+    return MAC if is_apple else OTHER
+
+
+def get_request_platform(request):
+    """
+    Return the platform to render key labels for.
+
+    The platform is NEUTRAL when ADMIN_KEYSHORTCUTS_PLATFORM_NEUTRAL is
+    enabled, so that the rendered pages don't vary by client. Otherwise, it
+    is detected from the request headers. The result is stored on the
+    request so this runs once per request.
+    """
+    try:
+        return request._keyshortcuts_platform
+    except AttributeError:
+        pass
+    if get_setting("PLATFORM_NEUTRAL"):
+        platform = NEUTRAL
+    else:
+        platform = detect_platform(request)
+    request._keyshortcuts_platform = platform
+    return platform
@@ -0,0 +1,205 @@
+"""
+Keypress-to-action latency histograms.
+
+shortcuts.js samples the time from a keydown event to the hotkey-fire event
+of the shortcut it triggers, and sends the samples in batches to the
+latency collector view. The samples are counted in a fixed set of buckets
+per view type and hotkey, in the ADMIN_KEYSHORTCUTS_LATENCY_CACHE cache.
+
+Only the whole keydown to hotkey-fire span is measured. The steps of the
+dispatch in between, such as the trie lookup, are measured by the Node
+benchmark in benchmarks/js.
+"""
+
+import hashlib
+
+from django.core.cache import caches
+
+from django_admin_keyshortcuts import registry
+from django_admin_keyshortcuts.bindings import PLATFORM_MODS
+from django_admin_keyshortcuts.bindings import SEQUENCE_DELIMITER
+from django_admin_keyshortcuts.bindings import get_sequences
+from django_admin_keyshortcuts.conf import get_setting
+
+# Upper bounds of the histogram buckets, in milliseconds. The last bucket
+# counts all slower samples.
+LATENCY_BUCKETS = [4, 8, 16, 32, 50, 100, 200, 500, None]
+# Limits on what a client can add to the histograms.
+MAX_SAMPLES_PER_BATCH = 100
+MAX_HOTKEY_LENGTH = 50
+MAX_DURATION = 60_000
+MAX_HISTOGRAMS = 500
+
+CACHE_KEY_PREFIX = "admin_keyshortcuts.latency"
+# Number of histogram slots handed out. Slot n holds the (view type, hotkey,
+# shortcut group, shortcut name) of the nth histogram, so the histograms can
+# be listed without a shared index that concurrent batches would rewrite.
+SLOT_COUNT_KEY = f"{CACHE_KEY_PREFIX}.slots"
+# Value of the histogram key of a hotkey that didn't get a slot.
+DROPPED = -1
+
+
+def get_latency_cache():
+    return caches[get_setting("LATENCY_CACHE")]
+
+
+def get_bucket(duration):
+    for index, bound in enumerate(LATENCY_BUCKETS[:-1]):
+        if duration <= bound:
+            return index
+    return len(LATENCY_BUCKETS) - 1
+
+
+def get_histogram_key(view_type, hotkey):
+    digest = hashlib.md5(
+        f"{view_type}\0{hotkey}".encode(), usedforsecurity=False
+    ).hexdigest()
+    return f"{CACHE_KEY_PREFIX}.{digest}"
+
+
+def get_slot_key(slot):
+    return f"{CACHE_KEY_PREFIX}.slot.{slot}"
+
+
+def increment(cache, key, delta):
+    """
+    Add delta to the counter at key, creating it if needed, and return the
+    new value. incr() raises ValueError if the counter was evicted after
+    add() found it, in which case it is added again.
+    """
+    if cache.add(key, delta, timeout=None):
+        return delta
+    try:
+        return cache.incr(key, delta)
+    except ValueError:
+        if cache.add(key, delta, timeout=None):
+            return delta
+        return cache.incr(key, delta)
+
+
+def resolve_hotkey(shortcuts, view_type, hotkey):
+    """
+    Return the (hotkey, group, name) of the shortcut of the view type fired
+    by a key sequence recorded by shortcuts.js, in which Mod is replaced by
+    Control or Meta. The hotkey is the one of the shortcut table, so the
+    samples of all platforms are counted together. The group and name are
+    None for a sequence that isn't bound in the table.
+    """
+    sequence = tuple(hotkey.split(SEQUENCE_DELIMITER))
+    for group in (view_type, "global"):
+        for name, (_description, bound) in shortcuts.get(group, {}).items():
+            if any(sequence in get_sequences(bound, p) for p in PLATFORM_MODS):
+                return bound, group, name
+    return hotkey, None, None
+
+
+def register_histogram(cache, view_type, hotkey, group, name):
+    """
+    Give the histogram of the hotkey a slot, and return whether its samples
+    are counted. They aren't once MAX_HISTOGRAMS slots are taken.
+
+    The histogram key holds its slot, 0 while the slot is being taken, or
+    DROPPED. Only the batch adding the key takes a slot, so a histogram gets
+    at most one.
+    """
+    key = get_histogram_key(view_type, hotkey)
+    if not cache.add(key, 0, timeout=None):
+        return cache.get(key) != DROPPED
+    slot = increment(cache, SLOT_COUNT_KEY, 1)
+    if slot > MAX_HISTOGRAMS:
+        cache.set(key, DROPPED, timeout=None)
+        return False
+    cache.set(get_slot_key(slot), (view_type, hotkey, group, name), timeout=None)
+    cache.set(key, slot, timeout=None)
+    return True
+
+
+def record_samples(view_type, samples, shortcuts):
+    """
+    Count the (hotkey, duration in milliseconds) samples in the histograms
+    of the view type. The hotkeys are looked up in the shortcut table the
+    samples were recorded with.
+
+    Bucket counters are incremented atomically, so concurrent batches don't
+    lose samples. Samples of new hotkeys are dropped once MAX_HISTOGRAMS
+    histograms exist.
+    """
+    cache = get_latency_cache()
+    resolved = {
+        hotkey: resolve_hotkey(shortcuts, view_type, hotkey) for hotkey, _ in samples
+    }
+    histogram_keys = {
+        hotkey: get_histogram_key(view_type, resolved_hotkey)
+        for hotkey, (resolved_hotkey, _, _) in resolved.items()
+    }
+    slots = cache.get_many(list(histogram_keys.values()))
+    counted = set()
+    for hotkey, key in histogram_keys.items():
+        if key in slots:
+            registered = slots[key] != DROPPED
+        else:
+            registered = register_histogram(cache, view_type, *resolved[hotkey])
+            # Other recorded hotkeys of the batch may resolve to the same key.
+            slots[key] = 0 if registered else DROPPED
+        if registered:
+            counted.add(hotkey)
+    counts = {}
+    for hotkey, duration in samples:
+        if hotkey in counted:
+            key = f"{histogram_keys[hotkey]}.{get_bucket(duration)}"
+            counts[key] = counts.get(key, 0) + 1
+    for key, count in counts.items():
+        increment(cache, key, count)
+
+
+def get_percentile(counts, total, percentile):
+    """Return the upper bound of the bucket holding the percentile."""
+    seen = 0
+    for bound, count in zip(LATENCY_BUCKETS, counts):
+        seen += count
+        if seen >= total * percentile:
+            return bound
+    return None
+
+
+def get_histograms():
+    """
+    Return the latency histograms sorted by view type and hotkey, as dicts
+    with the shortcut description, bucket counts and percentiles.
+    """
+    cache = get_latency_cache()
+    slot_count = min(cache.get(SLOT_COUNT_KEY, 0), MAX_HISTOGRAMS)
+    index = {
+        get_histogram_key(view_type, hotkey): (view_type, hotkey, group, name)
+        for view_type, hotkey, group, name in cache.get_many(
+            [get_slot_key(slot) for slot in range(1, slot_count + 1)]
+        ).values()
+    }
+    keys = [
+        f"{histogram_key}.{bucket}"
+        for histogram_key in index
+        for bucket in range(len(LATENCY_BUCKETS))
+    ]
+    values = cache.get_many(keys)
+    histograms = []
+    for histogram_key, (view_type, hotkey, group, name) in index.items():
+        counts = [
+            values.get(f"{histogram_key}.{bucket}", 0)
+            for bucket in range(len(LATENCY_BUCKETS))
+        ]
+        total = sum(counts)
+        if not total:
+            continue
+        description, _hotkey = registry.SHORTCUTS.get(group, {}).get(name, ("", None))
+        histograms.append(
+            {
+                "view_type": view_type,
+                "hotkey": hotkey,
+                "description": str(description),
+                "counts": counts,
+                "total": total,
+                "p50": get_percentile(counts, total, 0.5),
+                "p95": get_percentile(counts, total, 0.95),
+            }
+        )
+    return sorted(histograms, key=lambda h: (h["view_type"], h["hotkey"]))
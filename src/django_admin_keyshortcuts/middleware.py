@@ -0,0 +1,136 @@
+from urllib.parse import urlsplit
+
+from django.contrib import messages
+from django.forms.forms import NON_FIELD_ERRORS
+from django.http import JsonResponse
+from django.http.response import HttpResponseRedirectBase
+from django.utils.translation import ngettext
+
+from django_admin_keyshortcuts.signals import shortcut_timings
+from django_admin_keyshortcuts.timing import collect_timings
+
+# Header of the change form requests sent by the async save shortcuts.
+ASYNC_SAVE_HEADER = "X-Admin-Keyshortcuts-Save"
+
+
+def format_server_timing(timings):
+    return ", ".join(
+        f'keyshortcuts-{name};dur={total * 1000:.3f};desc="{name} x{count}"'
+        for name, (count, total) in timings.items()
+    )
+
+
+class ServerTimingMiddleware:
+    """
+    Report the call counts and time spent in the shortcut template tags and
+    help dialog in a Server-Timing response header, and send them with the
+    shortcut_timings signal.
+
+    The dialog time includes the shortcut_format_kbd calls it makes.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with collect_timings() as timings:
+            response = self.get_response(request)
+        if timings:
+            shortcut_timings.send(
+                sender=self.__class__, request=request, timings=timings
+            )
+            server_timing = format_server_timing(timings)
+            if "Server-Timing" in response.headers:
+                server_timing = f"{response.headers['Server-Timing']}, {server_timing}"
+            response.headers["Server-Timing"] = server_timing
+        return response
+
+
+class AsyncSaveResponse(JsonResponse):
+    """
+    JSON response to an async save request. It can replace a template
+    response before it's rendered.
+    """
+
+    is_rendered = True
+
+    def render(self):
+        return self
+
+
+def get_form_errors(context):
+    """
+    Return the errors of the admin form and inline formsets in a change form
+    template context, keyed by the name of the field inputs.
+    """
+    errors = {}
+    non_field_errors = []
+    forms = [context["adminform"].form]
+    for inline_admin_formset in context.get("inline_admin_formsets", []):
+        non_field_errors.extend(inline_admin_formset.formset.non_form_errors())
+        forms.extend(inline_admin_formset.formset.forms)
+    for form in forms:
+        for field, field_errors in form.errors.items():
+            if field == NON_FIELD_ERRORS:
+                non_field_errors.extend(field_errors)
+            else:
+                errors[form.add_prefix(field)] = list(field_errors)
+    return errors, non_field_errors
+
+
+class AsyncSaveMiddleware:
+    """
+    Answer the change form submissions of the async save shortcuts with JSON
+    instead of a redirect or the re-rendered change form.
+
+    A successful save returns the redirect URL. When it's the change form
+    itself ("Save and continue editing"), the form stays on the page and the
+    messages are returned with it. Validation errors are returned without
+    rendering the change form. A change form rendered without errors is
+    replaced by a fallback result, for the form to be submitted normally.
+    Any other response, such as an error page, is returned unchanged.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if not self.is_async_save(request) or isinstance(response, AsyncSaveResponse):
+            return response
+        if isinstance(response, HttpResponseRedirectBase):
+            stay = urlsplit(response.url).path == request.path
+            result = {"saved": True, "redirect": response.url, "stay": stay}
+            if stay:
+                result["messages"] = [
+                    {"tags": message.tags, "message": str(message)}
+                    for message in messages.get_messages(request)
+                ]
+            return AsyncSaveResponse(result)
+        return response
+
+    def process_template_response(self, request, response):
+        context = response.context_data
+        if not (self.is_async_save(request) and context and "adminform" in context):
+            return response
+        errors, non_field_errors = get_form_errors(context)
+        count = sum(len(field_errors) for field_errors in errors.values())
+        count += len(non_field_errors)
+        if not count:
+            return AsyncSaveResponse({"fallback": True})
+        return AsyncSaveResponse(
+            {
+                "saved": False,
+                "message": ngettext(
+                    "Please correct the error below.",
+                    "Please correct the errors below.",
+                    count,
+                ),
+                "errors": errors,
+                "non_field_errors": non_field_errors,
+            }
+        )
+
+    @staticmethod
+    def is_async_save(request):
+        return request.method == "POST" and ASYNC_SAVE_HEADER in request.headers
@@ -0,0 +1,29 @@
+from django.conf import settings
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+class ShortcutPreference(models.Model):
+    """
+    Keyboard shortcut preferences of a user, used with
+    ADMIN_KEYSHORTCUTS_PREFERENCES.
+
+    bindings overrides the hotkeys of the ADMIN_KEYSHORTCUTS setting, in the
+    same {group: {name: hotkey or None}} format.
+    """
+
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        models.CASCADE,
+        related_name="shortcut_preference",
+        verbose_name=_("user"),
+    )
+    enabled = models.BooleanField(_("enabled"), default=True)
+    bindings = models.JSONField(_("bindings"), default=dict, blank=True)
+
+    class Meta:
+        verbose_name = _("shortcut preference")
+        verbose_name_plural = _("shortcut preferences")
+
+    def __str__(self):
+        return str(self.user)
@@ -0,0 +1,87 @@
+"""
+Index of the command palette, listing the app index, changelist and add
+views of an admin site that the user can access.
+
+The index only depends on the admin site, the language and the user's
+permissions, so it is computed once per permission set and cached in the
+ADMIN_KEYSHORTCUTS_CACHE cache. Its version is rendered into the admin
+pages, so browsers can keep their copy until the version changes.
+"""
+
+import hashlib
+
+from django.contrib.admin import sites
+from django.utils.translation import get_language
+from django.utils.translation import gettext
+
+from django_admin_keyshortcuts import __version__
+from django_admin_keyshortcuts.dialog import get_dialog_cache
+
+
+def get_admin_site(name):
+    """Return the admin site with the given name, or None."""
+    for site in sites.all_sites:
+        if site.name == name:
+            return site
+    return None
+
+
+def get_permissions_key(user):
+    if user.is_superuser:
+        return "superuser"
+    # Permissions are cached on the user by the backends, so this doesn't
+    # query the database on pages rendering the nav sidebar or app list.
+    return "\0".join(sorted(user.get_all_permissions()))
+
+
+def get_palette_version(request, site):
+    """
+    Return the version of the palette index of the site for the request's
+    user and the active language.
+    """
+    models = sorted(model._meta.label for model in site._registry)
+    key = "\0".join(
+        [
+            __version__,
+            site.name,
+            get_language(),
+            *models,
+            get_permissions_key(request.user),
+        ]
+    )
+    return hashlib.md5(key.encode(), usedforsecurity=False).hexdigest()
+
+
+def build_palette_entries(request, site):
+    """
+    Return the palette entries for the apps and models of the site's app
+    list, as {"label": ..., "url": ...} dicts.
+    """
+    entries = []
+    for app in site.get_app_list(request):
+        entries.append({"label": str(app["name"]), "url": app["app_url"]})
+        for model in app["models"]:
+            label = f"{app['name']} › {model['name']}"
+            if model["admin_url"]:
+                entries.append({"label": label, "url": model["admin_url"]})
+            if model["add_url"]:
+                entries.append(
+                    {
+                        "label": gettext("%(label)s › Add") % {"label": label},
+                        "url": model["add_url"],
+                    }
+                )
+    return entries
+
+
+def get_palette_entries(request, site, version):
+    """Return the palette entries, cached by version."""
+    cache = get_dialog_cache()
+    if cache is None:
+        return build_palette_entries(request, site)
+    key = f"admin_keyshortcuts.palette.{version}"
+    entries = cache.get(key)
+    if entries is None:
+        entries = build_palette_entries(request, site)
+        cache.set(key, entries)
+    return entries
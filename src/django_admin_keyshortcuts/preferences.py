@@ -0,0 +1,77 @@
+"""
+Per-user shortcut preferences, used with ADMIN_KEYSHORTCUTS_PREFERENCES.
+
+The preferences of a user are loaded with a single query on the first admin
+page of a session and kept in the session, so the following pages are
+rendered with the user's bindings without querying the database. Changes
+made through the preferences views update the session. Changes made
+elsewhere, e.g. in the database, apply from the user's next session.
+"""
+
+import hashlib
+import json
+
+from django_admin_keyshortcuts.conf import get_setting
+from django_admin_keyshortcuts.models import ShortcutPreference
+
+SESSION_KEY = "_admin_keyshortcuts_preferences"
+
+DEFAULT_PREFERENCES = {"enabled": True, "bindings": {}}
+
+
+def load_preferences(user):
+    """Return the stored preferences of the user, or the defaults."""
+    preferences = (
+        ShortcutPreference.objects.filter(user=user)
+        .values("enabled", "bindings")
+        .first()
+    )
+    return preferences or dict(DEFAULT_PREFERENCES)
+
+
+def get_preferences(request):
+    """
+    Return the preferences of the request's user, as {"enabled": ...,
+    "bindings": ...}, or None if preferences are disabled or the user isn't
+    logged in.
+    """
+    if request is None or not get_setting("PREFERENCES"):
+        return None
+    try:
+        return request._keyshortcuts_preferences
+    except AttributeError:
+        pass
+    preferences = None
+    user = getattr(request, "user", None)
+    if user is not None and user.is_authenticated:
+        session = getattr(request, "session", None)
+        if session is not None:
+            preferences = session.get(SESSION_KEY)
+        if preferences is None:
+            preferences = load_preferences(user)
+            if session is not None:
+                session[SESSION_KEY] = preferences
+    request._keyshortcuts_preferences = preferences
+    return preferences
+
+
+def save_preferences(request, **changes):
+    """Store changes to the preferences of the request's user."""
+    preference, _ = ShortcutPreference.objects.update_or_create(
+        user=request.user, defaults=changes
+    )
+    preferences = {"enabled": preference.enabled, "bindings": preference.bindings}
+    request.session[SESSION_KEY] = preferences
+    request._keyshortcuts_preferences = preferences
+    return preferences
+
+
+def get_bindings_key(preferences):
+    """
+    Return a key identifying the user's bindings, for caching what is
+    rendered with them, or "" for the default bindings.
+    """
+    if not preferences or not preferences["bindings"]:
+        return ""
+    bindings = json.dumps(preferences["bindings"], sort_keys=True)
+    return hashlib.md5(bindings.encode(), usedforsecurity=False).hexdigest()
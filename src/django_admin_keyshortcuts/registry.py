@@ -0,0 +1,142 @@
+import json
+from functools import lru_cache
+from types import MappingProxyType
+
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.autoreload import file_changed
+from django.utils.translation import get_language
+from django.utils.translation import gettext_lazy as _
+
+from django_admin_keyshortcuts.bindings import get_bindings
+from django_admin_keyshortcuts.conf import get_setting
+
+# Shortcut definitions grouped by the admin view they apply to.
+# Each entry maps a shortcut name to a (description, hotkey string) pair.
+# The hotkeys are defaults, overridden by the ADMIN_KEYSHORTCUTS setting.
+SHORTCUTS = {
+    "global": {
+        "show_dialog": (_("Show this dialog"), "Shift+?"),
+        "go_to_index": (_("Go to the site index"), "g i"),
+        "open_palette": (_("Go to an app or model"), "Mod+k"),
+    },
+    "changelist": {
+        "focus_prev_row": (_("Focus previous row"), "k"),
+        "focus_next_row": (_("Focus next row"), "j"),
+        "toggle_row_selection": (_("Toggle row selection"), "x"),
+        "extend_selection_down": (_("Extend selection down"), "Shift+J"),
+        "extend_selection_up": (_("Extend selection up"), "Shift+K"),
+        "toggle_all_rows": (_("Select or deselect all rows"), "Shift+A"),
+        "invert_selection": (_("Invert selection"), "Shift+X"),
+        "focus_actions_dropdown": (_("Focus actions dropdown"), "a"),
+        "focus_search": (_("Focus search field"), "/"),
+        "next_page": (_("Go to next page"), "n"),
+        "previous_page": (_("Go to previous page"), "p"),
+        "first_page": (_("Go to first page"), "Shift+P"),
+        "last_page": (_("Go to last page"), "Shift+N"),
+        "toggle_sidebar": (_("Toggle sidebar"), "["),
+    },
+    "changeform": {
+        "save": (_("Save"), "Mod+s"),
+        "save_and_add_another": (_("Save and add another"), "Mod+Shift+S"),
+        "save_and_continue": (_("Save and continue editing"), "Mod+Alt+s"),
+        "delete": (_("Delete"), "Alt+d"),
+        "next_inline_row": (_("Go to next inline row"), "Alt+j"),
+        "previous_inline_row": (_("Go to previous inline row"), "Alt+k"),
+        "next_inline_group": (_("Go to next inline group"), "Alt+Shift+J"),
+        "previous_inline_group": (_("Go to previous inline group"), "Alt+Shift+K"),
+        "add_inline_row": (_("Add another inline row"), "Alt+a"),
+        "go_to_field": (_("Go to a field by label"), "Alt+f"),
+        "toggle_sidebar": (_("Toggle sidebar"), "["),
+    },
+    "delete_confirmation": {
+        "confirm_delete": (_("Confirm deletion"), "Alt+y"),
+        "cancel_delete": (_("Cancel deletion"), "Alt+n"),
+        "toggle_sidebar": (_("Toggle sidebar"), "["),
+    },
+}
+
+# Shortcuts of optional features, left out unless the ADMIN_KEYSHORTCUTS_<name>
+# setting enabling the feature is set.
+FEATURE_SHORTCUTS = {
+    ("global", "open_palette"): "PALETTE",
+}
+
+# Settings that affect the translated descriptions.
+TRANSLATION_SETTINGS = {"INSTALLED_APPS", "LANGUAGE_CODE", "LANGUAGES", "LOCALE_PATHS"}
+
+# Built shortcut tables without per-user overrides, keyed by language code.
+_registry = {}
+
+# Shortcut table of users who turned the shortcuts off.
+NO_SHORTCUTS = MappingProxyType({group: MappingProxyType({}) for group in SHORTCUTS})
+
+
+def build_shortcuts(user_overrides=None):
+    """
+    Build the shortcut table with descriptions translated into the active
+    language and the compiled hotkey bindings, with the per-user overrides
+    applied. Disabled shortcuts and those of disabled features are left out.
+    The table is read-only as it is shared between requests.
+    """
+    bindings = get_bindings(user_overrides)
+    disabled = {
+        shortcut
+        for shortcut, setting in FEATURE_SHORTCUTS.items()
+        if not get_setting(setting)
+    }
+    return MappingProxyType(
+        {
+            group: MappingProxyType(
+                {
+                    name: (str(description), bindings[group][name])
+                    for name, (description, _hotkey) in shortcuts.items()
+                    if name in bindings[group] and (group, name) not in disabled
+                }
+            )
+            for group, shortcuts in SHORTCUTS.items()
+        }
+    )
+
+
+def get_shortcuts(user_overrides=None):
+    """
+    Return the shortcut table for the active language and the per-user
+    overrides, building it on first use.
+    """
+    if user_overrides:
+        return _get_user_shortcuts(
+            get_language(), json.dumps(user_overrides, sort_keys=True)
+        )
+    language = get_language()
+    try:
+        return _registry[language]
+    except KeyError:
+        shortcuts = _registry[language] = build_shortcuts()
+        return shortcuts
+
+
+# Tables with per-user overrides are kept in a bounded cache, as there can
+# be one per user and language. The language is only part of the cache key,
+# the table is built in the active language.
+@lru_cache(maxsize=128)
+def _get_user_shortcuts(language, key):
+    return build_shortcuts(json.loads(key))
+
+
+def clear_registry():
+    """Discard all built shortcut tables."""
+    _registry.clear()
+    _get_user_shortcuts.cache_clear()
+
+
+@receiver(setting_changed)
+def reset_registry(*, setting, **kwargs):
+    if setting in TRANSLATION_SETTINGS or setting.startswith("ADMIN_KEYSHORTCUTS"):
+        clear_registry()
+
+
+@receiver(file_changed)
+def translation_file_changed(sender, file_path, **kwargs):
+    if file_path.suffix == ".mo":
+        clear_registry()
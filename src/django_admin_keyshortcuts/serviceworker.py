@@ -0,0 +1,46 @@
+"""
+Precache list of the optional service worker caching the shortcut assets.
+
+The static files are resolved with the staticfiles storage, so with
+ManifestStaticFilesStorage the list has the hashed names recorded in the
+collectstatic manifest. The cache name is derived from the list, so a deploy
+changing any of the files changes the service worker script, and browsers
+install it and drop the previous cache.
+"""
+
+import hashlib
+
+from django.templatetags.static import static
+
+from django_admin_keyshortcuts import __version__
+from django_admin_keyshortcuts.conf import get_setting
+
+CACHE_PREFIX = "admin-keyshortcuts-"
+
+
+def get_precache_files():
+    """Return the static files loaded by the admin pages with the settings."""
+    files = ["admin/css/shortcuts.css"]
+    if get_setting("BUNDLE"):
+        files.append("admin/js/shortcuts.bundle.js")
+    else:
+        files += [
+            "admin/js/vendor/hotkey/hotkey.js",
+            "admin/js/shortcuts.js",
+            "admin/js/shortcuts_changelist.js",
+            "admin/js/shortcuts_changeform.js",
+        ]
+        if get_setting("PALETTE"):
+            files.append("admin/js/shortcuts_palette.js")
+    return files
+
+
+def get_precache_urls():
+    """Return the URLs of the static files precached by the service worker."""
+    return [static(path) for path in get_precache_files()]
+
+
+def get_cache_name(urls):
+    """Return the name of the browser cache storing the given URLs."""
+    key = "\0".join([__version__, *urls])
+    return CACHE_PREFIX + hashlib.md5(key.encode(), usedforsecurity=False).hexdigest()
@@ -0,0 +1,6 @@
+from django.dispatch import Signal
+
+# Sent by ServerTimingMiddleware after each request that used the shortcut
+# template tags, with the request and its timings as
+# {name: (call count, seconds)}.
+shortcut_timings = Signal()
@@ -0,0 +1,1666 @@
+class Leaf {
+constructor(trie) {
+this.children = new Set();
+this.parent = trie;
+}
+delete(value) {
+if (!this.children.delete(value))
+return false;
+if (this.children.size === 0) {
+this.parent.delete(this);
+}
+return true;
+}
+add(value) {
+this.children.delete(value);
+this.children.add(value);
+return this;
+}
+}
+class RadixTrie {
+constructor(trie) {
+this.parent = null;
+this.children = new Map();
+this.edgeMasks = new Map();
+this.parent = trie || null;
+}
+get(edge) {
+return this.children.get(edge);
+}
+hasEdge(keyName, mask) {
+const masks = this.edgeMasks.get(keyName);
+return masks !== undefined && (masks & (1 << mask)) !== 0;
+}
+set(edge, node) {
+node.edge = edge;
+node.parsedEdge = parseEdge(edge);
+this.children.set(edge, node);
+if (node.parsedEdge) {
+const [keyName, mask] = node.parsedEdge;
+this.edgeMasks.set(keyName, (this.edgeMasks.get(keyName) || 0) | (1 << mask));
+}
+return node;
+}
+insert(edges) {
+let currentNode = this;
+for (let i = 0; i < edges.length; i += 1) {
+const edge = edges[i];
+let nextNode = currentNode.get(edge);
+if (i === edges.length - 1) {
+if (nextNode instanceof RadixTrie) {
+currentNode.delete(nextNode);
+nextNode = null;
+}
+if (!nextNode) {
+nextNode = currentNode.set(edge, new Leaf(currentNode));
+}
+return nextNode;
+}
+else {
+if (nextNode instanceof Leaf)
+nextNode = null;
+if (!nextNode) {
+nextNode = currentNode.set(edge, new RadixTrie(currentNode));
+}
+}
+currentNode = nextNode;
+}
+return currentNode;
+}
+delete(node) {
+if (this.children.get(node.edge) !== node)
+return false;
+this.children.delete(node.edge);
+if (node.parsedEdge) {
+const [keyName, mask] = node.parsedEdge;
+const masks = this.edgeMasks.get(keyName) & ~(1 << mask);
+if (masks)
+this.edgeMasks.set(keyName, masks);
+else
+this.edgeMasks.delete(keyName);
+}
+if (this.children.size === 0 && this.parent) {
+this.parent.delete(this);
+}
+return true;
+}
+}
+const macosSymbolLayerKeys = {
+['¡']: '1',
+['™']: '2',
+['£']: '3',
+['¢']: '4',
+['∞']: '5',
+['§']: '6',
+['¶']: '7',
+['•']: '8',
+['ª']: '9',
+['º']: '0',
+['–']: '-',
+['≠']: '=',
+['⁄']: '!',
+['€']: '@',
+['‹']: '#',
+['›']: '$',
+['ﬁ']: '%',
+['ﬂ']: '^',
+['‡']: '&',
+['°']: '*',
+['·']: '(',
+['‚']: ')',
+['—']: '_',
+['±']: '+',
+['œ']: 'q',
+['∑']: 'w',
+['®']: 'r',
+['†']: 't',
+['¥']: 'y',
+['ø']: 'o',
+['π']: 'p',
+['“']: '[',
+['‘']: ']',
+['«']: '\\',
+['Œ']: 'Q',
+['„']: 'W',
+['´']: 'E',
+['‰']: 'R',
+['ˇ']: 'T',
+['Á']: 'Y',
+['¨']: 'U',
+['ˆ']: 'I',
+['Ø']: 'O',
+['∏']: 'P',
+['”']: '{',
+['’']: '}',
+['»']: '|',
+['å']: 'a',
+['ß']: 's',
+['∂']: 'd',
+['ƒ']: 'f',
+['©']: 'g',
+['˙']: 'h',
+['∆']: 'j',
+['˚']: 'k',
+['¬']: 'l',
+['…']: ';',
+['æ']: "'",
+['Å']: 'A',
+['Í']: 'S',
+['Î']: 'D',
+['Ï']: 'F',
+['˝']: 'G',
+['Ó']: 'H',
+['Ô']: 'J',
+['']: 'K',
+['Ò']: 'L',
+['Ú']: ':',
+['Æ']: '"',
+['Ω']: 'z',
+['≈']: 'x',
+['ç']: 'c',
+['√']: 'v',
+['∫']: 'b',
+['µ']: 'm',
+['≤']: ',',
+['≥']: '.',
+['÷']: '/',
+['¸']: 'Z',
+['˛']: 'X',
+['Ç']: 'C',
+['◊']: 'V',
+['ı']: 'B',
+['˜']: 'N',
+['Â']: 'M',
+['¯']: '<',
+['˘']: '>',
+['¿']: '?'
+};
+const macosUppercaseLayerKeys = {
+['`']: '~',
+['1']: '!',
+['2']: '@',
+['3']: '#',
+['4']: '$',
+['5']: '%',
+['6']: '^',
+['7']: '&',
+['8']: '*',
+['9']: '(',
+['0']: ')',
+['-']: '_',
+['=']: '+',
+['[']: '{',
+[']']: '}',
+['\\']: '|',
+[';']: ':',
+["'"]: '"',
+[',']: '<',
+['.']: '>',
+['/']: '?',
+['q']: 'Q',
+['w']: 'W',
+['e']: 'E',
+['r']: 'R',
+['t']: 'T',
+['y']: 'Y',
+['u']: 'U',
+['i']: 'I',
+['o']: 'O',
+['p']: 'P',
+['a']: 'A',
+['s']: 'S',
+['d']: 'D',
+['f']: 'F',
+['g']: 'G',
+['h']: 'H',
+['j']: 'J',
+['k']: 'K',
+['l']: 'L',
+['z']: 'Z',
+['x']: 'X',
+['c']: 'C',
+['v']: 'V',
+['b']: 'B',
+['n']: 'N',
+['m']: 'M'
+};
+const syntheticKeyNames = {
+' ': 'Space',
+'+': 'Plus'
+};
+const modifierKeyNames = ['Control', 'Alt', 'Meta', 'Shift'];
+const ALT_MASK = 2;
+const SHIFT_MASK = 8;
+function eventModifierMask(event) {
+return (event.ctrlKey ? 1 : 0) | (event.altKey ? 2 : 0) | (event.metaKey ? 4 : 0) | (event.shiftKey ? 8 : 0);
+}
+function eventKeyName(event, mask, platform) {
+var _a, _b, _c;
+const key = event.key;
+if (modifierKeyNames.includes(key))
+return '';
+const applePlatform = (mask & (ALT_MASK | SHIFT_MASK)) !== 0 && matchApplePlatform.test(platform);
+const altNormalizedKey = mask & ALT_MASK && applePlatform ? (_a = macosSymbolLayerKeys[key]) !== null && _a !== void 0 ? _a : key : key;
+const shiftNormalizedKey = mask & SHIFT_MASK && applePlatform
+? (_b = macosUppercaseLayerKeys[altNormalizedKey]) !== null && _b !== void 0 ? _b : altNormalizedKey
+: altNormalizedKey;
+return (_c = syntheticKeyNames[shiftNormalizedKey]) !== null && _c !== void 0 ? _c : shiftNormalizedKey;
+}
+function buildHotkeyString(keyName, mask) {
+let hotkey = '';
+for (let i = 0; i < modifierKeyNames.length; i++) {
+if (mask & (1 << i))
+hotkey += hotkey ? `+${modifierKeyNames[i]}` : modifierKeyNames[i];
+}
+if (keyName)
+hotkey += hotkey ? `+${keyName}` : keyName;
+return hotkey;
+}
+function eventToHotkeyString(event, platform = navigator.platform) {
+const mask = eventModifierMask(event);
+return buildHotkeyString(eventKeyName(event, mask, platform), mask);
+}
+function parseEdge(edge) {
+if (!edge.includes('+')) {
+const bit = modifierKeyNames.indexOf(edge);
+return bit === -1 ? [edge, 0] : ['', 1 << bit];
+}
+const parts = edge.split('+');
+let keyName = '';
+let mask = 0;
+for (let i = 0; i < parts.length; i++) {
+const bit = modifierKeyNames.indexOf(parts[i]);
+if (bit !== -1)
+mask |= 1 << bit;
+else if (i === parts.length - 1)
+keyName = parts[i];
+else
+return null;
+}
+return buildHotkeyString(keyName, mask) === edge ? [keyName, mask] : null;
+}
+function normalizeHotkey(hotkey, platform) {
+let result;
+result = localizeMod(hotkey, platform);
+result = sortModifiers(result);
+return result;
+}
+const matchApplePlatform = /Mac|iPod|iPhone|iPad/i;
+function localizeMod(hotkey, platform) {
+var _a;
+const ssrSafeWindow = typeof window === 'undefined' ? undefined : window;
+const safePlatform = (_a = platform !== null && platform !== void 0 ? platform : ssrSafeWindow === null || ssrSafeWindow === void 0 ? void 0 : ssrSafeWindow.navigator.platform) !== null && _a !== void 0 ? _a : '';
+const localModifier = matchApplePlatform.test(safePlatform) ? 'Meta' : 'Control';
+return hotkey.replace('Mod', localModifier);
+}
+function sortModifiers(hotkey) {
+const key = hotkey.split('+').pop();
+const modifiers = [];
+for (const modifier of ['Control', 'Alt', 'Meta', 'Shift']) {
+if (hotkey.includes(modifier)) {
+modifiers.push(modifier);
+}
+}
+if (key)
+modifiers.push(key);
+return modifiers.join('+');
+}
+const SEQUENCE_DELIMITER = ' ';
+class SequenceTracker {
+constructor({ onReset } = {}) {
+this._path = [];
+this.timer = null;
+this.deadline = 0;
+this.onReset = onReset;
+}
+get path() {
+return this._path;
+}
+get sequence() {
+return this._path.join(SEQUENCE_DELIMITER);
+}
+registerKeypress(event, hotkey = eventToHotkeyString(event)) {
+this._path.push(hotkey);
+this.startTimer();
+}
+reset() {
+var _a;
+this._path.length = 0;
+this.deadline = 0;
+if (this.timer != null) {
+window.clearTimeout(this.timer);
+this.timer = null;
+}
+(_a = this.onReset) === null || _a === void 0 ? void 0 : _a.call(this);
+}
+startTimer() {
+this.deadline = performance.now() + SequenceTracker.CHORD_TIMEOUT;
+if (this.timer == null)
+this.armTimer(SequenceTracker.CHORD_TIMEOUT);
+}
+armTimer(delay) {
+this.timer = window.setTimeout(() => {
+this.timer = null;
+const remaining = this.deadline - performance.now();
+if (remaining > 0)
+this.armTimer(remaining);
+else
+this.reset();
+}, delay);
+}
+}
+SequenceTracker.CHORD_TIMEOUT = 1500;
+function normalizeSequence(sequence) {
+return sequence
+.split(SEQUENCE_DELIMITER)
+.map(h => normalizeHotkey(h))
+.join(SEQUENCE_DELIMITER);
+}
+function isFormField(element) {
+if (!(element instanceof HTMLElement)) {
+return false;
+}
+const name = element.nodeName.toLowerCase();
+const type = (element.getAttribute('type') || '').toLowerCase();
+return (name === 'select' ||
+name === 'textarea' ||
+(name === 'input' &&
+type !== 'submit' &&
+type !== 'reset' &&
+type !== 'checkbox' &&
+type !== 'radio' &&
+type !== 'file') ||
+element.isContentEditable);
+}
+function fireDeterminedAction(el, path) {
+const delegateEvent = new CustomEvent('hotkey-fire', { cancelable: true, detail: { path } });
+const cancelled = !el.dispatchEvent(delegateEvent);
+if (cancelled)
+return;
+if (isFormField(el)) {
+el.focus();
+}
+else {
+el.click();
+}
+}
+function expandHotkeyToEdges(hotkey) {
+const output = [];
+let acc = [''];
+let commaIsSeparator = false;
+for (let i = 0; i < hotkey.length; i++) {
+if (commaIsSeparator && hotkey[i] === ',') {
+output.push(acc);
+acc = [''];
+commaIsSeparator = false;
+continue;
+}
+if (hotkey[i] === SEQUENCE_DELIMITER) {
+acc.push('');
+commaIsSeparator = false;
+continue;
+}
+else if (hotkey[i] === '+') {
+commaIsSeparator = false;
+}
+else {
+commaIsSeparator = true;
+}
+acc[acc.length - 1] += hotkey[i];
+}
+output.push(acc);
+return output.map(h => h.map(k => normalizeHotkey(k)).filter(k => k !== '')).filter(h => h.length > 0);
+}
+const hotkeyRadixTrie = new RadixTrie();
+const elementsLeaves = new WeakMap();
+const elementsScopes = new WeakMap();
+const scopedElements = new Map();
+let currentTriePosition = hotkeyRadixTrie;
+let hotkeysEnabled = true;
+const sequenceTracker = new SequenceTracker({
+onReset() {
+currentTriePosition = hotkeyRadixTrie;
+}
+});
+function keyDownHandler(event) {
+if (!hotkeysEnabled)
+return;
+if (event.defaultPrevented)
+return;
+if (!(event.target instanceof Node))
+return;
+if (isFormField(event.target)) {
+const target = event.target;
+if (!target.id)
+return;
+if (!scopedElements.has(target.id))
+return;
+}
+const mask = eventModifierMask(event);
+const keyName = eventKeyName(event, mask, navigator.platform);
+if (!currentTriePosition.hasEdge(keyName, mask)) {
+if (currentTriePosition !== hotkeyRadixTrie)
+sequenceTracker.reset();
+return;
+}
+const hotkey = buildHotkeyString(keyName, mask);
+const newTriePosition = currentTriePosition.get(hotkey);
+if (!newTriePosition) {
+sequenceTracker.reset();
+return;
+}
+sequenceTracker.registerKeypress(event, hotkey);
+currentTriePosition = newTriePosition;
+if (newTriePosition instanceof Leaf) {
+const target = event.target;
+let shouldFire = false;
+let elementToFire;
+const formField = isFormField(target);
+const elements = Array.from(newTriePosition.children);
+for (let i = elements.length - 1; i >= 0; i -= 1) {
+elementToFire = elements[i];
+const scope = elementToFire.getAttribute('data-hotkey-scope');
+if ((!formField && !scope) || (formField && target.id === scope)) {
+shouldFire = true;
+break;
+}
+}
+if (elementToFire && shouldFire) {
+fireDeterminedAction(elementToFire, sequenceTracker.path.slice());
+event.preventDefault();
+}
+sequenceTracker.reset();
+}
+}
+function unscopeElement(element) {
+const scope = elementsScopes.get(element);
+if (!scope)
+return;
+const elements = scopedElements.get(scope);
+elements.delete(element);
+if (elements.size === 0) {
+scopedElements.delete(scope);
+}
+elementsScopes.delete(element);
+}
+function install(element, hotkey) {
+if (hotkeyRadixTrie.children.size === 0) {
+document.addEventListener('keydown', keyDownHandler);
+}
+const hotkeys = expandHotkeyToEdges(hotkey || element.getAttribute('data-hotkey') || '');
+const leaves = hotkeys.map(h => hotkeyRadixTrie.insert(h).add(element));
+elementsLeaves.set(element, leaves);
+unscopeElement(element);
+const scope = element.getAttribute('data-hotkey-scope');
+if (scope) {
+let elements = scopedElements.get(scope);
+if (!elements) {
+elements = new Set();
+scopedElements.set(scope, elements);
+}
+elements.add(element);
+elementsScopes.set(element, scope);
+}
+}
+function setEnabled(enabled) {
+hotkeysEnabled = enabled;
+if (!enabled) {
+sequenceTracker.reset();
+}
+}
+function isEnabled() {
+return hotkeysEnabled;
+}
+function uninstall(element) {
+const leaves = elementsLeaves.get(element);
+if (leaves && leaves.length) {
+for (const leaf of leaves) {
+leaf && leaf.delete(element);
+}
+}
+unscopeElement(element);
+if (hotkeyRadixTrie.children.size === 0) {
+document.removeEventListener('keydown', keyDownHandler);
+sequenceTracker.reset();
+}
+}
+'use strict';
+{
+let shortcutsEnabled = localStorage.getItem('django.admin.shortcutsEnabled') || 'true';
+function installShortcuts(root) {
+if (root.matches('[data-hotkey]')) {
+install(root);
+}
+for (const el of root.querySelectorAll('[data-hotkey]')) {
+install(el);
+}
+}
+function uninstallShortcuts(root) {
+if (root.matches('[data-hotkey]')) {
+uninstall(root);
+}
+for (const el of root.querySelectorAll('[data-hotkey]')) {
+uninstall(el);
+}
+}
+function handleMutations(mutations) {
+for (const mutation of mutations) {
+if (mutation.type === 'attributes') {
+uninstall(mutation.target);
+if (mutation.target.hasAttribute('data-hotkey')) {
+install(mutation.target);
+}
+continue;
+}
+for (const node of mutation.removedNodes) {
+if (node.nodeType === Node.ELEMENT_NODE) {
+uninstallShortcuts(node);
+}
+}
+for (const node of mutation.addedNodes) {
+if (node.nodeType === Node.ELEMENT_NODE && node.isConnected) {
+installShortcuts(node);
+}
+}
+}
+}
+const macModifierKeyLabels = {Alt: '⌥', Mod: '⌘', Ctrl: '^', Control: '^', Meta: '⌘'};
+const isApplePlatform = /Mac|iPod|iPhone|iPad/i.test(navigator.platform);
+function localizeKeyLabels(root) {
+if (!isApplePlatform) {
+return;
+}
+for (const kbd of root.querySelectorAll('kbd[data-key]')) {
+const label = macModifierKeyLabels[kbd.dataset.key];
+if (label) {
+kbd.textContent = label;
+}
+}
+}
+let preferencesConfig = null;
+function initPreferences() {
+const configElement = document.getElementById('shortcuts-preferences-config');
+if (!configElement) {
+return;
+}
+preferencesConfig = JSON.parse(configElement.textContent);
+shortcutsEnabled = 'true';
+localStorage.setItem('django.admin.shortcutsEnabled', shortcutsEnabled);
+}
+function savePreferences() {
+const data = new FormData();
+data.append('csrfmiddlewaretoken', preferencesConfig.csrfToken);
+data.append('enabled', shortcutsEnabled);
+fetch(preferencesConfig.url, {method: 'POST', body: data, credentials: 'same-origin'})
+.then(function(response) {
+if (!response.ok) {
+throw new Error(`Failed to save shortcut preferences: ${response.status}`);
+}
+})
+.catch(function(error) {
+console.error(error);
+});
+}
+function initShortcuts() {
+initPreferences();
+setEnabled(shortcutsEnabled === 'true');
+installShortcuts(document.documentElement);
+new MutationObserver(handleMutations).observe(document.documentElement, {
+attributeFilter: ['data-hotkey', 'data-hotkey-scope'],
+childList: true,
+subtree: true
+});
+performance.mark('admin-keyshortcuts:ready');
+}
+const latencyBatchSize = 20;
+let latencyConfig = null;
+let latencySamples = [];
+let sampledKeydownTime = null;
+function startLatencyMeasure(event) {
+sampledKeydownTime = Math.random() < latencyConfig.sampleRate ? event.timeStamp : null;
+}
+function endLatencyMeasure(event) {
+if (sampledKeydownTime === null) {
+return;
+}
+const hotkey = event.detail.path.join(' ');
+const end = performance.now();
+performance.measure('admin-keyshortcuts:hotkey', {start: sampledKeydownTime, end: end, detail: {hotkey: hotkey}});
+latencySamples.push({hotkey: hotkey, duration: end - sampledKeydownTime});
+sampledKeydownTime = null;
+if (latencySamples.length >= latencyBatchSize) {
+sendLatencySamples();
+}
+}
+function sendLatencySamples() {
+if (!latencySamples.length) {
+return;
+}
+const data = new FormData();
+data.append('csrfmiddlewaretoken', latencyConfig.csrfToken);
+data.append('view', latencyConfig.view);
+data.append('samples', JSON.stringify(latencySamples));
+navigator.sendBeacon(latencyConfig.url, data);
+latencySamples = [];
+}
+function initLatencyMeasures() {
+const configElement = document.getElementById('shortcuts-latency-config');
+if (!configElement) {
+return;
+}
+latencyConfig = JSON.parse(configElement.textContent);
+window.addEventListener('keydown', startLatencyMeasure, true);
+document.addEventListener('hotkey-fire', endLatencyMeasure, true);
+document.addEventListener('visibilitychange', function() {
+if (document.visibilityState === 'hidden') {
+sendLatencySamples();
+}
+});
+}
+function initServiceWorker() {
+const configElement = document.getElementById('shortcuts-service-worker-config');
+if (!configElement || !('serviceWorker' in navigator)) {
+return;
+}
+const config = JSON.parse(configElement.textContent);
+navigator.serviceWorker.register(config.url, {scope: config.scope})
+.catch(function(error) {
+console.error(error);
+});
+}
+function initShortcutsToggle() {
+const toggleShortcuts = document.getElementById('toggle-shortcuts');
+if (!toggleShortcuts) {
+return;
+}
+toggleShortcuts.checked = shortcutsEnabled === 'true';
+toggleShortcuts.addEventListener('change', function() {
+shortcutsEnabled = toggleShortcuts.checked ? 'true' : 'false';
+setEnabled(toggleShortcuts.checked);
+localStorage.setItem('django.admin.shortcutsEnabled', shortcutsEnabled);
+if (preferencesConfig) {
+savePreferences();
+}
+});
+}
+let dialogLoaded = null;
+function loadShortcutsDialog(dialog) {
+if (!dialogLoaded) {
+dialogLoaded = fetch(dialog.dataset.src, {credentials: 'same-origin'})
+.then(function(response) {
+if (!response.ok) {
+throw new Error(`Failed to load shortcuts dialog: ${response.status}`);
+}
+return response.text();
+})
+.then(function(html) {
+const template = document.createElement('template');
+template.innerHTML = html;
+const loadedDialog = template.content.getElementById('shortcuts-dialog');
+dialog.replaceChildren(...loadedDialog.childNodes);
+delete dialog.dataset.src;
+localizeKeyLabels(dialog);
+initShortcutsToggle();
+})
+.catch(function(error) {
+dialogLoaded = null;
+throw error;
+});
+}
+return dialogLoaded;
+}
+function loadDeletedObjects(event) {
+const details = event.target;
+const src = details.dataset && details.dataset.src;
+if (!details.open || !src) {
+return;
+}
+delete details.dataset.src;
+fetch(src, {credentials: 'same-origin'})
+.then(function(response) {
+if (!response.ok) {
+throw new Error(`Failed to load deleted objects: ${response.status}`);
+}
+return response.text();
+})
+.then(function(html) {
+const list = document.createElement('ul');
+list.innerHTML = html;
+details.append(list);
+})
+.catch(function(error) {
+details.dataset.src = src;
+details.open = false;
+console.error(error);
+});
+}
+function initDeletedObjects() {
+const deletedObjects = document.getElementById('deleted-objects');
+if (!deletedObjects) {
+return;
+}
+deletedObjects.addEventListener('toggle', loadDeletedObjects, true);
+}
+function showShortcutsDialog() {
+const dialog = document.getElementById("shortcuts-dialog");
+if (dialog.dataset.src) {
+loadShortcutsDialog(dialog)
+.then(function() {
+dialog.showModal();
+})
+.catch(function(error) {
+console.error(error);
+});
+} else {
+dialog.showModal();
+}
+}
+function showDialogOnClick() {
+const dialogButton = document.getElementById("open-shortcuts");
+if(!dialogButton) {
+return;
+}
+dialogButton.addEventListener("click", showShortcutsDialog);
+}
+if (document.readyState === "loading") {
+document.addEventListener("DOMContentLoaded", function() {
+localizeKeyLabels(document);
+});
+document.addEventListener("DOMContentLoaded", initShortcuts);
+document.addEventListener("DOMContentLoaded", initLatencyMeasures);
+document.addEventListener("DOMContentLoaded", initShortcutsToggle);
+document.addEventListener("DOMContentLoaded", showDialogOnClick);
+document.addEventListener("DOMContentLoaded", initServiceWorker);
+document.addEventListener("DOMContentLoaded", initDeletedObjects);
+} else {
+localizeKeyLabels(document);
+initShortcuts();
+initLatencyMeasures();
+initShortcutsToggle();
+showDialogOnClick();
+initServiceWorker();
+initDeletedObjects();
+}
+}
+'use strict';
+{
+const checkboxSelector = "#action-toggle, .action-select";
+let checkboxes = [];
+let currentIndex = -1;
+let rangeAnchor = -1;
+const rangeSelected = new Set();
+const trackedCheckboxes = new WeakSet();
+function insertCheckbox(checkbox) {
+if (trackedCheckboxes.has(checkbox)) {
+return;
+}
+let low = 0;
+let high = checkboxes.length;
+while (low < high) {
+const mid = (low + high) >>> 1;
+if (checkboxes[mid].compareDocumentPosition(checkbox) & Node.DOCUMENT_POSITION_FOLLOWING) {
+low = mid + 1;
+} else {
+high = mid;
+}
+}
+checkboxes.splice(low, 0, checkbox);
+trackedCheckboxes.add(checkbox);
+if (low <= currentIndex) {
+currentIndex += 1;
+}
+if (low <= rangeAnchor) {
+rangeAnchor += 1;
+}
+}
+function removeDisconnectedCheckboxes() {
+const currentCheckbox = checkboxes[currentIndex];
+checkboxes = checkboxes.filter(function(checkbox) {
+if (checkbox.isConnected) {
+return true;
+}
+trackedCheckboxes.delete(checkbox);
+return false;
+});
+currentIndex = currentCheckbox && currentCheckbox.isConnected ? checkboxes.indexOf(currentCheckbox) : -1;
+rangeAnchor = -1;
+}
+function handleMutations(mutations) {
+let removed = false;
+for (const mutation of mutations) {
+removed = removed || mutation.removedNodes.length > 0;
+for (const node of mutation.addedNodes) {
+if (node.nodeType !== Node.ELEMENT_NODE) {
+continue;
+}
+if (node.matches(checkboxSelector)) {
+insertCheckbox(node);
+}
+for (const checkbox of node.querySelectorAll(checkboxSelector)) {
+insertCheckbox(checkbox);
+}
+}
+}
+if (removed) {
+removeDisconnectedCheckboxes();
+}
+}
+function setUpShortcuts() {
+checkboxes = Array.from(document.querySelectorAll(checkboxSelector));
+for (const checkbox of checkboxes) {
+trackedCheckboxes.add(checkbox);
+}
+document.addEventListener("keydown", trackShift);
+document.addEventListener("keyup", trackShift);
+const resultList = document.getElementById("result_list");
+if (resultList) {
+new MutationObserver(handleMutations).observe(resultList, {childList: true, subtree: true});
+}
+}
+function focusPreviousCheckbox() {
+if (!checkboxes.length) {
+return;
+}
+rangeAnchor = -1;
+if (currentIndex <= 0) {
+currentIndex = checkboxes.length - 1;
+} else {
+currentIndex -= 1;
+}
+checkboxes[currentIndex].focus();
+}
+let nextPagePrefetched = false;
+function prefetchNextPage() {
+const nextPageLink = document.getElementById("keyshortcut-next-page-link");
+if (nextPagePrefetched || !nextPageLink) {
+return;
+}
+nextPagePrefetched = true;
+if (HTMLScriptElement.supports && HTMLScriptElement.supports("speculationrules")) {
+const rules = document.createElement("script");
+rules.type = "speculationrules";
+rules.textContent = JSON.stringify({prefetch: [{source: "list", urls: [nextPageLink.href]}]});
+document.head.append(rules);
+} else {
+const link = document.createElement("link");
+link.rel = "prefetch";
+link.href = nextPageLink.href;
+document.head.append(link);
+}
+}
+function focusNextCheckbox() {
+if (!checkboxes.length) {
+return;
+}
+rangeAnchor = -1;
+if (currentIndex === -1 || currentIndex >= checkboxes.length - 1) {
+currentIndex = 0;
+} else {
+currentIndex += 1;
+}
+checkboxes[currentIndex].focus();
+if (currentIndex === checkboxes.length - 1) {
+prefetchNextPage();
+}
+}
+function selectCheckbox() {
+rangeAnchor = -1;
+if (currentIndex !== -1) {
+checkboxes[currentIndex].click();
+}
+}
+const pendingSelection = new Map();
+let selectionFrame = null;
+const changedCheckboxes = new Set();
+let shiftHeld = false;
+function isSelected(checkbox) {
+return pendingSelection.has(checkbox) ? pendingSelection.get(checkbox) : checkbox.checked;
+}
+function setSelected(checkbox, selected) {
+if (!checkbox.classList.contains("action-select")) {
+return;
+}
+pendingSelection.set(checkbox, selected);
+if (selectionFrame === null) {
+selectionFrame = requestAnimationFrame(applySelection);
+}
+}
+function applySelection() {
+selectionFrame = null;
+for (const [checkbox, selected] of pendingSelection) {
+if (checkbox.checked !== selected) {
+checkbox.checked = selected;
+checkbox.closest("tr").classList.toggle("selected", selected);
+changedCheckboxes.add(checkbox);
+}
+}
+pendingSelection.clear();
+if (!shiftHeld) {
+dispatchChanges();
+}
+}
+function dispatchChanges() {
+const changed = Array.from(changedCheckboxes);
+changedCheckboxes.clear();
+for (const checkbox of changed) {
+checkbox.dispatchEvent(new Event("change", {bubbles: true}));
+}
+}
+function trackShift(event) {
+shiftHeld = event.shiftKey;
+if (!shiftHeld && changedCheckboxes.size) {
+requestAnimationFrame(dispatchChanges);
+}
+}
+function actionCheckboxes() {
+return checkboxes.filter(function(checkbox) {
+return checkbox.classList.contains("action-select");
+});
+}
+function extendSelection(step) {
+const rows = actionCheckboxes();
+if (!rows.length) {
+return;
+}
+if (rangeAnchor === -1) {
+if (currentIndex === -1 || !checkboxes[currentIndex].classList.contains("action-select")) {
+currentIndex = checkboxes.indexOf(step > 0 ? rows[0] : rows[rows.length - 1]);
+step = 0;
+}
+rangeAnchor = currentIndex;
+rangeSelected.clear();
+}
+const previousIndex = currentIndex;
+const nextIndex = currentIndex + step;
+if (nextIndex >= 0 && nextIndex < checkboxes.length && checkboxes[nextIndex].classList.contains("action-select")) {
+currentIndex = nextIndex;
+}
+checkboxes[currentIndex].focus();
+const start = Math.min(rangeAnchor, currentIndex);
+const end = Math.max(rangeAnchor, currentIndex);
+for (let i = Math.min(rangeAnchor, previousIndex); i <= Math.max(rangeAnchor, previousIndex); i += 1) {
+if ((i < start || i > end) && rangeSelected.delete(checkboxes[i])) {
+setSelected(checkboxes[i], false);
+}
+}
+for (let i = start; i <= end; i += 1) {
+if (!isSelected(checkboxes[i])) {
+rangeSelected.add(checkboxes[i]);
+setSelected(checkboxes[i], true);
+}
+}
+}
+function extendSelectionDown() {
+extendSelection(1);
+}
+function extendSelectionUp() {
+extendSelection(-1);
+}
+function toggleAllRows() {
+const rows = actionCheckboxes();
+const allSelected = rows.every(isSelected);
+for (const checkbox of rows) {
+setSelected(checkbox, !allSelected);
+}
+}
+function invertSelection() {
+for (const checkbox of actionCheckboxes()) {
+setSelected(checkbox, !isSelected(checkbox));
+}
+}
+function selectActionsSelect() {
+const actionsSelect = document.querySelector("select[name=action]");
+actionsSelect.focus();
+}
+function bindShortcutActionsToButtons() {
+document.getElementById("keyshortcut-prev-btn").addEventListener("click", focusPreviousCheckbox);
+document.getElementById("keyshortcut-next-btn").addEventListener("click", focusNextCheckbox);
+document.getElementById("keyshortcut-select-btn").addEventListener("click", selectCheckbox);
+document.getElementById("keyshortcut-select-actions-btn").addEventListener("click", selectActionsSelect);
+document.getElementById("keyshortcut-extend-down-btn").addEventListener("click", extendSelectionDown);
+document.getElementById("keyshortcut-extend-up-btn").addEventListener("click", extendSelectionUp);
+document.getElementById("keyshortcut-select-all-btn").addEventListener("click", toggleAllRows);
+document.getElementById("keyshortcut-invert-selection-btn").addEventListener("click", invertSelection);
+}
+function initShortcuts() {
+if (!document.getElementById("keyshortcut-next-btn")) {
+return;
+}
+setUpShortcuts();
+bindShortcutActionsToButtons();
+}
+if (document.readyState === "loading") {
+document.addEventListener("DOMContentLoaded", initShortcuts);
+} else {
+initShortcuts();
+}
+}
+{
+let errorElements = [];
+let errorContainers = [];
+let saving = false;
+function hasChanged(element) {
+if (element.type === 'checkbox' || element.type === 'radio') {
+return element.checked !== element.defaultChecked;
+}
+if (element.options) {
+return Array.from(element.options).some(function(option) {
+return option.selected !== option.defaultSelected;
+});
+}
+return element.value !== element.defaultValue;
+}
+function canSaveInPlace(form) {
+if (form.querySelector('input[name="_popup"]')) {
+return false;
+}
+for (const input of form.querySelectorAll('input[type="file"]')) {
+if (input.files.length) {
+return false;
+}
+}
+if (form.querySelector('input[name$="-DELETE"]:checked')) {
+return false;
+}
+for (const initialForms of form.querySelectorAll('input[name$="-INITIAL_FORMS"]')) {
+const prefix = initialForms.name.slice(0, -'INITIAL_FORMS'.length);
+const initial = Number(initialForms.value);
+for (const element of form.elements) {
+if (!element.name.startsWith(prefix) || !hasChanged(element)) {
+continue;
+}
+const index = Number(element.name.slice(prefix.length).split('-')[0]);
+if (index >= initial) {
+return false;
+}
+}
+}
+return true;
+}
+function createErrorList(messages, className) {
+const list = document.createElement('ul');
+list.className = className;
+for (const message of messages) {
+const item = document.createElement('li');
+item.textContent = message;
+list.append(item);
+}
+return list;
+}
+function clearErrors() {
+for (const element of errorElements) {
+element.remove();
+}
+for (const container of errorContainers) {
+container.classList.remove('errors');
+}
+errorElements = [];
+errorContainers = [];
+}
+function showErrors(form, result) {
+clearErrors();
+const nonFieldErrors = result.non_field_errors.slice();
+let firstField = null;
+for (const name of Object.keys(result.errors)) {
+let field = form.elements.namedItem(name);
+if (field instanceof RadioNodeList) {
+field = field[0];
+}
+if (!field) {
+nonFieldErrors.push(...result.errors[name]);
+continue;
+}
+const container = field.closest('.form-row, td') || field.parentElement;
+const list = createErrorList(result.errors[name], 'errorlist');
+container.prepend(list);
+container.classList.add('errors');
+errorElements.push(list);
+errorContainers.push(container);
+firstField = firstField || field;
+}
+const note = document.createElement('p');
+note.className = 'errornote';
+note.textContent = result.message;
+const firstFieldset = form.querySelector('fieldset');
+firstFieldset.before(note);
+errorElements.push(note);
+if (nonFieldErrors.length) {
+const list = createErrorList(nonFieldErrors, 'errorlist nonfield');
+note.after(list);
+errorElements.push(list);
+}
+for (const oldNote of form.querySelectorAll('.errornote')) {
+if (oldNote !== note) {
+oldNote.remove();
+}
+}
+if (firstField) {
+firstField.focus();
+} else {
+note.scrollIntoView();
+}
+}
+function showMessages(messages) {
+let list = document.querySelector('ul.messagelist');
+if (!list) {
+list = document.createElement('ul');
+list.className = 'messagelist';
+document.getElementById('content').before(list);
+}
+list.replaceChildren(...messages.map(function(message) {
+const item = document.createElement('li');
+item.className = message.tags;
+item.textContent = message.message;
+return item;
+}));
+}
+function resetDefaultValues(form) {
+for (const element of form.elements) {
+if (element.type === 'checkbox' || element.type === 'radio') {
+element.defaultChecked = element.checked;
+} else if (element.options) {
+for (const option of element.options) {
+option.defaultSelected = option.selected;
+}
+} else if ('defaultValue' in element) {
+element.defaultValue = element.value;
+}
+}
+}
+function saveInPlace(form, button) {
+saving = true;
+const data = new FormData(form);
+data.append(button.name, button.value);
+fetch(form.action || window.location.href, {
+method: 'POST',
+body: data,
+credentials: 'same-origin',
+headers: {'X-Admin-Keyshortcuts-Save': '1'}
+})
+.then(function(response) {
+if (!response.ok) {
+throw new Error(`Failed to save in place: ${response.status}`);
+}
+return response.json();
+})
+.then(function(result) {
+if (result.saved && result.stay) {
+clearErrors();
+for (const note of form.querySelectorAll('.errornote')) {
+note.remove();
+}
+showMessages(result.messages);
+resetDefaultValues(form);
+} else if (result.saved) {
+window.location.assign(result.redirect);
+} else if (result.saved === false) {
+showErrors(form, result);
+} else {
+saving = false;
+button.click();
+}
+})
+.then(function() {
+saving = false;
+}, function(error) {
+console.error(error);
+saving = false;
+button.click();
+});
+}
+function handleSaveShortcut(event) {
+const button = event.currentTarget;
+if (saving) {
+event.preventDefault();
+return;
+}
+if (!canSaveInPlace(button.form)) {
+return;
+}
+event.preventDefault();
+saveInPlace(button.form, button);
+}
+function initAsyncSave() {
+for (const button of document.querySelectorAll('input[data-async-save]')) {
+button.addEventListener('hotkey-fire', handleSaveShortcut);
+}
+}
+const groups = [];
+const groupsByPrefix = new Map();
+const rowPositions = new Map();
+let formFields = new Map();
+let currentGroup = -1;
+let currentRow = -1;
+function isRow(element, prefix) {
+return element.id.startsWith(`${prefix}-`) && /^\d+$/.test(element.id.slice(prefix.length + 1));
+}
+function indexRows(group) {
+group.rows.forEach(function(row, index) {
+rowPositions.set(row, {group: group, index: index});
+});
+}
+function indexGroupFields(element, prefix) {
+const fields = new Map();
+for (const header of element.querySelectorAll('thead th[class*="column-"]')) {
+const name = Array.from(header.classList).find(function(className) {
+return className.startsWith('column-');
+});
+if (!header.classList.contains('hidden')) {
+fields.set(header.textContent.trim(), name.slice('column-'.length));
+}
+}
+const template = document.getElementById(`${prefix}-empty`);
+if (!fields.size && template) {
+const idPrefix = `id_${prefix}-__prefix__-`;
+for (const label of template.querySelectorAll('label[for]')) {
+if (label.htmlFor.startsWith(idPrefix)) {
+fields.set(label.textContent.replace(/:$/, '').trim(), label.htmlFor.slice(idPrefix.length));
+}
+}
+}
+return fields;
+}
+function buildIndex(form) {
+for (const element of form.querySelectorAll('.js-inline-admin-formset')) {
+const prefix = JSON.parse(element.dataset.inlineFormset).options.prefix;
+const group = {
+index: groups.length,
+element: element,
+prefix: prefix,
+rows: Array.from(element.querySelectorAll('tr.form-row[id], div.inline-related[id]')).filter(function(row) {
+return isRow(row, prefix);
+}),
+fields: indexGroupFields(element, prefix)
+};
+groups.push(group);
+groupsByPrefix.set(prefix, group);
+indexRows(group);
+}
+formFields = new Map();
+for (const label of form.querySelectorAll('label[for]')) {
+if (!label.closest('.inline-group')) {
+formFields.set(label.textContent.replace(/:$/, '').trim(), label.htmlFor);
+}
+}
+}
+function handleRowAdded(event) {
+const group = groupsByPrefix.get(event.detail.formsetName);
+if (!group || !isRow(event.target, group.prefix)) {
+return;
+}
+group.rows.push(event.target);
+rowPositions.set(event.target, {group: group, index: group.rows.length - 1});
+}
+function handleRowRemoved(event) {
+const group = groupsByPrefix.get(event.detail.formsetName);
+if (!group) {
+return;
+}
+const currentRowElement = currentGroup === group.index ? group.rows[currentRow] : null;
+group.rows = group.rows.filter(function(row) {
+if (row.isConnected) {
+return true;
+}
+rowPositions.delete(row);
+return false;
+});
+indexRows(group);
+if (currentRowElement) {
+currentRow = currentRowElement.isConnected ? rowPositions.get(currentRowElement).index : -1;
+}
+}
+function handleFocusIn(event) {
+const row = event.target.closest('tr.form-row[id], div.inline-related[id]');
+const position = row && rowPositions.get(row);
+if (position) {
+currentGroup = position.group.index;
+currentRow = position.index;
+}
+}
+function focusRow(groupIndex, rowIndex) {
+const group = groups[groupIndex];
+const row = group.rows[rowIndex];
+if (!row) {
+return;
+}
+currentGroup = groupIndex;
+currentRow = rowIndex;
+const field = row.querySelector('input:not([type="hidden"]):not([disabled]), select:not([disabled]), textarea:not([disabled])');
+if (field) {
+field.focus();
+} else {
+row.scrollIntoView({block: 'nearest'});
+}
+}
+function moveRow(step) {
+if (!groups.length) {
+return;
+}
+const groupIndex = currentGroup === -1 ? (step > 0 ? 0 : groups.length - 1) : currentGroup;
+const rows = groups[groupIndex].rows;
+if (currentGroup === -1 || currentRow === -1) {
+focusRow(groupIndex, step > 0 ? 0 : rows.length - 1);
+} else {
+focusRow(groupIndex, (currentRow + step + rows.length) % rows.length);
+}
+}
+function moveGroup(step) {
+if (!groups.length) {
+return;
+}
+const groupIndex = currentGroup === -1 ? (step > 0 ? 0 : groups.length - 1) : (currentGroup + step + groups.length) % groups.length;
+if (groups[groupIndex].rows.length) {
+focusRow(groupIndex, 0);
+} else {
+currentGroup = groupIndex;
+currentRow = -1;
+groups[groupIndex].element.scrollIntoView();
+}
+}
+function addRow() {
+const group = groups[currentGroup === -1 ? 0 : currentGroup];
+const addLink = group && group.element.querySelector('.add-row a');
+if (!addLink || !addLink.offsetParent) {
+return;
+}
+addLink.click();
+focusRow(group.index, group.rows.length - 1);
+}
+function findField(label) {
+const group = groups[currentGroup];
+const row = group && group.rows[currentRow];
+if (row) {
+const name = group.fields.get(label);
+return name && `id_${row.id}-${name}`;
+}
+return formFields.get(label);
+}
+function showFieldJump() {
+const dialog = document.getElementById('shortcuts-field-jump');
+const input = document.getElementById('shortcuts-field-jump-input');
+const group = groups[currentGroup];
+const labels = group && group.rows[currentRow] ? group.fields : formFields;
+document.getElementById('shortcuts-field-jump-labels').replaceChildren(...Array.from(labels.keys(), function(label) {
+const option = document.createElement('option');
+option.value = label;
+return option;
+}));
+input.value = '';
+dialog.showModal();
+}
+function jumpToField(event) {
+const input = document.getElementById('shortcuts-field-jump-input');
+const field = document.getElementById(findField(input.value.trim()));
+if (!field) {
+event.preventDefault();
+input.select();
+return;
+}
+event.target.closest('dialog').addEventListener('close', function() {
+field.focus();
+}, {once: true});
+}
+const fieldHotkeys = new Map();
+function handleFieldKeydown(event) {
+if (event.defaultPrevented || !(event.altKey || event.ctrlKey || event.metaKey)) {
+return;
+}
+if (!isEnabled() || !isFormField(event.target)) {
+return;
+}
+const button = fieldHotkeys.get(eventToHotkeyString(event));
+if (button) {
+event.preventDefault();
+button.click();
+}
+}
+function initFormNavigation() {
+const form = document.querySelector('#content-main form');
+const actions = {
+'keyshortcut-next-inline-row-btn': function() {
+moveRow(1);
+},
+'keyshortcut-previous-inline-row-btn': function() {
+moveRow(-1);
+},
+'keyshortcut-next-inline-group-btn': function() {
+moveGroup(1);
+},
+'keyshortcut-previous-inline-group-btn': function() {
+moveGroup(-1);
+},
+'keyshortcut-add-inline-row-btn': addRow,
+'keyshortcut-go-to-field-btn': showFieldJump
+};
+if (!form || !document.getElementById('keyshortcut-go-to-field-btn')) {
+return;
+}
+buildIndex(form);
+for (const [id, action] of Object.entries(actions)) {
+const button = document.getElementById(id);
+if (!button) {
+continue;
+}
+button.addEventListener('click', action);
+for (const edges of expandHotkeyToEdges(button.dataset.hotkey || '')) {
+if (edges.length === 1) {
+fieldHotkeys.set(edges[0], button);
+}
+}
+}
+form.addEventListener('focusin', handleFocusIn);
+form.addEventListener('keydown', handleFieldKeydown);
+document.addEventListener('formset:added', handleRowAdded);
+document.addEventListener('formset:removed', handleRowRemoved);
+document.getElementById('shortcuts-field-jump-form').addEventListener('submit', jumpToField);
+}
+function initChangeForm() {
+initAsyncSave();
+initFormNavigation();
+}
+if (document.readyState === 'loading') {
+document.addEventListener('DOMContentLoaded', initChangeForm);
+} else {
+initChangeForm();
+}
+}
+'use strict';
+{
+const storageKey = 'django.admin.shortcutsPalette';
+const maxResults = 50;
+const separators = /[\s›]+/;
+let entries = null;
+let prefixIndex = [];
+let trigramIndex = new Map();
+let results = [];
+let selectedIndex = 0;
+function normalize(text) {
+return text.toLowerCase().split(separators).filter(Boolean).join(' ');
+}
+function getTrigrams(text) {
+const trigrams = new Set();
+for (let i = 0; i + 3 <= text.length; i += 1) {
+trigrams.add(text.slice(i, i + 3));
+}
+return trigrams;
+}
+function buildIndex(loadedEntries) {
+entries = loadedEntries;
+prefixIndex = [];
+trigramIndex = new Map();
+entries.forEach(function(entry, index) {
+const label = normalize(entry.label);
+for (const word of label.split(' ')) {
+prefixIndex.push([word, index]);
+}
+for (const trigram of getTrigrams(label)) {
+let postings = trigramIndex.get(trigram);
+if (!postings) {
+postings = [];
+trigramIndex.set(trigram, postings);
+}
+postings.push(index);
+}
+});
+prefixIndex.sort(function(a, b) {
+return a[0] < b[0] ? -1 : a[0] > b[0] ? 1 : 0;
+});
+}
+function searchPrefix(term) {
+let low = 0;
+let high = prefixIndex.length;
+while (low < high) {
+const mid = (low + high) >>> 1;
+if (prefixIndex[mid][0] < term) {
+low = mid + 1;
+} else {
+high = mid;
+}
+}
+const matches = new Set();
+for (let i = low; i < prefixIndex.length && prefixIndex[i][0].startsWith(term); i += 1) {
+matches.add(prefixIndex[i][1]);
+}
+return matches;
+}
+function search(query) {
+const normalizedQuery = normalize(query);
+if (!normalizedQuery) {
+return entries.slice(0, maxResults);
+}
+const scores = new Map();
+let prefixMatches = null;
+for (const term of normalizedQuery.split(' ')) {
+const matches = searchPrefix(term);
+prefixMatches = prefixMatches === null ? matches : new Set(Array.from(prefixMatches).filter(function(index) {
+return matches.has(index);
+}));
+}
+for (const index of prefixMatches) {
+scores.set(index, 2);
+}
+const trigrams = getTrigrams(normalizedQuery);
+if (trigrams.size) {
+const hits = new Map();
+for (const trigram of trigrams) {
+for (const index of trigramIndex.get(trigram) || []) {
+hits.set(index, (hits.get(index) || 0) + 1);
+}
+}
+for (const [index, count] of hits) {
+if (!scores.has(index) && count * 3 >= trigrams.size) {
+scores.set(index, count / trigrams.size);
+}
+}
+}
+return Array.from(scores.keys())
+.sort(function(a, b) {
+return scores.get(b) - scores.get(a) || entries[a].label.length - entries[b].label.length;
+})
+.slice(0, maxResults)
+.map(function(index) {
+return entries[index];
+});
+}
+function renderResults(list) {
+list.replaceChildren(...results.map(function(entry, index) {
+const item = document.createElement('li');
+item.id = `shortcuts-palette-result-${index}`;
+item.setAttribute('role', 'option');
+item.setAttribute('aria-selected', index === selectedIndex ? 'true' : 'false');
+const link = document.createElement('a');
+link.href = entry.url;
+link.textContent = entry.label;
+item.append(link);
+return item;
+}));
+}
+function selectResult(input, list, index) {
+const previous = list.children[selectedIndex];
+if (previous) {
+previous.setAttribute('aria-selected', 'false');
+}
+selectedIndex = index;
+const selected = list.children[selectedIndex];
+if (selected) {
+selected.setAttribute('aria-selected', 'true');
+selected.scrollIntoView({block: 'nearest'});
+input.setAttribute('aria-activedescendant', selected.id);
+} else {
+input.removeAttribute('aria-activedescendant');
+}
+}
+function updateResults(input, list) {
+results = search(input.value);
+selectedIndex = 0;
+renderResults(list);
+selectResult(input, list, 0);
+}
+function loadEntries(palette) {
+if (entries) {
+return Promise.resolve();
+}
+try {
+const stored = JSON.parse(localStorage.getItem(storageKey));
+if (stored && stored.version === palette.dataset.version) {
+buildIndex(stored.entries);
+return Promise.resolve();
+}
+} catch (error) {
+localStorage.removeItem(storageKey);
+}
+return fetch(palette.dataset.src, {credentials: 'same-origin'})
+.then(function(response) {
+if (!response.ok) {
+throw new Error(`Failed to load command palette: ${response.status}`);
+}
+return response.json();
+})
+.then(function(index) {
+buildIndex(index.entries);
+try {
+localStorage.setItem(storageKey, JSON.stringify(index));
+} catch (error) {
+}
+});
+}
+function initPalette() {
+const palette = document.getElementById('shortcuts-palette');
+if (!palette) {
+return;
+}
+const input = document.getElementById('shortcuts-palette-input');
+const list = document.getElementById('shortcuts-palette-results');
+document.getElementById('open-shortcuts-palette').addEventListener('click', function() {
+loadEntries(palette).then(function() {
+input.value = '';
+updateResults(input, list);
+palette.showModal();
+input.focus();
+});
+});
+input.addEventListener('input', function() {
+updateResults(input, list);
+});
+input.addEventListener('keydown', function(event) {
+if (!results.length) {
+return;
+}
+if (event.key === 'ArrowDown') {
+selectResult(input, list, (selectedIndex + 1) % results.length);
+} else if (event.key === 'ArrowUp') {
+selectResult(input, list, (selectedIndex - 1 + results.length) % results.length);
+} else if (event.key === 'Enter') {
+window.location.assign(results[selectedIndex].url);
+} else {
+return;
+}
+event.preventDefault();
+});
+}
+if (document.readyState === 'loading') {
+document.addEventListener('DOMContentLoaded', initPalette);
+} else {
+initPalette();
+}
+}
@@ -1,43 +1,278 @@
-import { install, uninstall } from './vendor/hotkey/hotkey.js';
+import { install, setEnabled, uninstall } from './vendor/hotkey/hotkey.js';
 
 'use strict';
 {
     let shortcutsEnabled = localStorage.getItem('django.admin.shortcutsEnabled') || 'true';
 
-    function installShortcuts() {
-        for (const el of document.querySelectorAll('[data-hotkey]')) {
+    // Hotkey elements are installed once. Toggling the shortcuts only flips
+    // the enabled flag checked by the hotkey keydown handler.
+    function installShortcuts(root) {
+        if (root.matches('[data-hotkey]')) {
+            install(root);
+        }
+        for (const el of root.querySelectorAll('[data-hotkey]')) {
             install(el);
         }
     }
-    function uninstallShortcuts() {
-        for (const el of document.querySelectorAll('[data-hotkey]')) {
+    function uninstallShortcuts(root) {
+        if (root.matches('[data-hotkey]')) {
+            uninstall(root);
+        }
+        for (const el of root.querySelectorAll('[data-hotkey]')) {
             uninstall(el);
         }
     }
 
+    // Elements added after page load (e.g. inline formset rows) are
+    // installed from the mutation records instead of rescanning the page.
+    function handleMutations(mutations) {
+        for (const mutation of mutations) {
+            if (mutation.type === 'attributes') {
+                uninstall(mutation.target);
+                if (mutation.target.hasAttribute('data-hotkey')) {
+                    install(mutation.target);
+                }
+                continue;
+            }
+            for (const node of mutation.removedNodes) {
+                if (node.nodeType === Node.ELEMENT_NODE) {
+                    uninstallShortcuts(node);
+                }
+            }
+            for (const node of mutation.addedNodes) {
+                if (node.nodeType === Node.ELEMENT_NODE && node.isConnected) {
+                    installShortcuts(node);
+                }
+            }
+        }
+    }
+
+    // Labels of modifier keys rendered in the platform-neutral markup,
+    // matching the platform detection of the hotkey library.
+    const macModifierKeyLabels = {Alt: '⌥', Mod: '⌘', Ctrl: '^', Control: '^', Meta: '⌘'};
+    const isApplePlatform = /Mac|iPod|iPhone|iPad/i.test(navigator.platform);
+
+    function localizeKeyLabels(root) {
+        if (!isApplePlatform) {
+            return;
+        }
+        for (const kbd of root.querySelectorAll('kbd[data-key]')) {
+            const label = macModifierKeyLabels[kbd.dataset.key];
+            if (label) {
+                kbd.textContent = label;
+            }
+        }
+    }
+
+    // With ADMIN_KEYSHORTCUTS_PREFERENCES the enabled state is stored per
+    // user on the server, and the pages of users who turned the shortcuts
+    // off don't load this script. The state is mirrored in localStorage for
+    // the other shortcut scripts.
+    let preferencesConfig = null;
+
+    function initPreferences() {
+        const configElement = document.getElementById('shortcuts-preferences-config');
+        if (!configElement) {
+            return;
+        }
+        preferencesConfig = JSON.parse(configElement.textContent);
+        shortcutsEnabled = 'true';
+        localStorage.setItem('django.admin.shortcutsEnabled', shortcutsEnabled);
+    }
+
+    function savePreferences() {
+        const data = new FormData();
+        data.append('csrfmiddlewaretoken', preferencesConfig.csrfToken);
+        data.append('enabled', shortcutsEnabled);
+        fetch(preferencesConfig.url, {method: 'POST', body: data, credentials: 'same-origin'})
+            .then(function(response) {
+                if (!response.ok) {
+                    throw new Error(`Failed to save shortcut preferences: ${response.status}`);
+                }
+            })
+            .catch(function(error) {
+                console.error(error);
+            });
+    }
+
     function initShortcuts() {
-        const toggleShortcuts = document.getElementById('toggle-shortcuts');
+        initPreferences();
+        setEnabled(shortcutsEnabled === 'true');
+        installShortcuts(document.documentElement);
+        new MutationObserver(handleMutations).observe(document.documentElement, {
+            attributeFilter: ['data-hotkey', 'data-hotkey-scope'],
+            childList: true,
+            subtree: true
+        });
+        performance.mark('admin-keyshortcuts:ready');
+    }
 
-        if (shortcutsEnabled === 'true') {
-            toggleShortcuts.checked = true;
-            installShortcuts();
+    // Keypress-to-action latency, measured from the keydown event to the
+    // hotkey-fire event for a sample of keypresses and sent in batches to
+    // the collector view.
+    const latencyBatchSize = 20;
+    let latencyConfig = null;
+    let latencySamples = [];
+    let sampledKeydownTime = null;
+
+    function startLatencyMeasure(event) {
+        sampledKeydownTime = Math.random() < latencyConfig.sampleRate ? event.timeStamp : null;
+    }
+
+    function endLatencyMeasure(event) {
+        if (sampledKeydownTime === null) {
+            return;
         }
-        toggleShortcuts.addEventListener('change', function() {
-            if (shortcutsEnabled === 'true') {
-                shortcutsEnabled = 'false';
-                uninstallShortcuts();
-            } else {
-                shortcutsEnabled = 'true';
-                installShortcuts();
+        const hotkey = event.detail.path.join(' ');
+        const end = performance.now();
+        performance.measure('admin-keyshortcuts:hotkey', {start: sampledKeydownTime, end: end, detail: {hotkey: hotkey}});
+        latencySamples.push({hotkey: hotkey, duration: end - sampledKeydownTime});
+        sampledKeydownTime = null;
+        if (latencySamples.length >= latencyBatchSize) {
+            sendLatencySamples();
+        }
+    }
+
+    function sendLatencySamples() {
+        if (!latencySamples.length) {
+            return;
+        }
+        const data = new FormData();
+        data.append('csrfmiddlewaretoken', latencyConfig.csrfToken);
+        data.append('view', latencyConfig.view);
+        data.append('samples', JSON.stringify(latencySamples));
+        navigator.sendBeacon(latencyConfig.url, data);
+        latencySamples = [];
+    }
+
+    function initLatencyMeasures() {
+        const configElement = document.getElementById('shortcuts-latency-config');
+        if (!configElement) {
+            return;
+        }
+        latencyConfig = JSON.parse(configElement.textContent);
+        // Capturing listeners run before the hotkey keydown handler and
+        // before any hotkey-fire listener of the shortcut element.
+        window.addEventListener('keydown', startLatencyMeasure, true);
+        document.addEventListener('hotkey-fire', endLatencyMeasure, true);
+        document.addEventListener('visibilitychange', function() {
+            if (document.visibilityState === 'hidden') {
+                sendLatencySamples();
             }
+        });
+    }
+
+    // The service worker caching the shortcut assets is registered with the
+    // admin site as scope.
+    function initServiceWorker() {
+        const configElement = document.getElementById('shortcuts-service-worker-config');
+        if (!configElement || !('serviceWorker' in navigator)) {
+            return;
+        }
+        const config = JSON.parse(configElement.textContent);
+        navigator.serviceWorker.register(config.url, {scope: config.scope})
+            .catch(function(error) {
+                console.error(error);
+            });
+    }
+
+    function initShortcutsToggle() {
+        const toggleShortcuts = document.getElementById('toggle-shortcuts');
+        if (!toggleShortcuts) {
+            return;
+        }
+
+        toggleShortcuts.checked = shortcutsEnabled === 'true';
+        toggleShortcuts.addEventListener('change', function() {
+            shortcutsEnabled = toggleShortcuts.checked ? 'true' : 'false';
+            setEnabled(toggleShortcuts.checked);
             localStorage.setItem('django.admin.shortcutsEnabled', shortcutsEnabled);
+            if (preferencesConfig) {
+                savePreferences();
+            }
         });
     }
 
+    let dialogLoaded = null;
+
+    // In the "lazy" dialog mode the page only ships an empty dialog, its
+    // content is fetched from the URL in data-src on first open.
+    function loadShortcutsDialog(dialog) {
+        if (!dialogLoaded) {
+            dialogLoaded = fetch(dialog.dataset.src, {credentials: 'same-origin'})
+                .then(function(response) {
+                    if (!response.ok) {
+                        throw new Error(`Failed to load shortcuts dialog: ${response.status}`);
+                    }
+                    return response.text();
+                })
+                .then(function(html) {
+                    const template = document.createElement('template');
+                    template.innerHTML = html;
+                    const loadedDialog = template.content.getElementById('shortcuts-dialog');
+                    dialog.replaceChildren(...loadedDialog.childNodes);
+                    delete dialog.dataset.src;
+                    localizeKeyLabels(dialog);
+                    initShortcutsToggle();
+                })
+                .catch(function(error) {
+                    dialogLoaded = null;
+                    throw error;
+                });
+        }
+        return dialogLoaded;
+    }
+
+    // In the "lazy" deleted objects mode of the delete confirmation page,
+    // the related objects of an item are fetched when it is expanded.
+    function loadDeletedObjects(event) {
+        const details = event.target;
+        const src = details.dataset && details.dataset.src;
+        if (!details.open || !src) {
+            return;
+        }
+        delete details.dataset.src;
+        fetch(src, {credentials: 'same-origin'})
+            .then(function(response) {
+                if (!response.ok) {
+                    throw new Error(`Failed to load deleted objects: ${response.status}`);
+                }
+                return response.text();
+            })
+            .then(function(html) {
+                const list = document.createElement('ul');
+                list.innerHTML = html;
+                details.append(list);
+            })
+            .catch(function(error) {
+                details.dataset.src = src;
+                details.open = false;
+                console.error(error);
+            });
+    }
+
+    function initDeletedObjects() {
+        const deletedObjects = document.getElementById('deleted-objects');
+        if (!deletedObjects) {
+            return;
+        }
+        // toggle events don't bubble.
+        deletedObjects.addEventListener('toggle', loadDeletedObjects, true);
+    }
 
     function showShortcutsDialog() {
         const dialog = document.getElementById("shortcuts-dialog");
-        dialog.showModal();
+        if (dialog.dataset.src) {
+            loadShortcutsDialog(dialog)
+                .then(function() {
+                    dialog.showModal();
+                })
+                .catch(function(error) {
+                    console.error(error);
+                });
+        } else {
+            dialog.showModal();
+        }
     }
 
     function showDialogOnClick() {
@@ -50,10 +285,22 @@ import { install, uninstall } from './vendor/hotkey/hotkey.js';
 
 
     if (document.readyState === "loading") {
+        document.addEventListener("DOMContentLoaded", function() {
+            localizeKeyLabels(document);
+        });
         document.addEventListener("DOMContentLoaded", initShortcuts);
+        document.addEventListener("DOMContentLoaded", initLatencyMeasures);
+        document.addEventListener("DOMContentLoaded", initShortcutsToggle);
         document.addEventListener("DOMContentLoaded", showDialogOnClick);
+        document.addEventListener("DOMContentLoaded", initServiceWorker);
+        document.addEventListener("DOMContentLoaded", initDeletedObjects);
     } else {
+        localizeKeyLabels(document);
         initShortcuts();
+        initLatencyMeasures();
+        initShortcutsToggle();
         showDialogOnClick();
+        initServiceWorker();
+        initDeletedObjects();
     }
 }
@@ -0,0 +1,491 @@
+import { eventToHotkeyString, expandHotkeyToEdges, isEnabled, isFormField } from './vendor/hotkey/hotkey.js';
+
+{
+    // Elements added to the page to show the errors of the last save.
+    let errorElements = [];
+    let errorContainers = [];
+    let saving = false;
+
+    function hasChanged(element) {
+        if (element.type === 'checkbox' || element.type === 'radio') {
+            return element.checked !== element.defaultChecked;
+        }
+        if (element.options) {
+            return Array.from(element.options).some(function(option) {
+                return option.selected !== option.defaultSelected;
+            });
+        }
+        return element.value !== element.defaultValue;
+    }
+
+    // Files, new inline objects and deleted inline objects need the change
+    // form to be rendered again, so they are saved with a normal submission.
+    function canSaveInPlace(form) {
+        if (form.querySelector('input[name="_popup"]')) {
+            return false;
+        }
+        for (const input of form.querySelectorAll('input[type="file"]')) {
+            if (input.files.length) {
+                return false;
+            }
+        }
+        if (form.querySelector('input[name$="-DELETE"]:checked')) {
+            return false;
+        }
+        for (const initialForms of form.querySelectorAll('input[name$="-INITIAL_FORMS"]')) {
+            const prefix = initialForms.name.slice(0, -'INITIAL_FORMS'.length);
+            const initial = Number(initialForms.value);
+            for (const element of form.elements) {
+                if (!element.name.startsWith(prefix) || !hasChanged(element)) {
+                    continue;
+                }
+                const index = Number(element.name.slice(prefix.length).split('-')[0]);
+                if (index >= initial) {
+                    return false;
+                }
+            }
+        }
+        return true;
+    }
+
+    function createErrorList(messages, className) {
+        const list = document.createElement('ul');
+        list.className = className;
+        for (const message of messages) {
+            const item = document.createElement('li');
+            item.textContent = message;
+            list.append(item);
+        }
+        return list;
+    }
+
+    function clearErrors() {
+        for (const element of errorElements) {
+            element.remove();
+        }
+        for (const container of errorContainers) {
+            container.classList.remove('errors');
+        }
+        errorElements = [];
+        errorContainers = [];
+    }
+
+    function showErrors(form, result) {
+        clearErrors();
+        const nonFieldErrors = result.non_field_errors.slice();
+        let firstField = null;
+        for (const name of Object.keys(result.errors)) {
+            let field = form.elements.namedItem(name);
+            if (field instanceof RadioNodeList) {
+                field = field[0];
+            }
+            if (!field) {
+                nonFieldErrors.push(...result.errors[name]);
+                continue;
+            }
+            const container = field.closest('.form-row, td') || field.parentElement;
+            const list = createErrorList(result.errors[name], 'errorlist');
+            container.prepend(list);
+            container.classList.add('errors');
+            errorElements.push(list);
+            errorContainers.push(container);
+            firstField = firstField || field;
+        }
+        const note = document.createElement('p');
+        note.className = 'errornote';
+        note.textContent = result.message;
+        const firstFieldset = form.querySelector('fieldset');
+        firstFieldset.before(note);
+        errorElements.push(note);
+        if (nonFieldErrors.length) {
+            const list = createErrorList(nonFieldErrors, 'errorlist nonfield');
+            note.after(list);
+            errorElements.push(list);
+        }
+        for (const oldNote of form.querySelectorAll('.errornote')) {
+            if (oldNote !== note) {
+                oldNote.remove();
+            }
+        }
+        if (firstField) {
+            firstField.focus();
+        } else {
+            note.scrollIntoView();
+        }
+    }
+
+    function showMessages(messages) {
+        let list = document.querySelector('ul.messagelist');
+        if (!list) {
+            list = document.createElement('ul');
+            list.className = 'messagelist';
+            document.getElementById('content').before(list);
+        }
+        list.replaceChildren(...messages.map(function(message) {
+            const item = document.createElement('li');
+            item.className = message.tags;
+            item.textContent = message.message;
+            return item;
+        }));
+    }
+
+    // The saved values become the values the next save is compared with.
+    function resetDefaultValues(form) {
+        for (const element of form.elements) {
+            if (element.type === 'checkbox' || element.type === 'radio') {
+                element.defaultChecked = element.checked;
+            } else if (element.options) {
+                for (const option of element.options) {
+                    option.defaultSelected = option.selected;
+                }
+            } else if ('defaultValue' in element) {
+                element.defaultValue = element.value;
+            }
+        }
+    }
+
+    function saveInPlace(form, button) {
+        saving = true;
+        const data = new FormData(form);
+        data.append(button.name, button.value);
+        fetch(form.action || window.location.href, {
+            method: 'POST',
+            body: data,
+            credentials: 'same-origin',
+            headers: {'X-Admin-Keyshortcuts-Save': '1'}
+        })
+            .then(function(response) {
+                if (!response.ok) {
+                    throw new Error(`Failed to save in place: ${response.status}`);
+                }
+                return response.json();
+            })
+            .then(function(result) {
+                if (result.saved && result.stay) {
+                    clearErrors();
+                    for (const note of form.querySelectorAll('.errornote')) {
+                        note.remove();
+                    }
+                    showMessages(result.messages);
+                    resetDefaultValues(form);
+                } else if (result.saved) {
+                    window.location.assign(result.redirect);
+                } else if (result.saved === false) {
+                    showErrors(form, result);
+                } else {
+                    // Submit normally, keeping the edits.
+                    saving = false;
+                    button.click();
+                }
+            })
+            .then(function() {
+                saving = false;
+            }, function(error) {
+                // Submit normally when the request failed or the response
+                // isn't a save result, e.g. a server error page, so the
+                // response is shown with the edits kept in the form.
+                console.error(error);
+                saving = false;
+                button.click();
+            });
+    }
+
+    function handleSaveShortcut(event) {
+        const button = event.currentTarget;
+        if (saving) {
+            event.preventDefault();
+            return;
+        }
+        if (!canSaveInPlace(button.form)) {
+            return;
+        }
+        // Cancelling the event stops the hotkey library from clicking the
+        // button.
+        event.preventDefault();
+        saveInPlace(button.form, button);
+    }
+
+    function initAsyncSave() {
+        for (const button of document.querySelectorAll('input[data-async-save]')) {
+            button.addEventListener('hotkey-fire', handleSaveShortcut);
+        }
+    }
+
+    // Index of the inline formsets: the groups in document order, each with
+    // its rows in order and its fields by label, and the position of every
+    // row. It is built once and updated from the formset:added and
+    // formset:removed events of inlines.js, so moving between rows doesn't
+    // query the page however many rows there are.
+    const groups = [];
+    const groupsByPrefix = new Map();
+    const rowPositions = new Map();
+    // Fields of the main form by label.
+    let formFields = new Map();
+    let currentGroup = -1;
+    let currentRow = -1;
+
+    function isRow(element, prefix) {
+        return element.id.startsWith(`${prefix}-`) && /^\d+$/.test(element.id.slice(prefix.length + 1));
+    }
+
+    function indexRows(group) {
+        group.rows.forEach(function(row, index) {
+            rowPositions.set(row, {group: group, index: index});
+        });
+    }
+
+    // Map the labels of the fields of a group to the field names. Tabular
+    // inlines label the fields in the table header, stacked inlines in the
+    // form template for new rows.
+    function indexGroupFields(element, prefix) {
+        const fields = new Map();
+        for (const header of element.querySelectorAll('thead th[class*="column-"]')) {
+            const name = Array.from(header.classList).find(function(className) {
+                return className.startsWith('column-');
+            });
+            if (!header.classList.contains('hidden')) {
+                fields.set(header.textContent.trim(), name.slice('column-'.length));
+            }
+        }
+        const template = document.getElementById(`${prefix}-empty`);
+        if (!fields.size && template) {
+            const idPrefix = `id_${prefix}-__prefix__-`;
+            for (const label of template.querySelectorAll('label[for]')) {
+                if (label.htmlFor.startsWith(idPrefix)) {
+                    fields.set(label.textContent.replace(/:$/, '').trim(), label.htmlFor.slice(idPrefix.length));
+                }
+            }
+        }
+        return fields;
+    }
+
+    function buildIndex(form) {
+        for (const element of form.querySelectorAll('.js-inline-admin-formset')) {
+            const prefix = JSON.parse(element.dataset.inlineFormset).options.prefix;
+            const group = {
+                index: groups.length,
+                element: element,
+                prefix: prefix,
+                rows: Array.from(element.querySelectorAll('tr.form-row[id], div.inline-related[id]')).filter(function(row) {
+                    return isRow(row, prefix);
+                }),
+                fields: indexGroupFields(element, prefix)
+            };
+            groups.push(group);
+            groupsByPrefix.set(prefix, group);
+            indexRows(group);
+        }
+        formFields = new Map();
+        for (const label of form.querySelectorAll('label[for]')) {
+            if (!label.closest('.inline-group')) {
+                formFields.set(label.textContent.replace(/:$/, '').trim(), label.htmlFor);
+            }
+        }
+    }
+
+    // New rows are inserted before the template at the end of the group.
+    function handleRowAdded(event) {
+        const group = groupsByPrefix.get(event.detail.formsetName);
+        if (!group || !isRow(event.target, group.prefix)) {
+            return;
+        }
+        group.rows.push(event.target);
+        rowPositions.set(event.target, {group: group, index: group.rows.length - 1});
+    }
+
+    function handleRowRemoved(event) {
+        const group = groupsByPrefix.get(event.detail.formsetName);
+        if (!group) {
+            return;
+        }
+        const currentRowElement = currentGroup === group.index ? group.rows[currentRow] : null;
+        group.rows = group.rows.filter(function(row) {
+            if (row.isConnected) {
+                return true;
+            }
+            rowPositions.delete(row);
+            return false;
+        });
+        indexRows(group);
+        if (currentRowElement) {
+            currentRow = currentRowElement.isConnected ? rowPositions.get(currentRowElement).index : -1;
+        }
+    }
+
+    // Track the row holding the focus, whether it was reached with a
+    // shortcut, the mouse or Tab.
+    function handleFocusIn(event) {
+        const row = event.target.closest('tr.form-row[id], div.inline-related[id]');
+        const position = row && rowPositions.get(row);
+        if (position) {
+            currentGroup = position.group.index;
+            currentRow = position.index;
+        }
+    }
+
+    function focusRow(groupIndex, rowIndex) {
+        const group = groups[groupIndex];
+        const row = group.rows[rowIndex];
+        if (!row) {
+            return;
+        }
+        currentGroup = groupIndex;
+        currentRow = rowIndex;
+        const field = row.querySelector('input:not([type="hidden"]):not([disabled]), select:not([disabled]), textarea:not([disabled])');
+        if (field) {
+            field.focus();
+        } else {
+            row.scrollIntoView({block: 'nearest'});
+        }
+    }
+
+    function moveRow(step) {
+        if (!groups.length) {
+            return;
+        }
+        const groupIndex = currentGroup === -1 ? (step > 0 ? 0 : groups.length - 1) : currentGroup;
+        const rows = groups[groupIndex].rows;
+        if (currentGroup === -1 || currentRow === -1) {
+            focusRow(groupIndex, step > 0 ? 0 : rows.length - 1);
+        } else {
+            focusRow(groupIndex, (currentRow + step + rows.length) % rows.length);
+        }
+    }
+
+    function moveGroup(step) {
+        if (!groups.length) {
+            return;
+        }
+        const groupIndex = currentGroup === -1 ? (step > 0 ? 0 : groups.length - 1) : (currentGroup + step + groups.length) % groups.length;
+        if (groups[groupIndex].rows.length) {
+            focusRow(groupIndex, 0);
+        } else {
+            currentGroup = groupIndex;
+            currentRow = -1;
+            groups[groupIndex].element.scrollIntoView();
+        }
+    }
+
+    function addRow() {
+        const group = groups[currentGroup === -1 ? 0 : currentGroup];
+        const addLink = group && group.element.querySelector('.add-row a');
+        if (!addLink || !addLink.offsetParent) {
+            return;
+        }
+        // inlines.js adds the row synchronously and the index is updated
+        // from its formset:added event.
+        addLink.click();
+        focusRow(group.index, group.rows.length - 1);
+    }
+
+    // Return the id of the field with the given label in the focused row,
+    // or in the main form outside inline rows.
+    function findField(label) {
+        const group = groups[currentGroup];
+        const row = group && group.rows[currentRow];
+        if (row) {
+            const name = group.fields.get(label);
+            return name && `id_${row.id}-${name}`;
+        }
+        return formFields.get(label);
+    }
+
+    function showFieldJump() {
+        const dialog = document.getElementById('shortcuts-field-jump');
+        const input = document.getElementById('shortcuts-field-jump-input');
+        const group = groups[currentGroup];
+        const labels = group && group.rows[currentRow] ? group.fields : formFields;
+        document.getElementById('shortcuts-field-jump-labels').replaceChildren(...Array.from(labels.keys(), function(label) {
+            const option = document.createElement('option');
+            option.value = label;
+            return option;
+        }));
+        input.value = '';
+        dialog.showModal();
+    }
+
+    function jumpToField(event) {
+        const input = document.getElementById('shortcuts-field-jump-input');
+        const field = document.getElementById(findField(input.value.trim()));
+        if (!field) {
+            event.preventDefault();
+            input.select();
+            return;
+        }
+        // Focus the field once the dialog has closed and restored the focus.
+        event.target.closest('dialog').addEventListener('close', function() {
+            field.focus();
+        }, {once: true});
+    }
+
+    // The hotkey library ignores keys pressed in form fields, where moving
+    // between rows starts from. Modified keys bound to the navigation
+    // buttons are handled in fields by a single listener on the form.
+    const fieldHotkeys = new Map();
+
+    function handleFieldKeydown(event) {
+        if (event.defaultPrevented || !(event.altKey || event.ctrlKey || event.metaKey)) {
+            return;
+        }
+        if (!isEnabled() || !isFormField(event.target)) {
+            return;
+        }
+        const button = fieldHotkeys.get(eventToHotkeyString(event));
+        if (button) {
+            event.preventDefault();
+            button.click();
+        }
+    }
+
+    function initFormNavigation() {
+        const form = document.querySelector('#content-main form');
+        const actions = {
+            'keyshortcut-next-inline-row-btn': function() {
+                moveRow(1);
+            },
+            'keyshortcut-previous-inline-row-btn': function() {
+                moveRow(-1);
+            },
+            'keyshortcut-next-inline-group-btn': function() {
+                moveGroup(1);
+            },
+            'keyshortcut-previous-inline-group-btn': function() {
+                moveGroup(-1);
+            },
+            'keyshortcut-add-inline-row-btn': addRow,
+            'keyshortcut-go-to-field-btn': showFieldJump
+        };
+        if (!form || !document.getElementById('keyshortcut-go-to-field-btn')) {
+            return;
+        }
+        buildIndex(form);
+        for (const [id, action] of Object.entries(actions)) {
+            const button = document.getElementById(id);
+            if (!button) {
+                continue;
+            }
+            button.addEventListener('click', action);
+            for (const edges of expandHotkeyToEdges(button.dataset.hotkey || '')) {
+                if (edges.length === 1) {
+                    fieldHotkeys.set(edges[0], button);
+                }
+            }
+        }
+        form.addEventListener('focusin', handleFocusIn);
+        form.addEventListener('keydown', handleFieldKeydown);
+        document.addEventListener('formset:added', handleRowAdded);
+        document.addEventListener('formset:removed', handleRowRemoved);
+        document.getElementById('shortcuts-field-jump-form').addEventListener('submit', jumpToField);
+    }
+
+    function initChangeForm() {
+        initAsyncSave();
+        initFormNavigation();
+    }
+
+    if (document.readyState === 'loading') {
+        document.addEventListener('DOMContentLoaded', initChangeForm);
+    } else {
+        initChangeForm();
+    }
+}
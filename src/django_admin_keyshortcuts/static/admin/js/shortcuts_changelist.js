@@ -1,41 +1,268 @@
 'use strict';
 {
-    let checkboxes = null;
-    let currentCheckbox = null;
+    const checkboxSelector = "#action-toggle, .action-select";
+    // Row checkboxes in document order, and the position of the focused one.
+    let checkboxes = [];
+    let currentIndex = -1;
+    // Position of the row where the range extended by Shift+J/K starts, and
+    // the rows the range selected.
+    let rangeAnchor = -1;
+    const rangeSelected = new Set();
+    const trackedCheckboxes = new WeakSet();
+
+    function insertCheckbox(checkbox) {
+        if (trackedCheckboxes.has(checkbox)) {
+            return;
+        }
+        // Binary search for the position of the checkbox in document order.
+        let low = 0;
+        let high = checkboxes.length;
+        while (low < high) {
+            const mid = (low + high) >>> 1;
+            if (checkboxes[mid].compareDocumentPosition(checkbox) & Node.DOCUMENT_POSITION_FOLLOWING) {
+                low = mid + 1;
+            } else {
+                high = mid;
+            }
+        }
+        checkboxes.splice(low, 0, checkbox);
+        trackedCheckboxes.add(checkbox);
+        if (low <= currentIndex) {
+            currentIndex += 1;
+        }
+        if (low <= rangeAnchor) {
+            rangeAnchor += 1;
+        }
+    }
+
+    function removeDisconnectedCheckboxes() {
+        const currentCheckbox = checkboxes[currentIndex];
+        checkboxes = checkboxes.filter(function(checkbox) {
+            if (checkbox.isConnected) {
+                return true;
+            }
+            trackedCheckboxes.delete(checkbox);
+            return false;
+        });
+        currentIndex = currentCheckbox && currentCheckbox.isConnected ? checkboxes.indexOf(currentCheckbox) : -1;
+        rangeAnchor = -1;
+    }
+
+    // Keep the checkboxes in sync with rows added or removed after load.
+    function handleMutations(mutations) {
+        let removed = false;
+        for (const mutation of mutations) {
+            removed = removed || mutation.removedNodes.length > 0;
+            for (const node of mutation.addedNodes) {
+                if (node.nodeType !== Node.ELEMENT_NODE) {
+                    continue;
+                }
+                if (node.matches(checkboxSelector)) {
+                    insertCheckbox(node);
+                }
+                for (const checkbox of node.querySelectorAll(checkboxSelector)) {
+                    insertCheckbox(checkbox);
+                }
+            }
+        }
+        if (removed) {
+            removeDisconnectedCheckboxes();
+        }
+    }
 
     function setUpShortcuts() {
-        checkboxes = Array.from(
-            document.querySelectorAll("#action-toggle, .action-select")
-        );
+        checkboxes = Array.from(document.querySelectorAll(checkboxSelector));
+        for (const checkbox of checkboxes) {
+            trackedCheckboxes.add(checkbox);
+        }
+        document.addEventListener("keydown", trackShift);
+        document.addEventListener("keyup", trackShift);
+        const resultList = document.getElementById("result_list");
+        if (resultList) {
+            new MutationObserver(handleMutations).observe(resultList, {childList: true, subtree: true});
+        }
     }
 
     function focusPreviousCheckbox() {
         if (!checkboxes.length) {
             return;
         }
-        if (!currentCheckbox || currentCheckbox === checkboxes[0]) {
-            currentCheckbox = checkboxes[checkboxes.length - 1];
+        rangeAnchor = -1;
+        if (currentIndex <= 0) {
+            currentIndex = checkboxes.length - 1;
         } else {
-            currentCheckbox = checkboxes[checkboxes.indexOf(currentCheckbox) - 1];
+            currentIndex -= 1;
+        }
+        checkboxes[currentIndex].focus();
+    }
+
+    let nextPagePrefetched = false;
+
+    // Prefetch the next page once the last row is reached, so that going to
+    // the next page is served from the prefetch cache.
+    function prefetchNextPage() {
+        const nextPageLink = document.getElementById("keyshortcut-next-page-link");
+        if (nextPagePrefetched || !nextPageLink) {
+            return;
+        }
+        nextPagePrefetched = true;
+        if (HTMLScriptElement.supports && HTMLScriptElement.supports("speculationrules")) {
+            const rules = document.createElement("script");
+            rules.type = "speculationrules";
+            rules.textContent = JSON.stringify({prefetch: [{source: "list", urls: [nextPageLink.href]}]});
+            document.head.append(rules);
+        } else {
+            const link = document.createElement("link");
+            link.rel = "prefetch";
+            link.href = nextPageLink.href;
+            document.head.append(link);
         }
-        currentCheckbox.focus();
     }
 
     function focusNextCheckbox() {
         if (!checkboxes.length) {
             return;
         }
-        if (!currentCheckbox || currentCheckbox === checkboxes[checkboxes.length - 1]) {
-            currentCheckbox = checkboxes[0];
+        rangeAnchor = -1;
+        if (currentIndex === -1 || currentIndex >= checkboxes.length - 1) {
+            currentIndex = 0;
         } else {
-            currentCheckbox = checkboxes[checkboxes.indexOf(currentCheckbox) + 1];
+            currentIndex += 1;
+        }
+        checkboxes[currentIndex].focus();
+        if (currentIndex === checkboxes.length - 1) {
+            prefetchNextPage();
         }
-        currentCheckbox.focus();
     }
 
     function selectCheckbox() {
-        if (currentCheckbox) {
-            currentCheckbox.click();
+        rangeAnchor = -1;
+        if (currentIndex !== -1) {
+            checkboxes[currentIndex].click();
+        }
+    }
+
+    // Selection changes of many rows are applied together in the next
+    // animation frame, so that the rows are updated in a single layout.
+    const pendingSelection = new Map();
+    let selectionFrame = null;
+    // Checkboxes changed without their change event dispatched yet, and
+    // whether Shift is held.
+    const changedCheckboxes = new Set();
+    let shiftHeld = false;
+
+    function isSelected(checkbox) {
+        return pendingSelection.has(checkbox) ? pendingSelection.get(checkbox) : checkbox.checked;
+    }
+
+    function setSelected(checkbox, selected) {
+        if (!checkbox.classList.contains("action-select")) {
+            return;
+        }
+        pendingSelection.set(checkbox, selected);
+        if (selectionFrame === null) {
+            selectionFrame = requestAnimationFrame(applySelection);
+        }
+    }
+
+    function applySelection() {
+        selectionFrame = null;
+        for (const [checkbox, selected] of pendingSelection) {
+            if (checkbox.checked !== selected) {
+                checkbox.checked = selected;
+                checkbox.closest("tr").classList.toggle("selected", selected);
+                changedCheckboxes.add(checkbox);
+            }
+        }
+        pendingSelection.clear();
+        if (!shiftHeld) {
+            dispatchChanges();
+        }
+    }
+
+    // Every changed checkbox gets a change event, like a click would send,
+    // so that actions.js updates its counter and other listeners see every
+    // change. actions.js extends a change made while Shift is held to all
+    // rows since its last change, so the events wait for Shift to be
+    // released.
+    function dispatchChanges() {
+        const changed = Array.from(changedCheckboxes);
+        changedCheckboxes.clear();
+        for (const checkbox of changed) {
+            checkbox.dispatchEvent(new Event("change", {bubbles: true}));
+        }
+    }
+
+    function trackShift(event) {
+        shiftHeld = event.shiftKey;
+        if (!shiftHeld && changedCheckboxes.size) {
+            // After the keyup listener of actions.js has run.
+            requestAnimationFrame(dispatchChanges);
+        }
+    }
+
+    function actionCheckboxes() {
+        return checkboxes.filter(function(checkbox) {
+            return checkbox.classList.contains("action-select");
+        });
+    }
+
+    // Move the focus by step rows and select the rows from the anchor to the
+    // focused row. Rows the range selected are deselected when it no longer
+    // covers them, rows selected before are left selected.
+    function extendSelection(step) {
+        const rows = actionCheckboxes();
+        if (!rows.length) {
+            return;
+        }
+        if (rangeAnchor === -1) {
+            if (currentIndex === -1 || !checkboxes[currentIndex].classList.contains("action-select")) {
+                currentIndex = checkboxes.indexOf(step > 0 ? rows[0] : rows[rows.length - 1]);
+                step = 0;
+            }
+            rangeAnchor = currentIndex;
+            rangeSelected.clear();
+        }
+        const previousIndex = currentIndex;
+        const nextIndex = currentIndex + step;
+        if (nextIndex >= 0 && nextIndex < checkboxes.length && checkboxes[nextIndex].classList.contains("action-select")) {
+            currentIndex = nextIndex;
+        }
+        checkboxes[currentIndex].focus();
+        const start = Math.min(rangeAnchor, currentIndex);
+        const end = Math.max(rangeAnchor, currentIndex);
+        for (let i = Math.min(rangeAnchor, previousIndex); i <= Math.max(rangeAnchor, previousIndex); i += 1) {
+            if ((i < start || i > end) && rangeSelected.delete(checkboxes[i])) {
+                setSelected(checkboxes[i], false);
+            }
+        }
+        for (let i = start; i <= end; i += 1) {
+            if (!isSelected(checkboxes[i])) {
+                rangeSelected.add(checkboxes[i]);
+                setSelected(checkboxes[i], true);
+            }
+        }
+    }
+
+    function extendSelectionDown() {
+        extendSelection(1);
+    }
+
+    function extendSelectionUp() {
+        extendSelection(-1);
+    }
+
+    function toggleAllRows() {
+        const rows = actionCheckboxes();
+        const allSelected = rows.every(isSelected);
+        for (const checkbox of rows) {
+            setSelected(checkbox, !allSelected);
+        }
+    }
+
+    function invertSelection() {
+        for (const checkbox of actionCheckboxes()) {
+            setSelected(checkbox, !isSelected(checkbox));
         }
     }
 
@@ -49,14 +276,24 @@
         document.getElementById("keyshortcut-next-btn").addEventListener("click", focusNextCheckbox);
         document.getElementById("keyshortcut-select-btn").addEventListener("click", selectCheckbox);
         document.getElementById("keyshortcut-select-actions-btn").addEventListener("click", selectActionsSelect);
+        document.getElementById("keyshortcut-extend-down-btn").addEventListener("click", extendSelectionDown);
+        document.getElementById("keyshortcut-extend-up-btn").addEventListener("click", extendSelectionUp);
+        document.getElementById("keyshortcut-select-all-btn").addEventListener("click", toggleAllRows);
+        document.getElementById("keyshortcut-invert-selection-btn").addEventListener("click", invertSelection);
     }
 
-    if (document.readyState === "loading") {
-        document.addEventListener("DOMContentLoaded", setUpShortcuts);
-        document.addEventListener("DOMContentLoaded", bindShortcutActionsToButtons);
-    } else {
+    function initShortcuts() {
+        // The script is also part of the bundle loaded on every admin page.
+        if (!document.getElementById("keyshortcut-next-btn")) {
+            return;
+        }
         setUpShortcuts();
         bindShortcutActionsToButtons();
     }
-}
 
+    if (document.readyState === "loading") {
+        document.addEventListener("DOMContentLoaded", initShortcuts);
+    } else {
+        initShortcuts();
+    }
+}
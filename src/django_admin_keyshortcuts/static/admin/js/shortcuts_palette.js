@@ -0,0 +1,222 @@
+'use strict';
+{
+    const storageKey = 'django.admin.shortcutsPalette';
+    const maxResults = 50;
+    const separators = /[\s›]+/;
+
+    let entries = null;
+    // Words of all entry labels as [word, entry index] pairs, sorted by word,
+    // for prefix search.
+    let prefixIndex = [];
+    // Entry indices by the trigrams of their labels, for fuzzy search.
+    let trigramIndex = new Map();
+    let results = [];
+    let selectedIndex = 0;
+
+    function normalize(text) {
+        return text.toLowerCase().split(separators).filter(Boolean).join(' ');
+    }
+
+    function getTrigrams(text) {
+        const trigrams = new Set();
+        for (let i = 0; i + 3 <= text.length; i += 1) {
+            trigrams.add(text.slice(i, i + 3));
+        }
+        return trigrams;
+    }
+
+    function buildIndex(loadedEntries) {
+        entries = loadedEntries;
+        prefixIndex = [];
+        trigramIndex = new Map();
+        entries.forEach(function(entry, index) {
+            const label = normalize(entry.label);
+            for (const word of label.split(' ')) {
+                prefixIndex.push([word, index]);
+            }
+            for (const trigram of getTrigrams(label)) {
+                let postings = trigramIndex.get(trigram);
+                if (!postings) {
+                    postings = [];
+                    trigramIndex.set(trigram, postings);
+                }
+                postings.push(index);
+            }
+        });
+        prefixIndex.sort(function(a, b) {
+            return a[0] < b[0] ? -1 : a[0] > b[0] ? 1 : 0;
+        });
+    }
+
+    // Return the indices of the entries with a word starting with term.
+    function searchPrefix(term) {
+        let low = 0;
+        let high = prefixIndex.length;
+        while (low < high) {
+            const mid = (low + high) >>> 1;
+            if (prefixIndex[mid][0] < term) {
+                low = mid + 1;
+            } else {
+                high = mid;
+            }
+        }
+        const matches = new Set();
+        for (let i = low; i < prefixIndex.length && prefixIndex[i][0].startsWith(term); i += 1) {
+            matches.add(prefixIndex[i][1]);
+        }
+        return matches;
+    }
+
+    // Entries with words starting with every query term rank first, followed
+    // by the entries sharing at least a third of the query trigrams.
+    function search(query) {
+        const normalizedQuery = normalize(query);
+        if (!normalizedQuery) {
+            return entries.slice(0, maxResults);
+        }
+        const scores = new Map();
+        let prefixMatches = null;
+        for (const term of normalizedQuery.split(' ')) {
+            const matches = searchPrefix(term);
+            prefixMatches = prefixMatches === null ? matches : new Set(Array.from(prefixMatches).filter(function(index) {
+                return matches.has(index);
+            }));
+        }
+        for (const index of prefixMatches) {
+            scores.set(index, 2);
+        }
+        const trigrams = getTrigrams(normalizedQuery);
+        if (trigrams.size) {
+            const hits = new Map();
+            for (const trigram of trigrams) {
+                for (const index of trigramIndex.get(trigram) || []) {
+                    hits.set(index, (hits.get(index) || 0) + 1);
+                }
+            }
+            for (const [index, count] of hits) {
+                if (!scores.has(index) && count * 3 >= trigrams.size) {
+                    scores.set(index, count / trigrams.size);
+                }
+            }
+        }
+        return Array.from(scores.keys())
+            .sort(function(a, b) {
+                return scores.get(b) - scores.get(a) || entries[a].label.length - entries[b].label.length;
+            })
+            .slice(0, maxResults)
+            .map(function(index) {
+                return entries[index];
+            });
+    }
+
+    function renderResults(list) {
+        list.replaceChildren(...results.map(function(entry, index) {
+            const item = document.createElement('li');
+            item.id = `shortcuts-palette-result-${index}`;
+            item.setAttribute('role', 'option');
+            item.setAttribute('aria-selected', index === selectedIndex ? 'true' : 'false');
+            const link = document.createElement('a');
+            link.href = entry.url;
+            link.textContent = entry.label;
+            item.append(link);
+            return item;
+        }));
+    }
+
+    function selectResult(input, list, index) {
+        const previous = list.children[selectedIndex];
+        if (previous) {
+            previous.setAttribute('aria-selected', 'false');
+        }
+        selectedIndex = index;
+        const selected = list.children[selectedIndex];
+        if (selected) {
+            selected.setAttribute('aria-selected', 'true');
+            selected.scrollIntoView({block: 'nearest'});
+            input.setAttribute('aria-activedescendant', selected.id);
+        } else {
+            input.removeAttribute('aria-activedescendant');
+        }
+    }
+
+    function updateResults(input, list) {
+        results = search(input.value);
+        selectedIndex = 0;
+        renderResults(list);
+        selectResult(input, list, 0);
+    }
+
+    // The index is stored in localStorage with its version, and fetched again
+    // when the version rendered into the page changes.
+    function loadEntries(palette) {
+        if (entries) {
+            return Promise.resolve();
+        }
+        try {
+            const stored = JSON.parse(localStorage.getItem(storageKey));
+            if (stored && stored.version === palette.dataset.version) {
+                buildIndex(stored.entries);
+                return Promise.resolve();
+            }
+        } catch (error) {
+            localStorage.removeItem(storageKey);
+        }
+        return fetch(palette.dataset.src, {credentials: 'same-origin'})
+            .then(function(response) {
+                if (!response.ok) {
+                    throw new Error(`Failed to load command palette: ${response.status}`);
+                }
+                return response.json();
+            })
+            .then(function(index) {
+                buildIndex(index.entries);
+                try {
+                    localStorage.setItem(storageKey, JSON.stringify(index));
+                } catch (error) {
+                    // The index is fetched again on the next page.
+                }
+            });
+    }
+
+    function initPalette() {
+        const palette = document.getElementById('shortcuts-palette');
+        if (!palette) {
+            return;
+        }
+        const input = document.getElementById('shortcuts-palette-input');
+        const list = document.getElementById('shortcuts-palette-results');
+
+        document.getElementById('open-shortcuts-palette').addEventListener('click', function() {
+            loadEntries(palette).then(function() {
+                input.value = '';
+                updateResults(input, list);
+                palette.showModal();
+                input.focus();
+            });
+        });
+        input.addEventListener('input', function() {
+            updateResults(input, list);
+        });
+        input.addEventListener('keydown', function(event) {
+            if (!results.length) {
+                return;
+            }
+            if (event.key === 'ArrowDown') {
+                selectResult(input, list, (selectedIndex + 1) % results.length);
+            } else if (event.key === 'ArrowUp') {
+                selectResult(input, list, (selectedIndex - 1 + results.length) % results.length);
+            } else if (event.key === 'Enter') {
+                window.location.assign(results[selectedIndex].url);
+            } else {
+                return;
+            }
+            event.preventDefault();
+        });
+    }
+
+    if (document.readyState === 'loading') {
+        document.addEventListener('DOMContentLoaded', initPalette);
+    } else {
+        initPalette();
+    }
+}
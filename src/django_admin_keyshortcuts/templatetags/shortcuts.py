@@ -1,47 +1,78 @@
-import re
-
 from django import template
-from django.utils.html import format_html_join
-from django.utils.translation import gettext as _
+from django.contrib.admin.utils import quote
+from django.contrib.admin.views.main import PAGE_VAR
+from django.middleware.csrf import get_token
+from django.urls import reverse
+from django.utils.http import urlencode
+from django.utils.translation import get_language
+
+from django_admin_keyshortcuts import registry
+from django_admin_keyshortcuts.conf import get_setting
+from django_admin_keyshortcuts.deletion import TREE_CACHE_TIMEOUT
+from django_admin_keyshortcuts.deletion import get_tree_cache
+from django_admin_keyshortcuts.deletion import get_tree_cache_key
+from django_admin_keyshortcuts.deletion import render_branch
+from django_admin_keyshortcuts.dialog import get_dialog_cache
+from django_admin_keyshortcuts.dialog import get_dialog_cache_key
+from django_admin_keyshortcuts.dialog import get_dialog_cache_version
+from django_admin_keyshortcuts.kbd import format_kbd
+from django_admin_keyshortcuts.kbd import get_request_platform
+from django_admin_keyshortcuts.palette import get_admin_site
+from django_admin_keyshortcuts.palette import get_palette_version
+from django_admin_keyshortcuts.preferences import get_bindings_key
+from django_admin_keyshortcuts.preferences import get_preferences
+from django_admin_keyshortcuts.timing import timed
 
 register = template.Library()
 
 
-@register.simple_tag
-def get_shortcuts():
+@register.simple_tag(takes_context=True)
+@timed("get_shortcuts")
+def get_shortcuts(context):
     """
     Returns a dictionary of keyboard shortcuts for use in the help dialog
     and shortcut handling.
+
+    With ADMIN_KEYSHORTCUTS_PREFERENCES, the user's bindings are applied and
+    users who turned the shortcuts off get no shortcuts.
+    """
+    preferences = get_preferences(context.get("request"))
+    if preferences is None:
+        return registry.get_shortcuts()
+    if not preferences["enabled"]:
+        return registry.NO_SHORTCUTS
+    return registry.get_shortcuts(preferences["bindings"])
+
+
+@register.simple_tag(takes_context=True)
+def get_shortcuts_enabled(context):
+    """Returns whether the shortcuts scripts and markup are rendered, which
+    they aren't for users who turned the shortcuts off in their preferences.
+
+    {% get_shortcuts_enabled as shortcuts_enabled %}
+    """
+    preferences = get_preferences(context.get("request"))
+    return preferences is None or preferences["enabled"]
+
+
+@register.simple_tag(takes_context=True)
+def shortcuts_preferences_config(context):
+    """Returns the configuration of the shortcuts toggle in shortcuts.js,
+    or None if ADMIN_KEYSHORTCUTS_PREFERENCES is disabled.
+
+    {% shortcuts_preferences_config as preferences_config %}
     """
+    request = context["request"]
+    if get_preferences(request) is None:
+        return None
     return {
-        "global": {
-            "show_dialog": (_("Show this dialog"), "Shift+?"),
-            "go_to_index": (_("Go to the site index"), "g i"),
-        },
-        "changelist": {
-            "focus_prev_row": (_("Focus previous row"), "k"),
-            "focus_next_row": (_("Focus next row"), "j"),
-            "toggle_row_selection": (_("Toggle row selection"), "x"),
-            "focus_actions_dropdown": (_("Focus actions dropdown"), "a"),
-            "focus_search": (_("Focus search field"), "/"),
-            "toggle_sidebar": (_("Toggle sidebar"), "["),
-        },
-        "changeform": {
-            "save": (_("Save"), "Mod+s"),
-            "save_and_add_another": (_("Save and add another"), "Mod+Shift+S"),
-            "save_and_continue": (_("Save and continue editing"), "Mod+Alt+s"),
-            "delete": (_("Delete"), "Alt+d"),
-            "toggle_sidebar": (_("Toggle sidebar"), "["),
-        },
-        "delete_confirmation": {
-            "confirm_delete": (_("Confirm deletion"), "Alt+y"),
-            "cancel_delete": (_("Cancel deletion"), "Alt+n"),
-            "toggle_sidebar": (_("Toggle sidebar"), "["),
-        },
+        "url": reverse("admin_keyshortcuts:preferences_toggle"),
+        "csrfToken": get_token(request),
     }
 
 
 @register.simple_tag(takes_context=True)
+@timed("shortcut_format_kbd")
 def shortcut_format_kbd(context, keyshortcut):
     """Transforms keyshortcut string into HTML kbd elements
     with proper key labels.
@@ -51,29 +82,183 @@ def shortcut_format_kbd(context, keyshortcut):
 
     "g i" becomes "<kbd>g</kbd> <kbd>i</kbd>"
     """
+    return format_kbd(keyshortcut, get_request_platform(context["request"]))
+
+
+@register.simple_tag
+def get_shortcuts_setting(name):
+    """Returns the value of the ADMIN_KEYSHORTCUTS_<name> setting.
+
+    {% get_shortcuts_setting "DIALOG" as dialog_mode %}
+    """
+    return get_setting(name)
+
+
+@register.simple_tag(takes_context=True)
+def shortcuts_dialog_url(context, view_type):
+    """Returns the URL of the lazily loaded help dialog for the view type.
+
+    The language, platform and user bindings are part of the URL so that the
+    browser caches one copy of the dialog per language, platform, bindings
+    and view type. So is the dialog cache version, so that a dialog cached
+    before the shortcuts or templates changed isn't used.
+    """
+    request = context["request"]
+    query = {
+        "lang": get_language(),
+        "platform": get_request_platform(request),
+        "v": get_dialog_cache_version(),
+    }
+    bindings_key = get_bindings_key(get_preferences(request))
+    if bindings_key:
+        query["bindings"] = bindings_key
+    url = reverse("admin_keyshortcuts:dialog", args=[view_type])
+    return f"{url}?{urlencode(query)}"
+
+
+@register.simple_tag(takes_context=True)
+def shortcuts_latency_config(context, view_type):
+    """Returns the configuration of the latency measurements in shortcuts.js,
+    or None if ADMIN_KEYSHORTCUTS_LATENCY_SAMPLE_RATE is not set.
+
+    {% shortcuts_latency_config "changelist" as latency_config %}
+    """
+    sample_rate = get_setting("LATENCY_SAMPLE_RATE")
+    if not sample_rate:
+        return None
+    return {
+        "url": reverse("admin_keyshortcuts:latency"),
+        "sampleRate": sample_rate,
+        "view": view_type,
+        "csrfToken": get_token(context["request"]),
+    }
+
+
+@register.simple_tag(takes_context=True)
+def get_shortcuts_palette(context):
+    """Returns the URL and version of the command palette index of the
+    current admin site, or None if ADMIN_KEYSHORTCUTS_PALETTE is disabled.
+
+    {% get_shortcuts_palette as palette %}
+    """
+    if not get_setting("PALETTE"):
+        return None
+    request = context["request"]
+    site = get_admin_site(getattr(request, "current_app", None))
+    if site is None:
+        return None
+    version = get_palette_version(request, site)
+    query = {"lang": get_language(), "v": version}
+    url = reverse("admin_keyshortcuts:palette", args=[site.name])
+    return {"url": f"{url}?{urlencode(query)}", "version": version}
+
+
+@register.simple_tag(takes_context=True)
+def shortcuts_service_worker_config(context):
+    """Returns the URL and scope of the service worker registered by
+    shortcuts.js, or None if ADMIN_KEYSHORTCUTS_SERVICE_WORKER is disabled.
+
+    {% shortcuts_service_worker_config as service_worker_config %}
+    """
+    if not get_setting("SERVICE_WORKER"):
+        return None
+    current_app = getattr(context["request"], "current_app", None)
+    return {
+        "url": reverse("admin_keyshortcuts:service_worker"),
+        "scope": reverse("admin:index", current_app=current_app),
+    }
+
+
+@register.simple_tag(takes_context=True)
+def shortcuts_deleted_objects(context, deleted_objects):
+    """Renders the top level of the deleted objects tree of the delete
+    confirmation page, with the related objects of the items fetched when
+    they are expanded. The tree is cached for the deleted_objects view.
 
-    def get_modifier_key_labels_from_request(request):
-        """Get modifier key labels based on the user's OS."""
-        user_agent = request.headers.get("User-Agent", "")
-        is_mac = re.search(r"Mac|iPod|iPhone|iPad", user_agent)
-
-        labels = {
-            "Alt": "⌥" if is_mac else "Alt",
-            "Mod": "⌘" if is_mac else "Ctrl",
-            "Ctrl": "^" if is_mac else "Ctrl",
-        }
-        return labels
-
-    def render_combo(combo, modifier_labels):
-        """Split combo string by "+", map modifier labels and wrap each key in <kbd>."""
-        keys = [modifier_labels.get(key, key) for key in combo.split("+")]
-        return format_html_join("+", "<kbd>{}</kbd>", [(key,) for key in keys])
-
-    modifier_labels = get_modifier_key_labels_from_request(context["request"])
-
-    # Split the shortcut sequence by " ", then render each shortcut combo
-    return format_html_join(
-        " ",
-        "{}",
-        [(render_combo(combo, modifier_labels),) for combo in keyshortcut.split()],
+    {% shortcuts_deleted_objects deleted_objects %}
+    """
+    request = context["request"]
+    opts = context["opts"]
+    url = reverse(
+        "admin_keyshortcuts:deleted_objects",
+        args=[
+            request.current_app,
+            opts.app_label,
+            opts.model_name,
+            quote(context["object"].pk),
+        ],
+    )
+    get_tree_cache().set(
+        get_tree_cache_key(request.user, url), deleted_objects, TREE_CACHE_TIMEOUT
     )
+    return render_branch(deleted_objects, url)
+
+
+@register.simple_tag
+def shortcuts_pagination_urls(cl):
+    """Returns the URLs of the first, previous, next and last pages of the
+    changelist, keeping its filters, search and ordering.
+
+    Pages before the first or after the last page are left out, and no URLs
+    are returned when all results are on one page or there is no changelist.
+
+    {% shortcuts_pagination_urls cl as pagination_urls %}
+    """
+    if not cl or not cl.multi_page or (cl.show_all and cl.can_show_all):
+        return {}
+    urls = {}
+    if cl.page_num > 1:
+        urls["first"] = cl.get_query_string({PAGE_VAR: 1})
+        urls["previous"] = cl.get_query_string({PAGE_VAR: cl.page_num - 1})
+    if cl.page_num < cl.paginator.num_pages:
+        urls["next"] = cl.get_query_string({PAGE_VAR: cl.page_num + 1})
+        urls["last"] = cl.get_query_string({PAGE_VAR: cl.paginator.num_pages})
+    return urls
+
+
+class ShortcutsDialogCacheNode(template.Node):
+    def __init__(self, nodelist, view_type):
+        self.nodelist = nodelist
+        self.view_type = view_type
+
+    @timed("dialog")
+    def render(self, context):
+        cache = get_dialog_cache()
+        if cache is None:
+            return self.nodelist.render(context)
+        request = context["request"]
+        # The page template and the included shortcuts template, which differ
+        # on pages with per-app or per-model overrides.
+        templates = [context.template, context.render_context.template]
+        key = get_dialog_cache_key(
+            self.view_type.resolve(context),
+            get_language(),
+            get_request_platform(request),
+            get_bindings_key(get_preferences(request)),
+            [template.origin.name for template in templates if template],
+        )
+        version = get_dialog_cache_version()
+        fragment = cache.get(key, version=version)
+        if fragment is None:
+            fragment = self.nodelist.render(context)
+            cache.set(key, fragment, version=version)
+        return fragment
+
+
+@register.tag
+def shortcuts_dialog_cache(parser, token):
+    """Caches the rendered help dialog in the ADMIN_KEYSHORTCUTS_CACHE cache.
+
+    The fragment is cached per view type, language, platform, user bindings
+    and page and shortcuts templates::
+
+        {% shortcuts_dialog_cache "changelist" %}
+            .. dialog ..
+        {% endshortcuts_dialog_cache %}
+    """
+    bits = token.split_contents()
+    if len(bits) != 2:
+        raise template.TemplateSyntaxError(f"{bits[0]!r} tag requires one argument.")
+    nodelist = parser.parse(("endshortcuts_dialog_cache",))
+    parser.delete_first_token()
+    return ShortcutsDialogCacheNode(nodelist, parser.compile_filter(bits[1]))
@@ -0,0 +1,51 @@
+"""
+Per-request call counts and cumulative time of the shortcut template tags.
+
+Timings are only collected within collect_timings(), which
+ServerTimingMiddleware wraps around each request. Otherwise, timed() costs
+a context variable lookup.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+# Timings of the current request, {name: (call count, seconds)}.
+_timings = ContextVar("admin_keyshortcuts_timings", default=None)
+
+
+def timed(name):
+    """
+    Decorator adding the call count and duration of the function to the
+    timings under the given name.
+    """
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            timings = _timings.get()
+            if timings is None:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                duration = time.perf_counter() - start
+                count, total = timings.get(name, (0, 0.0))
+                timings[name] = (count + 1, total + duration)
+
+        return wrapper
+
+    return decorator
+
+
+@contextmanager
+def collect_timings():
+    """Collect the timings of the enclosed block into the yielded dict."""
+    timings = {}
+    token = _timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _timings.reset(token)
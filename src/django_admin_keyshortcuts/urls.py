@@ -0,0 +1,21 @@
+from django.urls import path
+
+from django_admin_keyshortcuts import views
+
+app_name = "admin_keyshortcuts"
+
+urlpatterns = [
+    path("dialog/<str:view_type>/", views.shortcuts_dialog, name="dialog"),
+    path("latency/", views.record_latency, name="latency"),
+    path("palette/<str:site_name>/", views.palette_index, name="palette"),
+    path("latency/report/", views.latency_report, name="latency_report"),
+    path("preferences/", views.shortcut_preferences, name="preferences"),
+    path("preferences/toggle/", views.toggle_shortcuts, name="preferences_toggle"),
+    path("sw.js", views.service_worker, name="service_worker"),
+    path(
+        "deleted-objects/<str:site_name>/<str:app_label>/<str:model_name>/"
+        "<str:object_id>/",
+        views.deleted_objects,
+        name="deleted_objects",
+    ),
+]
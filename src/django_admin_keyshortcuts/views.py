@@ -0,0 +1,341 @@
+import hashlib
+import json
+from functools import wraps
+
+from django.apps import apps
+from django.contrib import messages
+from django.contrib.admin.utils import unquote
+from django.core.exceptions import PermissionDenied
+from django.http import Http404
+from django.http import HttpResponse
+from django.http import HttpResponseBadRequest
+from django.http import JsonResponse
+from django.shortcuts import redirect
+from django.shortcuts import render
+from django.urls import get_script_prefix
+from django.urls import reverse
+from django.utils import translation
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import etag
+from django.views.decorators.http import require_GET
+from django.views.decorators.http import require_http_methods
+from django.views.decorators.http import require_POST
+
+from django_admin_keyshortcuts import latency
+from django_admin_keyshortcuts import registry
+from django_admin_keyshortcuts.conf import get_setting
+from django_admin_keyshortcuts.deletion import TREE_CACHE_TIMEOUT
+from django_admin_keyshortcuts.deletion import get_branch
+from django_admin_keyshortcuts.deletion import get_tree_cache
+from django_admin_keyshortcuts.deletion import get_tree_cache_key
+from django_admin_keyshortcuts.deletion import render_branch
+from django_admin_keyshortcuts.dialog import DIALOG_TEMPLATES
+from django_admin_keyshortcuts.dialog import get_dialog_cache_version
+from django_admin_keyshortcuts.forms import ShortcutPreferencesForm
+from django_admin_keyshortcuts.kbd import MODIFIER_KEY_LABELS
+from django_admin_keyshortcuts.kbd import get_request_platform
+from django_admin_keyshortcuts.palette import get_admin_site
+from django_admin_keyshortcuts.palette import get_palette_entries
+from django_admin_keyshortcuts.palette import get_palette_version
+from django_admin_keyshortcuts.preferences import get_bindings_key
+from django_admin_keyshortcuts.preferences import get_preferences
+from django_admin_keyshortcuts.preferences import save_preferences
+from django_admin_keyshortcuts.serviceworker import CACHE_PREFIX
+from django_admin_keyshortcuts.serviceworker import get_cache_name
+from django_admin_keyshortcuts.serviceworker import get_precache_urls
+
+
+def staff_required(view_func):
+    """Deny access to users who can't access the admin."""
+
+    @wraps(view_func)
+    def _view_wrapper(request, *args, **kwargs):
+        if not (request.user.is_active and request.user.is_staff):
+            raise PermissionDenied
+        return view_func(request, *args, **kwargs)
+
+    return _view_wrapper
+
+
+def get_dialog_language(request):
+    language = request.GET.get("lang")
+    if language and translation.check_for_language(language):
+        return language
+    return translation.get_language()
+
+
+def get_dialog_platform(request):
+    platform = request.GET.get("platform")
+    if platform in MODIFIER_KEY_LABELS:
+        return platform
+    return get_request_platform(request)
+
+
+def dialog_etag(request, view_type):
+    key = ":".join(
+        [
+            get_dialog_cache_version(),
+            get_dialog_language(request),
+            get_dialog_platform(request),
+            get_bindings_key(get_preferences(request)),
+            view_type,
+        ]
+    )
+    return hashlib.md5(key.encode(), usedforsecurity=False).hexdigest()
+
+
+@require_GET
+@staff_required
+@cache_control(private=True, max_age=60 * 60 * 24)
+@etag(dialog_etag)
+def shortcuts_dialog(request, view_type):
+    """
+    Render the help dialog for the given view type, for pages using the
+    "lazy" ADMIN_KEYSHORTCUTS_DIALOG mode.
+    """
+    try:
+        template_name = DIALOG_TEMPLATES[view_type]
+    except KeyError:
+        raise Http404
+    request._keyshortcuts_platform = get_dialog_platform(request)
+    with translation.override(get_dialog_language(request)):
+        return render(
+            request,
+            template_name,
+            {"shortcuts_dialog_only": True, "shortcuts_view": view_type},
+        )
+
+
+def parse_latency_samples(data):
+    """
+    Return the (hotkey, duration) pairs of the JSON encoded samples sent by
+    shortcuts.js, or None if they are invalid.
+    """
+    try:
+        samples = json.loads(data)
+    except ValueError:
+        return None
+    if not isinstance(samples, list) or len(samples) > latency.MAX_SAMPLES_PER_BATCH:
+        return None
+    pairs = []
+    for sample in samples:
+        if not isinstance(sample, dict):
+            return None
+        hotkey = sample.get("hotkey")
+        duration = sample.get("duration")
+        if (
+            not isinstance(hotkey, str)
+            or not 0 < len(hotkey) <= latency.MAX_HOTKEY_LENGTH
+        ):
+            return None
+        if isinstance(duration, bool) or not isinstance(duration, (int, float)):
+            return None
+        if not 0 <= duration <= latency.MAX_DURATION:
+            return None
+        pairs.append((hotkey, duration))
+    return pairs
+
+
+def latency_enabled(view_func):
+    """Return 404 unless ADMIN_KEYSHORTCUTS_LATENCY_SAMPLE_RATE is set."""
+
+    @wraps(view_func)
+    def _view_wrapper(request, *args, **kwargs):
+        if not get_setting("LATENCY_SAMPLE_RATE"):
+            raise Http404
+        return view_func(request, *args, **kwargs)
+
+    return _view_wrapper
+
+
+@require_POST
+@latency_enabled
+@staff_required
+def record_latency(request):
+    """Record a batch of keypress-to-action latency samples."""
+    view_type = request.POST.get("view")
+    samples = parse_latency_samples(request.POST.get("samples", ""))
+    if view_type not in DIALOG_TEMPLATES or samples is None:
+        return HttpResponseBadRequest()
+    preferences = get_preferences(request)
+    shortcuts = registry.get_shortcuts(preferences and preferences["bindings"])
+    latency.record_samples(view_type, samples, shortcuts)
+    return HttpResponse(status=204)
+
+
+@require_GET
+@latency_enabled
+@staff_required
+def latency_report(request):
+    """Show the keypress-to-action latency histograms."""
+    return render(
+        request,
+        "admin/shortcuts_latency.html",
+        {
+            "title": translation.gettext("Keyboard shortcut latency"),
+            "buckets": latency.LATENCY_BUCKETS,
+            "slowest_bound": latency.LATENCY_BUCKETS[-2],
+            "histograms": latency.get_histograms(),
+        },
+    )
+
+
+@require_GET
+@staff_required
+@cache_control(private=True, max_age=60 * 60 * 24)
+def palette_index(request, site_name):
+    """
+    Return the command palette entries of the admin site for the user.
+
+    The URL has the index version, so the response can be cached.
+    """
+    site = get_admin_site(site_name)
+    if site is None:
+        raise Http404
+    if not site.has_permission(request):
+        raise PermissionDenied
+    with translation.override(get_dialog_language(request)):
+        version = get_palette_version(request, site)
+        entries = get_palette_entries(request, site, version)
+    return JsonResponse({"version": version, "entries": entries})
+
+
+def preferences_enabled(view_func):
+    """Return 404 unless ADMIN_KEYSHORTCUTS_PREFERENCES is set."""
+
+    @wraps(view_func)
+    def _view_wrapper(request, *args, **kwargs):
+        if not get_setting("PREFERENCES"):
+            raise Http404
+        return view_func(request, *args, **kwargs)
+
+    return _view_wrapper
+
+
+@require_http_methods(["GET", "POST"])
+@preferences_enabled
+@staff_required
+def shortcut_preferences(request):
+    """Edit the user's shortcut preferences."""
+    preferences = get_preferences(request)
+    if request.method == "POST":
+        form = ShortcutPreferencesForm(request.POST, preferences=preferences)
+        if form.is_valid():
+            save_preferences(
+                request,
+                enabled=form.cleaned_data["enabled"],
+                bindings=form.cleaned_data["bindings"],
+            )
+            messages.success(
+                request,
+                translation.gettext("Your keyboard shortcut preferences were saved."),
+            )
+            return redirect("admin_keyshortcuts:preferences")
+    else:
+        form = ShortcutPreferencesForm(preferences=preferences)
+    return render(
+        request,
+        "admin/shortcuts_preferences.html",
+        {"title": translation.gettext("Keyboard shortcuts"), "form": form},
+    )
+
+
+@require_POST
+@preferences_enabled
+@staff_required
+def toggle_shortcuts(request):
+    """Turn the user's shortcuts on or off, from the help dialog toggle."""
+    save_preferences(request, enabled=request.POST.get("enabled") == "true")
+    return HttpResponse(status=204)
+
+
+@require_GET
+@cache_control(no_cache=True)
+def service_worker(request):
+    """
+    Serve the service worker caching the shortcut static files and the
+    lazily loaded help dialogs.
+
+    Without ADMIN_KEYSHORTCUTS_SERVICE_WORKER, the served worker deletes its
+    caches and unregisters itself, so browsers that registered it before the
+    setting was disabled stop using it.
+    """
+    enabled = get_setting("SERVICE_WORKER")
+    urls = get_precache_urls() if enabled else []
+    config = {
+        "enabled": enabled,
+        "cachePrefix": CACHE_PREFIX,
+        "cacheName": get_cache_name(urls) if enabled else "",
+        "precacheUrls": urls,
+        "dialogPaths": [
+            reverse("admin_keyshortcuts:dialog", args=[view_type])
+            for view_type in DIALOG_TEMPLATES
+        ],
+    }
+    response = render(
+        request,
+        "admin/shortcuts_service_worker.js.tmpl",
+        {"config": json.dumps(config)},
+        content_type="text/javascript",
+    )
+    # The worker is registered with the admin site as scope, outside of the
+    # path of its URL.
+    response["Service-Worker-Allowed"] = get_script_prefix()
+    return response
+
+
+def lazy_deleted_objects_enabled(view_func):
+    """Return 404 unless ADMIN_KEYSHORTCUTS_DELETED_OBJECTS is "lazy"."""
+
+    @wraps(view_func)
+    def _view_wrapper(request, *args, **kwargs):
+        if get_setting("DELETED_OBJECTS") != "lazy":
+            raise Http404
+        return view_func(request, *args, **kwargs)
+
+    return _view_wrapper
+
+
+@require_GET
+@lazy_deleted_objects_enabled
+@staff_required
+def deleted_objects(request, site_name, app_label, model_name, object_id):
+    """
+    Render the related objects of an item of the deleted objects tree, for
+    delete confirmation pages using the "lazy" ADMIN_KEYSHORTCUTS_DELETED_OBJECTS
+    mode. The tree cached by the delete confirmation page is used, or else
+    collected again. Like on that page, it isn't shown when deleting the
+    object needs permissions the user lacks or protected objects.
+    """
+    site = get_admin_site(site_name)
+    if site is None:
+        raise Http404
+    if not site.has_permission(request):
+        raise PermissionDenied
+    try:
+        model_admin = site._registry[apps.get_model(app_label, model_name)]
+    except (LookupError, KeyError):
+        raise Http404
+    obj = model_admin.get_object(request, unquote(object_id))
+    if obj is None:
+        raise Http404
+    if not model_admin.has_delete_permission(request, obj):
+        raise PermissionDenied
+    try:
+        path = [int(position) for position in request.GET.get("path", "").split(".")]
+    except ValueError:
+        return HttpResponseBadRequest()
+    cache = get_tree_cache()
+    key = get_tree_cache_key(request.user, request.path)
+    tree = cache.get(key)
+    if tree is None:
+        tree, _, perms_needed, protected = model_admin.get_deleted_objects(
+            [obj], request
+        )
+        if perms_needed or protected:
+            raise PermissionDenied
+        cache.set(key, tree, TREE_CACHE_TIMEOUT)
+    branch = get_branch(tree, path)
+    if branch is None:
+        raise Http404
+    return HttpResponse(render_branch(branch, request.path, path))
@@ -1,5 +1,7 @@
 from django.contrib import admin
 
+from .models import Book
+from .models import Chapter
 from .models import Language
 from .models import Paper
 
@@ -10,6 +12,15 @@ class LanguageAdmin(admin.ModelAdmin):
     search_fields = ["iso"]
 
 
+class ChapterInline(admin.TabularInline):
+    model = Chapter
+
+
+class BookAdmin(admin.ModelAdmin):
+    inlines = [ChapterInline]
+
+
 site = admin.AdminSite(name="test_admin_keyboard_shortcuts")
 site.register(Language, LanguageAdmin)
 site.register(Paper)
+site.register(Book, BookAdmin)
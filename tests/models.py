@@ -17,3 +17,13 @@ class Language(models.Model):
 class Paper(models.Model):
     title = models.CharField(max_length=30)
     author = models.CharField(max_length=30, blank=True, null=True)
+
+
+class Book(models.Model):
+    title = models.CharField(max_length=50)
+
+
+class Chapter(models.Model):
+    book = models.ForeignKey(Book, models.CASCADE)
+    title = models.CharField(max_length=50)
+    pages = models.PositiveIntegerField(default=1)
@@ -1,11 +1,44 @@
+import json
 import platform
 from contextlib import contextmanager
+from unittest import mock
 
 from django.contrib.admin.tests import AdminSeleniumTestCase
+from django.contrib.auth.models import Permission
 from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.http import HttpResponseServerError
+from django.test import RequestFactory
+from django.test import SimpleTestCase
 from django.test import TestCase
+from django.test import modify_settings
+from django.test import override_settings
 from django.urls import reverse
-
+from django.utils import translation
+
+from django_admin_keyshortcuts import latency
+from django_admin_keyshortcuts import palette
+from django_admin_keyshortcuts import preferences
+from django_admin_keyshortcuts import registry
+from django_admin_keyshortcuts.bindings import InvalidHotkey
+from django_admin_keyshortcuts.bindings import get_errors
+from django_admin_keyshortcuts.bindings import normalize_hotkey
+from django_admin_keyshortcuts.checks import check_async_save_middleware
+from django_admin_keyshortcuts.dialog import get_dialog_cache_version
+from django_admin_keyshortcuts.kbd import MAC
+from django_admin_keyshortcuts.kbd import NEUTRAL
+from django_admin_keyshortcuts.kbd import OTHER
+from django_admin_keyshortcuts.kbd import format_kbd
+from django_admin_keyshortcuts.kbd import get_request_platform
+from django_admin_keyshortcuts.models import ShortcutPreference
+from django_admin_keyshortcuts.signals import shortcut_timings
+from django_admin_keyshortcuts.templatetags.shortcuts import shortcuts_pagination_urls
+from django_admin_keyshortcuts.timing import collect_timings
+from django_admin_keyshortcuts.timing import timed
+
+from .admin import BookAdmin
+from .admin import LanguageAdmin
+from .models import Book
 from .models import Language
 from .models import Paper
 
@@ -21,8 +54,16 @@ class ChangeListShortcuts:
     FOCUS_PREV_ROW = "k"
     FOCUS_NEXT_ROW = "j"
     TOGGLE_ROW_SELECTION = "x"
+    EXTEND_SELECTION_DOWN = "Shift+J"
+    EXTEND_SELECTION_UP = "Shift+K"
+    TOGGLE_ALL_ROWS = "Shift+A"
+    INVERT_SELECTION = "Shift+X"
     FOCUS_ACTIONS_DROPDOWN = "a"
     FOCUS_SEARCH = "/"
+    NEXT_PAGE = "n"
+    PREVIOUS_PAGE = "p"
+    FIRST_PAGE = "Shift+P"
+    LAST_PAGE = "Shift+N"
 
 
 class ChangeFormShortcuts:
@@ -30,6 +71,12 @@ class ChangeFormShortcuts:
     SAVE_AND_ADD_ANOTHER = "Mod+Shift+S"
     SAVE_AND_CONTINUE = "Mod+Alt+s"
     DELETE = "Alt+d"
+    NEXT_INLINE_ROW = "Alt+j"
+    PREVIOUS_INLINE_ROW = "Alt+k"
+    NEXT_INLINE_GROUP = "Alt+Shift+J"
+    PREVIOUS_INLINE_GROUP = "Alt+Shift+K"
+    ADD_INLINE_ROW = "Alt+a"
+    GO_TO_FIELD = "Alt+f"
 
 
 class DeleteConfirmationShortcuts:
@@ -37,7 +84,9 @@ class DeleteConfirmationShortcuts:
     CANCEL_DELETE = "Alt+n"
 
 
-class AdminKeyboardShorcutsTests(TestCase):
+class SuperuserTestCase(TestCase):
+    """Test case with the test client logged in as a superuser."""
+
     @classmethod
     def setUpTestData(cls):
         cls.superuser = User.objects.create_superuser(
@@ -49,6 +98,8 @@ class AdminKeyboardShorcutsTests(TestCase):
     def setUp(self):
         self.client.force_login(self.superuser)
 
+
+class AdminKeyboardShorcutsTests(SuperuserTestCase):
     def test_shortcuts_dialog_on_index(self):
         response = self.client.get(reverse("test_admin_keyboard_shortcuts:index"))
         self.assertContains(
@@ -60,6 +111,104 @@ class AdminKeyboardShorcutsTests(TestCase):
         )
         self.assertContains(response, '<input type="checkbox" id="toggle-shortcuts">')
 
+    def test_shortcuts_scripts(self):
+        response = self.client.get(
+            reverse("test_admin_keyboard_shortcuts:tests_language_changelist")
+        )
+        self.assertContains(
+            response,
+            '<link rel="modulepreload" '
+            'href="/static/admin/js/vendor/hotkey/hotkey.js">',
+        )
+        self.assertContains(
+            response,
+            '<script type="module" src="/static/admin/js/shortcuts.js"></script>',
+        )
+        self.assertContains(
+            response,
+            '<script type="module" src="/static/admin/js/shortcuts_changelist.js">'
+            "</script>",
+        )
+        self.assertNotContains(response, "shortcuts.bundle.js")
+
+    @override_settings(ADMIN_KEYSHORTCUTS_BUNDLE=True)
+    def test_shortcuts_bundle(self):
+        response = self.client.get(
+            reverse("test_admin_keyboard_shortcuts:tests_language_changelist")
+        )
+        self.assertContains(
+            response,
+            '<script type="module" src="/static/admin/js/shortcuts.bundle.js">'
+            "</script>",
+        )
+        self.assertNotContains(response, "admin/js/shortcuts.js")
+        self.assertNotContains(response, "admin/js/shortcuts_changelist.js")
+        self.assertNotContains(response, "modulepreload")
+
+    @mock.patch.object(LanguageAdmin, "list_per_page", 1)
+    def test_pagination_links(self):
+        for i in range(4):
+            Language.objects.create(iso=f"l{i}", name=f"Language {i}")
+        url = reverse("test_admin_keyboard_shortcuts:tests_language_changelist")
+        response = self.client.get(url, {"q": "l", "o": "1", "p": "2"})
+        for link_id, page, hotkey in [
+            ("first", 1, ChangeListShortcuts.FIRST_PAGE),
+            ("previous", 1, ChangeListShortcuts.PREVIOUS_PAGE),
+            ("next", 3, ChangeListShortcuts.NEXT_PAGE),
+            ("last", 4, ChangeListShortcuts.LAST_PAGE),
+        ]:
+            self.assertContains(
+                response,
+                f'<a id="keyshortcut-{link_id}-page-link" '
+                f'href="?o=1&amp;p={page}&amp;q=l" data-hotkey="{hotkey}" hidden></a>',
+                html=True,
+            )
+
+        response = self.client.get(url, {"p": "4"})
+        self.assertContains(response, 'id="keyshortcut-previous-page-link"')
+        self.assertNotContains(response, 'id="keyshortcut-next-page-link"')
+        self.assertNotContains(response, 'id="keyshortcut-last-page-link"')
+
+        response = self.client.get(url, {"q": "l0"})
+        self.assertNotContains(response, "-page-link")
+        self.assertEqual(shortcuts_pagination_urls(""), {})
+
+    def test_inline_navigation_buttons(self):
+        book = Book.objects.create(title="b1")
+        response = self.client.get(
+            reverse("test_admin_keyboard_shortcuts:tests_book_change", args=(book.pk,))
+        )
+        self.assertContains(
+            response,
+            '<button id="keyshortcut-next-inline-row-btn" '
+            f'data-hotkey="{ChangeFormShortcuts.NEXT_INLINE_ROW}" hidden></button>',
+            html=True,
+        )
+        self.assertContains(
+            response,
+            '<button id="keyshortcut-add-inline-row-btn" '
+            f'data-hotkey="{ChangeFormShortcuts.ADD_INLINE_ROW}" hidden></button>',
+            html=True,
+        )
+        self.assertContains(
+            response,
+            '<button id="keyshortcut-go-to-field-btn" '
+            f'data-hotkey="{ChangeFormShortcuts.GO_TO_FIELD}" hidden></button>',
+            html=True,
+        )
+        self.assertContains(response, 'id="shortcuts-field-jump"')
+        self.assertContains(
+            response,
+            '<script type="module" src="/static/admin/js/shortcuts_changeform.js">'
+            "</script>",
+        )
+        # Forms without inlines only get the field jump.
+        response = self.client.get(
+            reverse("test_admin_keyboard_shortcuts:tests_paper_add")
+        )
+        self.assertNotContains(response, "keyshortcut-next-inline-row-btn")
+        self.assertContains(response, "keyshortcut-go-to-field-btn")
+
     def test_shortcuts_dialog_not_on_login(self):
         self.client.logout()
         response = self.client.get(reverse("test_admin_keyboard_shortcuts:login"))
@@ -98,6 +247,996 @@ class AdminKeyboardShorcutsTests(TestCase):
         self.assertContains(response, "<kbd>⌘</kbd>+<kbd>s</kbd>")
 
 
+@override_settings(ADMIN_KEYSHORTCUTS_DIALOG="lazy")
+class LazyShortcutsDialogTests(SuperuserTestCase):
+    def test_page_ships_empty_dialog(self):
+        response = self.client.get(
+            reverse("test_admin_keyboard_shortcuts:tests_language_changelist")
+        )
+        self.assertContains(
+            response,
+            f'<button id="open-shortcuts" data-hotkey="{GlobalShortcuts.SHOW_DIALOG}">',
+        )
+        self.assertContains(
+            response,
+            '<dialog class="keyboard-shortcuts" id="shortcuts-dialog" '
+            'data-src="/keyshortcuts/dialog/changelist/?lang=en-us&amp;platform=other'
+            f'&amp;v={get_dialog_cache_version()}">'
+            "</dialog>",
+            html=True,
+        )
+        self.assertNotContains(response, "Show this dialog")
+
+    def test_dialog_view(self):
+        response = self.client.get(
+            reverse("admin_keyshortcuts:dialog", args=["changelist"]),
+            {"lang": "en-us", "platform": "mac"},
+        )
+        self.assertContains(
+            response, '<dialog class="keyboard-shortcuts" id="shortcuts-dialog">'
+        )
+        self.assertContains(response, "Show this dialog")
+        self.assertContains(response, "Focus next row")
+        self.assertNotContains(response, 'id="open-shortcuts"')
+        self.assertIn("private", response["Cache-Control"])
+        self.assertIn("max-age=86400", response["Cache-Control"])
+
+        response = self.client.get(
+            reverse("admin_keyshortcuts:dialog", args=["changelist"]),
+            {"lang": "en-us", "platform": "mac"},
+            headers={"if-none-match": response["ETag"]},
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def test_dialog_view_etag_per_platform(self):
+        url = reverse("admin_keyshortcuts:dialog", args=["changeform"])
+        mac_response = self.client.get(url, {"platform": "mac"})
+        self.assertContains(mac_response, "<kbd>⌘</kbd>+<kbd>s</kbd>")
+        other_response = self.client.get(url, {"platform": "other"})
+        self.assertContains(other_response, "<kbd>Ctrl</kbd>+<kbd>s</kbd>")
+        self.assertNotEqual(mac_response["ETag"], other_response["ETag"])
+
+    def test_dialog_view_etag_per_version(self):
+        url = reverse("admin_keyshortcuts:dialog", args=["changelist"])
+        etag = self.client.get(url)["ETag"]
+        with mock.patch(
+            "django_admin_keyshortcuts.views.get_dialog_cache_version",
+            return_value="changed",
+        ):
+            response = self.client.get(url, headers={"if-none-match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_dialog_view_unknown_view_type(self):
+        response = self.client.get(
+            reverse("admin_keyshortcuts:dialog", args=["unknown"])
+        )
+        self.assertEqual(response.status_code, 404)
+
+    def test_dialog_view_requires_staff(self):
+        self.client.logout()
+        response = self.client.get(
+            reverse("admin_keyshortcuts:dialog", args=["global"])
+        )
+        self.assertEqual(response.status_code, 403)
+
+
+@override_settings(ADMIN_KEYSHORTCUTS_LATENCY_SAMPLE_RATE=0.5)
+class LatencyTests(SuperuserTestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def post_samples(self, samples, view="changelist"):
+        return self.client.post(
+            reverse("admin_keyshortcuts:latency"),
+            {"view": view, "samples": json.dumps(samples)},
+        )
+
+    def test_latency_config(self):
+        response = self.client.get(
+            reverse("test_admin_keyboard_shortcuts:tests_language_changelist")
+        )
+        config = json.loads(
+            response.content.decode()
+            .split('<script id="shortcuts-latency-config" type="application/json">')[1]
+            .split("</script>")[0]
+        )
+        self.assertEqual(config["url"], "/keyshortcuts/latency/")
+        self.assertEqual(config["sampleRate"], 0.5)
+        self.assertEqual(config["view"], "changelist")
+        self.assertTrue(config["csrfToken"])
+
+    @override_settings(ADMIN_KEYSHORTCUTS_LATENCY_SAMPLE_RATE=0)
+    def test_latency_disabled(self):
+        response = self.client.get(
+            reverse("test_admin_keyboard_shortcuts:tests_language_changelist")
+        )
+        self.assertNotContains(response, "shortcuts-latency-config")
+        self.assertEqual(self.post_samples([]).status_code, 404)
+        response = self.client.get(reverse("admin_keyshortcuts:latency_report"))
+        self.assertEqual(response.status_code, 404)
+
+    def test_record_latency(self):
+        samples = [
+            {"hotkey": "j", "duration": 3},
+            {"hotkey": "j", "duration": 12.5},
+            {"hotkey": "j", "duration": 900},
+            {"hotkey": "g i", "duration": 40},
+        ]
+        self.assertEqual(self.post_samples(samples).status_code, 204)
+        self.assertEqual(self.post_samples(samples[:1]).status_code, 204)
+        response = self.client.get(reverse("admin_keyshortcuts:latency_report"))
+        histograms = {
+            histogram["hotkey"]: histogram
+            for histogram in response.context["histograms"]
+        }
+        self.assertEqual(histograms["j"]["description"], "Focus next row")
+        self.assertEqual(histograms["j"]["counts"], [2, 0, 1, 0, 0, 0, 0, 0, 1])
+        self.assertEqual(histograms["j"]["p50"], 4)
+        self.assertIsNone(histograms["j"]["p95"])
+        self.assertEqual(histograms["g i"]["description"], "Go to the site index")
+        self.assertEqual(histograms["g i"]["total"], 1)
+        self.assertContains(response, "<td>Focus next row</td>", html=True)
+
+    def get_histograms(self):
+        response = self.client.get(reverse("admin_keyshortcuts:latency_report"))
+        return {
+            histogram["hotkey"]: histogram
+            for histogram in response.context["histograms"]
+        }
+
+    def test_record_localized_hotkeys(self):
+        samples = [
+            {"hotkey": "Control+s", "duration": 3},
+            {"hotkey": "Meta+s", "duration": 3},
+            {"hotkey": "Meta+Shift+S", "duration": 3},
+        ]
+        self.post_samples(samples, view="changeform")
+        histograms = self.get_histograms()
+        self.assertEqual(histograms["Mod+s"]["description"], "Save")
+        self.assertEqual(histograms["Mod+s"]["total"], 2)
+        self.assertEqual(
+            histograms["Mod+Shift+S"]["description"], "Save and add another"
+        )
+
+    @override_settings(
+        ADMIN_KEYSHORTCUTS={"changeform": {"save": "Mod+Enter"}},
+        ADMIN_KEYSHORTCUTS_PREFERENCES=True,
+    )
+    def test_record_rebound_hotkeys(self):
+        ShortcutPreference.objects.create(
+            user=self.superuser, bindings={"changeform": {"delete": "Alt+x"}}
+        )
+        samples = [
+            {"hotkey": "Control+Enter", "duration": 3},
+            {"hotkey": "Alt+x", "duration": 3},
+        ]
+        self.post_samples(samples, "changeform")
+        histograms = self.get_histograms()
+        self.assertEqual(histograms["Mod+Enter"]["description"], "Save")
+        self.assertEqual(histograms["Alt+x"]["description"], "Delete")
+
+    @mock.patch("django_admin_keyshortcuts.latency.MAX_HISTOGRAMS", 1)
+    def test_max_histograms(self):
+        self.post_samples([{"hotkey": "j", "duration": 3}])
+        self.post_samples([{"hotkey": "k", "duration": 3}])
+        self.post_samples([{"hotkey": "j", "duration": 3}])
+        response = self.client.get(reverse("admin_keyshortcuts:latency_report"))
+        histograms = response.context["histograms"]
+        self.assertEqual([histogram["hotkey"] for histogram in histograms], ["j"])
+        self.assertEqual(histograms[0]["total"], 2)
+
+    def test_evicted_counter(self):
+        cache.set("counter", 1)
+        incr = cache.incr
+
+        def evict_and_incr(key, delta):
+            # The counter is evicted between add() and incr().
+            cache.delete(key)
+            return incr(key, delta)
+
+        with mock.patch.object(cache, "incr", side_effect=evict_and_incr):
+            self.assertEqual(latency.increment(cache, "counter", 2), 2)
+        self.assertEqual(cache.get("counter"), 2)
+
+    def test_invalid_samples(self):
+        for view, samples in [
+            ("unknown", []),
+            ("changelist", {"hotkey": "j", "duration": 1}),
+            ("changelist", [{"hotkey": "", "duration": 1}]),
+            ("changelist", [{"hotkey": "j", "duration": "1"}]),
+            ("changelist", [{"hotkey": "j", "duration": -1}]),
+            ("changelist", [{"hotkey": "j", "duration": 1}] * 101),
+        ]:
+            with self.subTest(view=view, samples=samples):
+                self.assertEqual(self.post_samples(samples, view).status_code, 400)
+
+    def test_staff_required(self):
+        self.superuser.is_staff = False
+        self.superuser.save()
+        self.assertEqual(self.post_samples([]).status_code, 403)
+        response = self.client.get(reverse("admin_keyshortcuts:latency_report"))
+        self.assertEqual(response.status_code, 403)
+
+
+@modify_settings(
+    MIDDLEWARE={"append": "django_admin_keyshortcuts.middleware.ServerTimingMiddleware"}
+)
+class ServerTimingTests(SuperuserTestCase):
+    def test_server_timing_header(self):
+        received = []
+
+        def receiver(sender, request, timings, **kwargs):
+            received.append(timings)
+
+        shortcut_timings.connect(receiver)
+        self.addCleanup(shortcut_timings.disconnect, receiver)
+        response = self.client.get(reverse("test_admin_keyboard_shortcuts:index"))
+        metrics = {
+            metric.split(";")[0]: metric
+            for metric in response.headers["Server-Timing"].split(", ")
+        }
+        self.assertEqual(
+            set(metrics),
+            {
+                "keyshortcuts-get_shortcuts",
+                "keyshortcuts-shortcut_format_kbd",
+                "keyshortcuts-dialog",
+            },
+        )
+        self.assertRegex(
+            metrics["keyshortcuts-dialog"],
+            r'^keyshortcuts-dialog;dur=\d+\.\d{3};desc="dialog x1"$',
+        )
+        self.assertEqual(len(received), 1)
+        self.assertEqual(received[0]["dialog"][0], 1)
+        self.assertEqual(received[0]["shortcut_format_kbd"][0], 2)
+
+    def test_no_header_without_shortcuts(self):
+        self.client.logout()
+        response = self.client.get(reverse("test_admin_keyboard_shortcuts:login"))
+        self.assertNotIn("Server-Timing", response.headers)
+
+    def test_timed(self):
+        func = timed("dialog")(lambda: 42)
+        self.assertEqual(func(), 42)
+        with collect_timings() as timings:
+            self.assertEqual(func(), 42)
+            func()
+        self.assertEqual(timings["dialog"][0], 2)
+
+
+@override_settings(ADMIN_KEYSHORTCUTS_PALETTE=True)
+class CommandPaletteTests(SuperuserTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.staff = User.objects.create_user(
+            username="staff", password="secret", is_staff=True
+        )
+        cls.staff.user_permissions.add(Permission.objects.get(codename="view_language"))
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def get_palette(self):
+        response = self.client.get(reverse("test_admin_keyboard_shortcuts:index"))
+        src = response.content.decode().split('id="shortcuts-palette" data-src="')[1]
+        return src.split('"')[0].replace("&amp;", "&")
+
+    def test_palette_markup(self):
+        response = self.client.get(reverse("test_admin_keyboard_shortcuts:index"))
+        self.assertContains(
+            response,
+            '<button id="open-shortcuts-palette" data-hotkey="Mod+k" hidden></button>',
+            html=True,
+        )
+        self.assertContains(response, '<ul id="shortcuts-palette-results"')
+        self.assertContains(response, "/static/admin/js/shortcuts_palette.js")
+        self.assertRegex(
+            self.get_palette(),
+            r"^/keyshortcuts/palette/test_admin_keyboard_shortcuts/"
+            r"\?lang=en-us&v=[0-9a-f]{32}$",
+        )
+
+    @override_settings(ADMIN_KEYSHORTCUTS_PALETTE=False)
+    def test_palette_disabled(self):
+        response = self.client.get(reverse("test_admin_keyboard_shortcuts:index"))
+        self.assertNotContains(response, "shortcuts-palette")
+
+    def test_palette_index(self):
+        response = self.client.get(self.get_palette())
+        self.assertIn("private", response["Cache-Control"])
+        self.assertEqual(
+            response.json()["entries"],
+            [
+                {"label": "Tests", "url": "/test_admin_keyboard_shortcuts/tests/"},
+                {
+                    "label": "Tests › Books",
+                    "url": "/test_admin_keyboard_shortcuts/tests/book/",
+                },
+                {
+                    "label": "Tests › Books › Add",
+                    "url": "/test_admin_keyboard_shortcuts/tests/book/add/",
+                },
+                {
+                    "label": "Tests › Languages",
+                    "url": "/test_admin_keyboard_shortcuts/tests/language/",
+                },
+                {
+                    "label": "Tests › Languages › Add",
+                    "url": "/test_admin_keyboard_shortcuts/tests/language/add/",
+                },
+                {
+                    "label": "Tests › Papers",
+                    "url": "/test_admin_keyboard_shortcuts/tests/paper/",
+                },
+                {
+                    "label": "Tests › Papers › Add",
+                    "url": "/test_admin_keyboard_shortcuts/tests/paper/add/",
+                },
+            ],
+        )
+
+    def test_palette_index_per_permission_set(self):
+        superuser_palette = self.get_palette()
+        self.client.force_login(self.staff)
+        staff_palette = self.get_palette()
+        self.assertNotEqual(staff_palette, superuser_palette)
+        self.assertEqual(
+            [
+                entry["label"]
+                for entry in self.client.get(staff_palette).json()["entries"]
+            ],
+            ["Tests", "Tests › Languages"],
+        )
+
+    @override_settings(ADMIN_KEYSHORTCUTS_CACHE="default")
+    def test_palette_index_cached(self):
+        url = self.get_palette()
+        with mock.patch.object(
+            palette, "build_palette_entries", wraps=palette.build_palette_entries
+        ) as build_palette_entries:
+            first = self.client.get(url).json()
+            self.assertEqual(self.client.get(url).json(), first)
+        self.assertEqual(build_palette_entries.call_count, 1)
+
+    def test_unknown_site(self):
+        response = self.client.get(reverse("admin_keyshortcuts:palette", args=["x"]))
+        self.assertEqual(response.status_code, 404)
+
+
+@override_settings(ADMIN_KEYSHORTCUTS_ASYNC_SAVE=True)
+@modify_settings(
+    MIDDLEWARE={"append": "django_admin_keyshortcuts.middleware.AsyncSaveMiddleware"}
+)
+class AsyncSaveTests(SuperuserTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.paper = Paper.objects.create(title="p1")
+
+    def setUp(self):
+        super().setUp()
+        self.url = reverse(
+            "test_admin_keyboard_shortcuts:tests_paper_change", args=(self.paper.pk,)
+        )
+
+    def save(self, data):
+        return self.client.post(
+            self.url, data, headers={"X-Admin-Keyshortcuts-Save": "1"}
+        )
+
+    def test_change_form(self):
+        response = self.client.get(self.url)
+        self.assertContains(
+            response,
+            '<input type="submit" value="Save" class="default" name="_save" '
+            'data-hotkey="Mod+s" data-async-save>',
+            html=True,
+        )
+        self.assertContains(
+            response, 'name="_continue" data-hotkey="Mod+Alt+s" data-async-save'
+        )
+        self.assertNotContains(
+            response, 'name="_addanother" data-hotkey="Mod+Shift+S" data-async-save'
+        )
+        self.assertContains(response, "/static/admin/js/shortcuts_changeform.js")
+
+    def test_save_and_continue(self):
+        response = self.save({"title": "p2", "_continue": "1"})
+        result = response.json()
+        self.assertIs(result["saved"], True)
+        self.assertIs(result["stay"], True)
+        self.assertEqual(result["redirect"], self.url)
+        self.assertEqual(len(result["messages"]), 1)
+        self.assertEqual(result["messages"][0]["tags"], "success")
+        self.assertIn("was changed successfully", result["messages"][0]["message"])
+        self.paper.refresh_from_db()
+        self.assertEqual(self.paper.title, "p2")
+        # The messages were shown in place.
+        response = self.client.get(self.url)
+        self.assertNotContains(response, "was changed successfully")
+
+    def test_save(self):
+        result = self.save({"title": "p2", "_save": "1"}).json()
+        changelist_url = reverse("test_admin_keyboard_shortcuts:tests_paper_changelist")
+        self.assertEqual(
+            result, {"saved": True, "redirect": changelist_url, "stay": False}
+        )
+        response = self.client.get(changelist_url)
+        self.assertContains(response, "was changed successfully")
+
+    def test_validation_errors(self):
+        with mock.patch("django.template.response.TemplateResponse.render") as render:
+            result = self.save({"title": "", "_continue": "1"}).json()
+        render.assert_not_called()
+        self.assertEqual(
+            result,
+            {
+                "saved": False,
+                "message": "Please correct the error below.",
+                "errors": {"title": ["This field is required."]},
+                "non_field_errors": [],
+            },
+        )
+
+    def test_normal_submission(self):
+        response = self.client.post(self.url, {"title": "p2", "_continue": "1"})
+        self.assertRedirects(response, self.url)
+
+    def test_error_response_unchanged(self):
+        with mock.patch(
+            "django.contrib.admin.ModelAdmin.response_change",
+            return_value=HttpResponseServerError("Server error"),
+        ):
+            response = self.save({"title": "p2", "_continue": "1"})
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(response.content, b"Server error")
+
+    def test_permission_denied_unchanged(self):
+        staff = User.objects.create_user(
+            username="staff", password="secret", is_staff=True
+        )
+        staff.user_permissions.add(Permission.objects.get(codename="view_paper"))
+        self.client.force_login(staff)
+        response = self.save({"title": "p2", "_continue": "1"})
+        self.assertEqual(response.status_code, 403)
+        self.assertNotEqual(response["Content-Type"], "application/json")
+        self.paper.refresh_from_db()
+        self.assertEqual(self.paper.title, "p1")
+
+    def test_middleware_check(self):
+        self.assertEqual(check_async_save_middleware(None), [])
+        with override_settings(MIDDLEWARE=[]):
+            self.assertEqual(
+                [warning.id for warning in check_async_save_middleware(None)],
+                ["admin_keyshortcuts.W001"],
+            )
+
+
+@override_settings(ADMIN_KEYSHORTCUTS_PREFERENCES=True)
+class ShortcutPreferencesTests(SuperuserTestCase):
+    def setUp(self):
+        super().setUp()
+        self.add_url = reverse("test_admin_keyboard_shortcuts:tests_paper_add")
+
+    def set_preferences(self, **preferences):
+        ShortcutPreference.objects.create(user=self.superuser, **preferences)
+
+    @override_settings(ADMIN_KEYSHORTCUTS_PREFERENCES=False)
+    def test_preferences_disabled(self):
+        with mock.patch.object(preferences, "load_preferences") as load_preferences:
+            response = self.client.get(self.add_url)
+        load_preferences.assert_not_called()
+        self.assertNotContains(response, "shortcuts-preferences-config")
+        self.assertNotContains(response, reverse("admin_keyshortcuts:preferences"))
+        response = self.client.get(reverse("admin_keyshortcuts:preferences"))
+        self.assertEqual(response.status_code, 404)
+
+    def test_loaded_once_per_session(self):
+        self.set_preferences(bindings={"changeform": {"save": "Mod+Enter"}})
+        with mock.patch.object(
+            preferences, "load_preferences", wraps=preferences.load_preferences
+        ) as load_preferences:
+            self.client.get(self.add_url)
+            response = self.client.get(self.add_url)
+        load_preferences.assert_called_once()
+        self.assertContains(response, 'name="_save" data-hotkey="Mod+Enter"')
+        self.assertContains(response, "shortcuts-preferences-config")
+        self.assertContains(response, reverse("admin_keyshortcuts:preferences"))
+
+    def test_user_bindings(self):
+        self.set_preferences(
+            bindings={"changeform": {"save": "Mod+Enter", "delete": None}}
+        )
+        paper = Paper.objects.create(title="p1")
+        response = self.client.get(
+            reverse(
+                "test_admin_keyboard_shortcuts:tests_paper_change", args=(paper.pk,)
+            )
+        )
+        self.assertContains(response, 'name="_save" data-hotkey="Mod+Enter"')
+        self.assertContains(response, 'class="deletelink">')
+        self.assertContains(
+            response,
+            'name="_addanother" '
+            f'data-hotkey="{ChangeFormShortcuts.SAVE_AND_ADD_ANOTHER}"',
+        )
+
+    def test_shortcuts_turned_off(self):
+        self.set_preferences(enabled=False)
+        response = self.client.get(self.add_url)
+        self.assertNotContains(response, "data-hotkey")
+        self.assertNotContains(response, "shortcuts-dialog")
+        self.assertNotContains(response, "admin/js/shortcuts")
+        self.assertNotContains(response, "admin/css/shortcuts.css")
+        # The preferences page stays reachable to turn them on again.
+        self.assertContains(response, reverse("admin_keyshortcuts:preferences"))
+
+    def test_toggle(self):
+        url = reverse("admin_keyshortcuts:preferences_toggle")
+        self.client.get(self.add_url)
+        response = self.client.post(url, {"enabled": "false"})
+        self.assertEqual(response.status_code, 204)
+        self.assertIs(ShortcutPreference.objects.get().enabled, False)
+        self.assertNotContains(self.client.get(self.add_url), "data-hotkey")
+        self.client.post(url, {"enabled": "true"})
+        self.assertContains(self.client.get(self.add_url), "data-hotkey")
+
+    def test_preferences_form(self):
+        url = reverse("admin_keyshortcuts:preferences")
+        response = self.client.get(url)
+        self.assertContains(response, 'name="changeform.save"')
+        self.assertNotContains(response, 'name="global.open_palette"')
+        response = self.client.post(
+            url, {"enabled": "on", "changeform.save": "Shift+Mod+Enter"}
+        )
+        self.assertRedirects(response, url)
+        preference = ShortcutPreference.objects.get()
+        self.assertIs(preference.enabled, True)
+        self.assertEqual(
+            preference.bindings, {"changeform": {"save": "Mod+Shift+Enter"}}
+        )
+        # The session is updated.
+        self.assertContains(
+            self.client.get(self.add_url), 'name="_save" data-hotkey="Mod+Shift+Enter"'
+        )
+
+    def test_preferences_form_errors(self):
+        url = reverse("admin_keyshortcuts:preferences")
+        response = self.client.post(
+            url, {"enabled": "on", "changeform.save": "Hyper+s"}
+        )
+        self.assertFormError(
+            response.context["form"],
+            "changeform.save",
+            "'Hyper+s' has an unknown modifier 'Hyper', expected one of "
+            "Mod, Control, Alt, Meta, Shift.",
+        )
+        response = self.client.post(url, {"enabled": "on", "changeform.save": "Alt+d"})
+        self.assertFormError(
+            response.context["form"],
+            None,
+            "The changeform.delete and changeform.save shortcuts conflict.",
+        )
+        self.assertFalse(ShortcutPreference.objects.exists())
+
+    @override_settings(ADMIN_KEYSHORTCUTS={"changeform": ["save", "Mod+Enter"]})
+    def test_user_bindings_with_invalid_setting(self):
+        self.set_preferences(bindings={"changeform": {"delete": "Alt+x"}})
+        response = self.client.get(self.add_url)
+        self.assertContains(response, 'name="_save" data-hotkey="Mod+s"')
+
+    @override_settings(ADMIN_KEYSHORTCUTS_CACHE="default")
+    def test_dialog_cached_per_bindings(self):
+        cache.clear()
+        self.client.get(self.add_url)
+        other = User.objects.create_superuser(username="other", password="secret")
+        ShortcutPreference.objects.create(
+            user=other, bindings={"changeform": {"save": "Mod+Enter"}}
+        )
+        self.client.force_login(other)
+        response = self.client.get(self.add_url)
+        self.assertContains(response, "<kbd>Ctrl</kbd>+<kbd>Enter</kbd>")
+
+
+@override_settings(ADMIN_KEYSHORTCUTS_PLATFORM_NEUTRAL=True)
+class PlatformNeutralShortcutsTests(SuperuserTestCase):
+    def test_same_markup_for_all_platforms(self):
+        url = reverse("test_admin_keyboard_shortcuts:tests_paper_add")
+        for user_agent in [RequestPlatformTests.mac_user_agent, "Linux"]:
+            with self.subTest(user_agent=user_agent):
+                response = self.client.get(url, headers={"user-agent": user_agent})
+                self.assertContains(
+                    response, '<kbd data-key="Mod">Ctrl</kbd>+<kbd>s</kbd>', html=True
+                )
+                self.assertNotContains(response, "⌘")
+
+
+@override_settings(ADMIN_KEYSHORTCUTS_CACHE="default")
+class ShortcutsDialogCacheTests(SuperuserTestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def test_cached_dialog_skips_rendering(self):
+        url = reverse("test_admin_keyboard_shortcuts:tests_language_changelist")
+        response = self.client.get(url)
+        with mock.patch(
+            "django_admin_keyshortcuts.templatetags.shortcuts.format_kbd"
+        ) as format_kbd:
+            cached_response = self.client.get(url)
+        format_kbd.assert_not_called()
+        for text in ["Show this dialog", "Focus next row"]:
+            self.assertContains(response, text)
+            self.assertContains(cached_response, text)
+
+    def test_dialog_cached_per_view_type(self):
+        self.client.get(reverse("test_admin_keyboard_shortcuts:index"))
+        response = self.client.get(
+            reverse("test_admin_keyboard_shortcuts:tests_paper_add")
+        )
+        self.assertContains(response, "Save and continue editing")
+
+    def test_dialog_cached_per_template(self):
+        paper_url = reverse("test_admin_keyboard_shortcuts:tests_paper_add")
+        book_url = reverse("test_admin_keyboard_shortcuts:tests_book_add")
+        self.client.get(paper_url)
+        self.assertContains(self.client.get(book_url), "Book shortcuts")
+        self.assertNotContains(self.client.get(paper_url), "Book shortcuts")
+
+    def test_version_changes_with_package_version(self):
+        version = get_dialog_cache_version()
+        self.assertEqual(get_dialog_cache_version(), version)
+        get_dialog_cache_version.cache_clear()
+        with mock.patch("django_admin_keyshortcuts.dialog.__version__", "0.0.0"):
+            self.assertNotEqual(get_dialog_cache_version(), version)
+        get_dialog_cache_version.cache_clear()
+
+
+class ServiceWorkerTests(SuperuserTestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = reverse("admin_keyshortcuts:service_worker")
+
+    def get_worker_config(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response["Content-Type"], "text/javascript")
+        self.assertEqual(response["Service-Worker-Allowed"], "/")
+        self.assertIn("no-cache", response["Cache-Control"])
+        prefix = "const config = "
+        line = next(
+            line.strip()
+            for line in response.content.decode().splitlines()
+            if line.strip().startswith(prefix)
+        )
+        return json.loads(line[len(prefix) : -1])
+
+    def test_service_worker_disabled(self):
+        response = self.client.get(reverse("test_admin_keyboard_shortcuts:index"))
+        self.assertNotContains(response, "shortcuts-service-worker-config")
+        config = self.get_worker_config()
+        self.assertIs(config["enabled"], False)
+        self.assertEqual(config["precacheUrls"], [])
+
+    @override_settings(ADMIN_KEYSHORTCUTS_SERVICE_WORKER=True)
+    def test_service_worker_registered(self):
+        response = self.client.get(reverse("test_admin_keyboard_shortcuts:index"))
+        self.assertContains(
+            response,
+            '<script id="shortcuts-service-worker-config" type="application/json">'
+            '{"url": "/keyshortcuts/sw.js", "scope": "/test_admin_keyboard_shortcuts/"}'
+            "</script>",
+        )
+
+    @override_settings(ADMIN_KEYSHORTCUTS_SERVICE_WORKER=True)
+    def test_precache_urls(self):
+        config = self.get_worker_config()
+        self.assertIs(config["enabled"], True)
+        self.assertIn("/static/admin/js/shortcuts.js", config["precacheUrls"])
+        self.assertIn(
+            "/static/admin/js/vendor/hotkey/hotkey.js", config["precacheUrls"]
+        )
+        self.assertIn(
+            reverse("admin_keyshortcuts:dialog", args=["changelist"]),
+            config["dialogPaths"],
+        )
+        with self.settings(ADMIN_KEYSHORTCUTS_BUNDLE=True):
+            bundle_config = self.get_worker_config()
+        self.assertEqual(
+            bundle_config["precacheUrls"],
+            [
+                "/static/admin/css/shortcuts.css",
+                "/static/admin/js/shortcuts.bundle.js",
+            ],
+        )
+        self.assertNotEqual(bundle_config["cacheName"], config["cacheName"])
+
+    @override_settings(ADMIN_KEYSHORTCUTS_SERVICE_WORKER=True)
+    def test_cache_name_changes_with_manifest(self):
+        config = self.get_worker_config()
+        with mock.patch(
+            "django_admin_keyshortcuts.serviceworker.static",
+            lambda path: f"/static/{path}".replace(".js", ".0123abcd.js"),
+        ):
+            hashed_config = self.get_worker_config()
+        self.assertIn(
+            "/static/admin/js/shortcuts.0123abcd.js", hashed_config["precacheUrls"]
+        )
+        self.assertNotEqual(hashed_config["cacheName"], config["cacheName"])
+
+
+@override_settings(ADMIN_KEYSHORTCUTS_DELETED_OBJECTS="lazy")
+class DeletedObjectsTests(SuperuserTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.book = Book.objects.create(title="Book")
+        cls.book.chapter_set.create(title="One")
+        cls.book.chapter_set.create(title="Two")
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.delete_url = reverse(
+            "test_admin_keyboard_shortcuts:tests_book_delete", args=[self.book.pk]
+        )
+        self.branch_url = reverse(
+            "admin_keyshortcuts:deleted_objects",
+            args=["test_admin_keyboard_shortcuts", "tests", "book", self.book.pk],
+        )
+
+    @override_settings(ADMIN_KEYSHORTCUTS_DELETED_OBJECTS="full")
+    def test_full_tree(self):
+        response = self.client.get(self.delete_url)
+        self.assertContains(response, "Chapter: Chapter object", count=2)
+        self.assertNotContains(response, "<details")
+        response = self.client.get(self.branch_url, {"path": "0"})
+        self.assertEqual(response.status_code, 404)
+
+    def test_lazy_tree(self):
+        response = self.client.get(self.delete_url)
+        self.assertContains(response, f'<details data-src="{self.branch_url}?path=0">')
+        self.assertContains(
+            response,
+            '<span class="deleted-objects-count">(2 related objects)</span>',
+        )
+        self.assertNotContains(response, "Chapter: Chapter object")
+        self.assertContains(response, 'data-hotkey="Alt+y"')
+
+        response = self.client.get(self.branch_url, {"path": "0"})
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "<li>Chapter: Chapter object", count=2)
+
+    def test_tree_collected_once(self):
+        get_deleted_objects = mock.patch.object(
+            BookAdmin,
+            "get_deleted_objects",
+            autospec=True,
+            side_effect=BookAdmin.get_deleted_objects,
+        )
+        self.client.get(self.delete_url)
+        with get_deleted_objects as mocked:
+            self.client.get(self.branch_url, {"path": "0"})
+            self.assertEqual(mocked.call_count, 0)
+            cache.clear()
+            self.client.get(self.branch_url, {"path": "0"})
+            self.client.get(self.branch_url, {"path": "0"})
+            self.assertEqual(mocked.call_count, 1)
+
+    def test_invalid_branch(self):
+        for path, status_code in [("1", 404), ("0.0", 404), ("x", 400), ("", 400)]:
+            with self.subTest(path=path):
+                response = self.client.get(self.branch_url, {"path": path})
+                self.assertEqual(response.status_code, status_code)
+        url = reverse(
+            "admin_keyshortcuts:deleted_objects",
+            args=["test_admin_keyboard_shortcuts", "tests", "book", 0],
+        )
+        self.assertEqual(self.client.get(url, {"path": "0"}).status_code, 404)
+
+    def test_branch_requires_delete_permission(self):
+        staff = User.objects.create_user(
+            username="staff", password="secret", is_staff=True
+        )
+        staff.user_permissions.add(Permission.objects.get(codename="view_book"))
+        self.client.force_login(staff)
+        response = self.client.get(self.branch_url, {"path": "0"})
+        self.assertEqual(response.status_code, 403)
+
+    def test_branch_hidden_when_deletion_not_allowed(self):
+        tree = ["Book: Book", ["Chapter: One"]]
+        for perms_needed, protected in [({"chapter"}, []), (set(), ["Chapter: One"])]:
+            get_deleted_objects = mock.patch.object(
+                BookAdmin,
+                "get_deleted_objects",
+                return_value=(tree, {}, perms_needed, protected),
+            )
+            with self.subTest(perms_needed=perms_needed), get_deleted_objects:
+                response = self.client.get(self.branch_url, {"path": "0"})
+                self.assertEqual(response.status_code, 403)
+
+
+class ShortcutRegistryTests(SimpleTestCase):
+    def setUp(self):
+        registry.clear_registry()
+
+    def test_shortcuts_built_once_per_language(self):
+        with translation.override("en"):
+            shortcuts = registry.get_shortcuts()
+            self.assertIs(registry.get_shortcuts(), shortcuts)
+            self.assertEqual(shortcuts["changeform"]["save"], ("Save", "Mod+s"))
+        with translation.override("fr"):
+            self.assertIsNot(registry.get_shortcuts(), shortcuts)
+            self.assertEqual(
+                registry.get_shortcuts()["changeform"]["save"],
+                ("Enregistrer", "Mod+s"),
+            )
+
+    def test_shortcuts_are_read_only(self):
+        shortcuts = registry.get_shortcuts()
+        with self.assertRaises(TypeError):
+            shortcuts["changeform"]["save"] = ("Save", "Mod+Enter")
+
+    def test_registry_cleared_on_translation_setting_change(self):
+        shortcuts = registry.get_shortcuts()
+        with override_settings(LOCALE_PATHS=[]):
+            self.assertIsNot(registry.get_shortcuts(), shortcuts)
+
+    def test_user_shortcuts_cache_is_bounded(self):
+        overrides = {"changeform": {"save": "Mod+Enter"}}
+        shortcuts = registry.get_shortcuts(overrides)
+        self.assertEqual(shortcuts["changeform"]["save"], ("Save", "Mod+Enter"))
+        self.assertIs(registry.get_shortcuts(overrides), shortcuts)
+        self.assertIsNot(registry.get_shortcuts(), shortcuts)
+        for key in "abcdefghijklmnopqrstuvwxyz":
+            for modifier in ("Alt", "Mod", "Shift", "Alt+Shift", "Mod+Shift"):
+                registry.get_shortcuts({"changeform": {"save": f"{modifier}+{key}"}})
+        cache_info = registry._get_user_shortcuts.cache_info()
+        self.assertEqual(cache_info.currsize, cache_info.maxsize)
+        self.assertIsNot(registry.get_shortcuts(overrides), shortcuts)
+
+
+class ShortcutBindingsTests(TestCase):
+    def setUp(self):
+        registry.clear_registry()
+        self.user = User.objects.create_superuser(
+            username="super", password="secret", email="super@example.com"
+        )
+        self.client.force_login(self.user)
+
+    def test_normalize_hotkey(self):
+        self.assertEqual(normalize_hotkey("Shift+Mod+s"), "Mod+Shift+s")
+        self.assertEqual(normalize_hotkey(" Alt+Control+k g,j "), "Control+Alt+k g,j")
+        self.assertEqual(normalize_hotkey(",,Shift+,"), ",,Shift+,")
+        for hotkey in ["", "Hyper+s", "Alt+Alt+s", "Shift+", "Alt+Shift", None]:
+            with self.subTest(hotkey=hotkey), self.assertRaises(InvalidHotkey):
+                normalize_hotkey(hotkey)
+
+    @override_settings(
+        ADMIN_KEYSHORTCUTS={
+            "changeform": {"save": "Shift+Mod+Enter", "delete": None},
+        }
+    )
+    def test_overridden_and_disabled_shortcuts(self):
+        self.assertEqual(get_errors(), [])
+        shortcuts = registry.get_shortcuts()
+        self.assertEqual(shortcuts["changeform"]["save"], ("Save", "Mod+Shift+Enter"))
+        self.assertNotIn("delete", shortcuts["changeform"])
+        paper = Paper.objects.create(title="p1")
+        response = self.client.get(
+            reverse(
+                "test_admin_keyboard_shortcuts:tests_paper_change", args=(paper.pk,)
+            )
+        )
+        self.assertContains(response, 'data-hotkey="Mod+Shift+Enter"')
+        self.assertContains(response, 'class="deletelink">')
+        self.assertNotContains(response, 'data-hotkey="Alt+d"')
+
+    def test_invalid_settings(self):
+        cases = [
+            ([], "admin_keyshortcuts.E001"),
+            ({"unknown": {}}, "admin_keyshortcuts.E002"),
+            ({"changeform": {"unknown": "u"}}, "admin_keyshortcuts.E003"),
+            ({"changeform": {"save": "Hyper+s"}}, "admin_keyshortcuts.E004"),
+        ]
+        for value, error_id in cases:
+            with self.subTest(value=value), override_settings(ADMIN_KEYSHORTCUTS=value):
+                self.assertEqual([error.id for error in get_errors()], [error_id])
+                # Invalid overrides keep the default bindings.
+                self.assertEqual(
+                    registry.get_shortcuts()["changeform"]["save"], ("Save", "Mod+s")
+                )
+
+    def test_conflicting_shortcuts(self):
+        cases = [
+            # Same sequence as a global shortcut.
+            {"changelist": {"focus_search": "g i"}},
+            # Prefix of a global shortcut.
+            {"changeform": {"delete": "g"}},
+            # Mod is Control on non-Apple platforms.
+            {"changeform": {"delete": "Control+s"}},
+            # Conflicting alternative.
+            {"delete_confirmation": {"cancel_delete": "Alt+n,Alt+y"}},
+        ]
+        for value in cases:
+            with self.subTest(value=value), override_settings(ADMIN_KEYSHORTCUTS=value):
+                self.assertEqual(
+                    [error.id for error in get_errors()], ["admin_keyshortcuts.E005"]
+                )
+
+    @override_settings(
+        ADMIN_KEYSHORTCUTS={
+            "changelist": {"focus_search": "s"},
+            "changeform": {"save": "s"},
+        }
+    )
+    def test_same_hotkey_on_different_views(self):
+        self.assertEqual(get_errors(), [])
+
+
+class FormatKbdTests(SimpleTestCase):
+    def setUp(self):
+        format_kbd.cache_clear()
+
+    def test_format_kbd(self):
+        self.assertEqual(
+            format_kbd("Mod+Alt+s g", OTHER),
+            "<kbd>Ctrl</kbd>+<kbd>Alt</kbd>+<kbd>s</kbd> <kbd>g</kbd>",
+        )
+        self.assertEqual(
+            format_kbd("Mod+Alt+s g", MAC),
+            "<kbd>⌘</kbd>+<kbd>⌥</kbd>+<kbd>s</kbd> <kbd>g</kbd>",
+        )
+
+    def test_format_kbd_neutral(self):
+        self.assertEqual(
+            format_kbd("Mod+Alt+s", NEUTRAL),
+            '<kbd data-key="Mod">Ctrl</kbd>+<kbd data-key="Alt">Alt</kbd>+<kbd>s</kbd>',
+        )
+
+    def test_format_kbd_cached_per_platform(self):
+        html = format_kbd("Mod+s", OTHER)
+        self.assertIs(format_kbd("Mod+s", OTHER), html)
+        format_kbd("Mod+s", MAC)
+        info = format_kbd.cache_info()
+        self.assertEqual((info.hits, info.misses), (1, 2))
+
+
+class RequestPlatformTests(SimpleTestCase):
+    mac_user_agent = (
+        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/107.0.0.0 Safari/537.36"
+    )
+
+    def test_platform_from_user_agent(self):
+        request = RequestFactory().get("/", headers={"user-agent": self.mac_user_agent})
+        self.assertEqual(get_request_platform(request), MAC)
+        request = RequestFactory().get("/", headers={"user-agent": "Linux"})
+        self.assertEqual(get_request_platform(request), OTHER)
+
+    def test_client_hint_preferred_over_user_agent(self):
+        request = RequestFactory().get(
+            "/",
+            headers={
+                "user-agent": self.mac_user_agent,
+                "sec-ch-ua-platform": '"Windows"',
+            },
+        )
+        self.assertEqual(get_request_platform(request), OTHER)
+        request = RequestFactory().get("/", headers={"sec-ch-ua-platform": '"macOS"'})
+        self.assertEqual(get_request_platform(request), MAC)
+
+    def test_platform_detected_once_per_request(self):
+        request = RequestFactory().get("/", headers={"user-agent": self.mac_user_agent})
+        self.assertEqual(get_request_platform(request), MAC)
+        request.META["HTTP_USER_AGENT"] = "Linux"
+        self.assertEqual(get_request_platform(request), MAC)
+
+
 class SeleniumTests(AdminSeleniumTestCase):
     available_apps = None
 
@@ -116,7 +1255,7 @@ class SeleniumTests(AdminSeleniumTestCase):
         yield
         close_btn.click()
 
-    def perform_shortcut(self, shortcut):
+    def perform_shortcut(self, shortcut, blur=True):
         """Perform the keyboard shortcut using Selenium."""
         from selenium.webdriver.common.action_chains import ActionChains
         from selenium.webdriver.common.keys import Keys
@@ -143,7 +1282,8 @@ class SeleniumTests(AdminSeleniumTestCase):
         # Temporary workaround to remove focus from textarea/input fields.
         # Currently, Github hotkey prevents shortcuts
         # from triggering when focused on textareas.
-        self.selenium.execute_script("document.activeElement.blur();")
+        if blur:
+            self.selenium.execute_script("document.activeElement.blur();")
 
         # perform the key combinations
         actions = ActionChains(self.selenium)
@@ -339,6 +1479,50 @@ class SeleniumTests(AdminSeleniumTestCase):
         self.perform_shortcut(ChangeListShortcuts.FOCUS_PREV_ROW)
         self.assertEqual(self.selenium.switch_to.active_element, l1_checkbox)
 
+    def test_shortcut_changelist_range_selection(self):
+        from selenium.webdriver.common.by import By
+
+        for i in range(1, 5):
+            Language.objects.create(iso=f"l{i}")
+
+        self.selenium.get(
+            self.live_server_url
+            + reverse("test_admin_keyboard_shortcuts:tests_language_changelist")
+        )
+
+        checkboxes = self.selenium.find_elements(
+            By.CSS_SELECTOR, "input[name='_selected_action']"
+        )
+        counter = self.selenium.find_element(By.CSS_SELECTOR, "span.action-counter")
+
+        def selected():
+            return [checkbox.is_selected() for checkbox in checkboxes]
+
+        self.perform_shortcut(ChangeListShortcuts.FOCUS_NEXT_ROW)
+        self.perform_shortcut(ChangeListShortcuts.FOCUS_NEXT_ROW)
+        self.perform_shortcut(ChangeListShortcuts.EXTEND_SELECTION_DOWN)
+        self.perform_shortcut(ChangeListShortcuts.EXTEND_SELECTION_DOWN)
+        self.assertEqual(selected(), [True, True, True, False])
+        self.assertEqual(counter.text, "3 of 4 selected")
+
+        # Moving back shrinks the range.
+        self.perform_shortcut(ChangeListShortcuts.EXTEND_SELECTION_UP)
+        self.assertEqual(selected(), [True, True, False, False])
+        self.assertEqual(counter.text, "2 of 4 selected")
+
+        self.perform_shortcut(ChangeListShortcuts.INVERT_SELECTION)
+        self.assertEqual(selected(), [False, False, True, True])
+        self.assertEqual(counter.text, "2 of 4 selected")
+
+        self.perform_shortcut(ChangeListShortcuts.TOGGLE_ALL_ROWS)
+        self.assertEqual(selected(), [True, True, True, True])
+        self.assertTrue(
+            self.selenium.find_element(By.ID, "action-toggle").is_selected()
+        )
+        self.perform_shortcut(ChangeListShortcuts.TOGGLE_ALL_ROWS)
+        self.assertEqual(selected(), [False, False, False, False])
+        self.assertEqual(counter.text, "0 of 4 selected")
+
     def test_shortcut_changelist_toggle_row_selection(self):
         from selenium.webdriver.common.by import By
 
@@ -474,6 +1658,42 @@ class SeleniumTests(AdminSeleniumTestCase):
             ),
         )
 
+    def test_shortcut_changeform_inline_navigation(self):
+        from selenium.webdriver.common.by import By
+
+        book = Book.objects.create(title="b1")
+        for i in range(3):
+            book.chapter_set.create(title=f"c{i}")
+        self.selenium.get(
+            self.live_server_url
+            + reverse(
+                "test_admin_keyboard_shortcuts:tests_book_change", args=(book.pk,)
+            )
+        )
+
+        def active_id():
+            return self.selenium.switch_to.active_element.get_attribute("id")
+
+        self.perform_shortcut(ChangeFormShortcuts.NEXT_INLINE_ROW)
+        self.assertEqual(active_id(), "id_chapter_set-0-title")
+        # The shortcuts also work from the fields of the rows.
+        self.perform_shortcut(ChangeFormShortcuts.NEXT_INLINE_ROW, blur=False)
+        self.assertEqual(active_id(), "id_chapter_set-1-title")
+        self.perform_shortcut(ChangeFormShortcuts.PREVIOUS_INLINE_ROW, blur=False)
+        self.assertEqual(active_id(), "id_chapter_set-0-title")
+
+        rows = len(self.selenium.find_elements(By.CSS_SELECTOR, "tr.form-row"))
+        self.perform_shortcut(ChangeFormShortcuts.ADD_INLINE_ROW, blur=False)
+        self.assertEqual(
+            len(self.selenium.find_elements(By.CSS_SELECTOR, "tr.form-row")), rows + 1
+        )
+        self.assertEqual(active_id(), f"id_chapter_set-{rows - 1}-title")
+
+        self.perform_shortcut(ChangeFormShortcuts.GO_TO_FIELD, blur=False)
+        field_input = self.selenium.find_element(By.ID, "shortcuts-field-jump-input")
+        field_input.send_keys("Pages\n")
+        self.assertEqual(active_id(), f"id_chapter_set-{rows - 1}-pages")
+
     def test_shortcut_changeform_delete(self):
         paper = Paper.objects.create(title="p1")
         self.selenium.get(
@@ -1,7 +1,9 @@
+from django.urls import include
 from django.urls import path
 
 from .admin import site
 
 urlpatterns = [
     path("test_admin_keyboard_shortcuts/", site.urls),
+    path("keyshortcuts/", include("django_admin_keyshortcuts.urls")),
 ]